@@ -0,0 +1,37 @@
+import hashlib
+import time
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app import data_version
+from app.config import get_settings
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def compute_etag(request: Request, *domains: str) -> str:
+    # Versions are per process, so the tag also rolls over every ETAG_MAX_STALENESS_SECONDS
+    # to bound staleness when another process wrote the data.
+    window = get_settings().etag_max_staleness_seconds
+    bucket = int(time.time() // window) if window > 0 else 0
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    raw = f"{request.url.path}?{query}|{data_version.current(*domains)}|{bucket}"
+    return 'W/"' + hashlib.sha1(raw.encode()).hexdigest()[:24] + '"'
+
+
+def conditional_get(*domains: str):
+    def check(request: Request, response: Response) -> dict[str, str]:
+        etag = compute_etag(request, *domains)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        # Handlers that build their own Response pass these along themselves
+        return headers
+
+    return Depends(check)
@@ -0,0 +1,96 @@
+from decimal import Decimal
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.config import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _nested(annotation: Any) -> tuple[type[BaseModel] | None, bool]:
+    origin = get_origin(annotation)
+    if origin is list:
+        model, _ = _nested(get_args(annotation)[0])
+        return model, True
+    if origin in (Union, UnionType):
+        for arg in get_args(annotation):
+            if arg is not NoneType:
+                return _nested(arg)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _plan(model: type[BaseModel]) -> tuple:
+    plan = []
+    for name, field in model.model_fields.items():
+        nested, many = _nested(field.annotation)
+        plan.append((name, field.get_default(call_default_factory=True), nested, many))
+    return tuple(plan)
+
+
+def project(model: type[BaseModel], data: Any) -> Any:
+    # Keep only the model's fields; service output is trusted, so values are not re-validated
+    if data is None:
+        return None
+    if isinstance(data, BaseModel):
+        data = data.__dict__
+    out = {}
+    for name, default, nested, many in _plan(model):
+        value = data.get(name, default)
+        if nested is not None and value is not None:
+            value = [project(nested, v) for v in value] if many else project(nested, value)
+        out[name] = value
+    return out
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _rows(model: type[BaseModel], columns: dict[str, list]) -> list[dict]:
+    # Columns are picked (or defaulted) once each, then zipped into rows in one pass
+    n = len(next(iter(columns.values()), []))
+    names = []
+    values = []
+    for name, default, _, _ in _plan(model):
+        names.append(name)
+        values.append(columns[name] if name in columns else [default] * n)
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def page_response(
+    model: type[BaseModel],
+    columns: dict[str, list],
+    headers: dict[str, str] | None = None,
+    **page: Any,
+) -> Response:
+    """Renders a list page whose `items` come from a columnar result."""
+    item_model = next(nested for name, _, nested, _ in _plan(model) if name == "items")
+    items = _rows(item_model, columns)
+    if orjson is not None and get_settings().fast_json:
+        data = {**project(model, {**page, "items": []}), "items": items}
+        body = orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z)
+    else:
+        body = model.model_validate({**page, "items": items}).model_dump_json().encode()
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def model_response(
+    model: type[BaseModel], data: Any, headers: dict[str, str] | None = None
+) -> Response:
+    if orjson is not None and get_settings().fast_json:
+        body = orjson.dumps(project(model, data), default=_default, option=orjson.OPT_UTC_Z)
+    else:
+        body = model.model_validate(data).model_dump_json().encode()
+    return Response(body, media_type="application/json", headers=headers)
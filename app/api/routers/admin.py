@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.auth.deps import get_current_user
+from app.cache import cache_stats, flush_caches
+from app.db.executor import executor_stats
+from app.db.snowflake import pool_stats
+from app.models.admin import (
+    CacheFlushResponse,
+    CacheStats,
+    ExecutorStats,
+    PoolStats,
+    ProfileSummary,
+)
+from app.profiling import get_profiler
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/pool", response_model=PoolStats)
+async def pool():
+    return pool_stats()
+
+
+@router.get("/executor", response_model=ExecutorStats)
+async def executor():
+    return executor_stats()
+
+
+@router.get("/cache", response_model=list[CacheStats])
+async def caches():
+    return cache_stats()
+
+
+@router.post("/cache/flush", response_model=CacheFlushResponse)
+async def flush_cache(name: str | None = None):
+    try:
+        flushed = flush_caches(name)
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Cache not found"
+        ) from exc
+    return CacheFlushResponse(flushed=flushed)
+
+
+@router.get("/profiles", response_model=list[ProfileSummary])
+async def profiles():
+    profiler = get_profiler()
+    return profiler.recent() if profiler else []
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def profile(profile_id: str):
+    profiler = get_profiler()
+    found = profiler.get(profile_id) if profiler else None
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    # Collapsed-stack format, loadable in speedscope or flamegraph.pl
+    return PlainTextResponse(found.folded())
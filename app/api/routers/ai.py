@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.auth.deps import get_current_user
+from app.db.executor import run_blocking
+from app.db.snowflake import OVERLOAD_ERRORS
 from app.models.ai import AiAskRequest, AiAskResponse
 from app.services.ai_service import ask_ai
 
@@ -10,7 +12,9 @@ router = APIRouter(prefix="/ai", tags=["ai"], dependencies=[Depends(get_current_
 @router.post("/ask", response_model=AiAskResponse)
 async def ask(payload: AiAskRequest):
     try:
-        answer, model = ask_ai(payload.question)
+        answer, model, cached = await run_blocking(ask_ai, payload.question)
+    except OVERLOAD_ERRORS:
+        raise
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc)) from exc
     except ValueError as exc:
@@ -21,4 +25,4 @@ async def ask(payload: AiAskRequest):
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY, detail="AI provider error"
         ) from exc
-    return AiAskResponse(answer=answer, model=model)
+    return AiAskResponse(answer=answer, model=model, cached=cached)
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from app.api.etag import conditional_get
+from app.api.responses import model_response, page_response
 from app.auth.deps import get_current_user
+from app.db.executor import run_blocking
+from app.models.bulk import AirlineBulkRequest, BulkResponse
 from app.models.airline import AirlineCreate, AirlineList, AirlineOut, AirlineUpdate
+from app.services.bulk_service import BulkLimitError, bulk_airlines
 from app.services.airline_service import (
     create_airline,
     delete_airline,
@@ -15,26 +20,55 @@ router = APIRouter(prefix="/airlines", tags=["airlines"], dependencies=[Depends(
 
 @router.post("", response_model=AirlineOut, status_code=status.HTTP_201_CREATED)
 async def create(payload: AirlineCreate):
-    return create_airline(payload)
+    return await run_blocking(create_airline, payload)
+
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk(payload: AirlineBulkRequest):
+    try:
+        return await run_blocking(bulk_airlines, payload.operations)
+    except BulkLimitError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)
+        ) from exc
 
 
 @router.get("/{iata}", response_model=AirlineOut)
-async def get_one(iata: str):
-    row = get_airline(iata)
+async def get_one(iata: str, cache_headers: dict = conditional_get("airlines")):
+    row = await run_blocking(get_airline, iata)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Airline not found")
-    return row
+    return model_response(AirlineOut, row, cache_headers)
 
 
 @router.get("", response_model=AirlineList)
-async def list_all(limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0)):
-    rows, total = list_airlines(limit, offset)
-    return AirlineList(items=rows, total=total, limit=limit, offset=offset)
+async def list_all(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
+    include_total: bool = True,
+    cache_headers: dict = conditional_get("airlines"),
+):
+    try:
+        columns, total, next_cursor = await run_blocking(
+            list_airlines, limit, offset, cursor, include_total
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return page_response(
+        AirlineList,
+        columns,
+        cache_headers,
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor,
+    )
 
 
 @router.put("/{iata}", response_model=AirlineOut)
 async def update(iata: str, payload: AirlineUpdate):
-    row = update_airline(iata, payload)
+    row = await run_blocking(update_airline, iata, payload)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Airline not found")
     return row
@@ -42,5 +76,5 @@ async def update(iata: str, payload: AirlineUpdate):
 
 @router.delete("/{iata}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete(iata: str):
-    delete_airline(iata)
+    await run_blocking(delete_airline, iata)
     return None
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from app.api.etag import conditional_get
+from app.api.responses import model_response, page_response
 from app.auth.deps import get_current_user
+from app.db.executor import run_blocking
+from app.models.bulk import AirportBulkRequest, BulkResponse
 from app.models.airport import AirportCreate, AirportList, AirportOut, AirportUpdate
+from app.services.bulk_service import BulkLimitError, bulk_airports
 from app.services.airport_service import (
     create_airport,
     delete_airport,
@@ -15,26 +20,55 @@ router = APIRouter(prefix="/airports", tags=["airports"], dependencies=[Depends(
 
 @router.post("", response_model=AirportOut, status_code=status.HTTP_201_CREATED)
 async def create(payload: AirportCreate):
-    return create_airport(payload)
+    return await run_blocking(create_airport, payload)
+
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk(payload: AirportBulkRequest):
+    try:
+        return await run_blocking(bulk_airports, payload.operations)
+    except BulkLimitError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)
+        ) from exc
 
 
 @router.get("/{iata}", response_model=AirportOut)
-async def get_one(iata: str):
-    row = get_airport(iata)
+async def get_one(iata: str, cache_headers: dict = conditional_get("airports")):
+    row = await run_blocking(get_airport, iata)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Airport not found")
-    return row
+    return model_response(AirportOut, row, cache_headers)
 
 
 @router.get("", response_model=AirportList)
-async def list_all(limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0)):
-    rows, total = list_airports(limit, offset)
-    return AirportList(items=rows, total=total, limit=limit, offset=offset)
+async def list_all(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
+    include_total: bool = True,
+    cache_headers: dict = conditional_get("airports"),
+):
+    try:
+        columns, total, next_cursor = await run_blocking(
+            list_airports, limit, offset, cursor, include_total
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return page_response(
+        AirportList,
+        columns,
+        cache_headers,
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor,
+    )
 
 
 @router.put("/{iata}", response_model=AirportOut)
 async def update(iata: str, payload: AirportUpdate):
-    row = update_airport(iata, payload)
+    row = await run_blocking(update_airport, iata, payload)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Airport not found")
     return row
@@ -42,5 +76,5 @@ async def update(iata: str, payload: AirportUpdate):
 
 @router.delete("/{iata}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete(iata: str):
-    delete_airport(iata)
+    await run_blocking(delete_airport, iata)
     return None
@@ -5,6 +5,8 @@ from fastapi.responses import RedirectResponse
 from app.auth.jwt import create_access_token
 from app.auth.google import build_google_auth_url, exchange_code_for_tokens, verify_google_id_token
 from app.config import get_settings
+from app.db.executor import run_blocking
+from app.db.snowflake import OVERLOAD_ERRORS
 from app.models.auth import GoogleAuthCodeRequest, LoginRequest, OAuthUrlResponse, TokenResponse
 from app.services.user_service import authenticate_user, get_or_create_user_by_email
 
@@ -15,7 +17,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/login", response_model=TokenResponse)
 async def login(payload: LoginRequest):
-    user = authenticate_user(payload.email, payload.password)
+    user = await run_blocking(authenticate_user, payload.email, payload.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     token = create_access_token(subject=user["EMAIL"])
@@ -44,7 +46,7 @@ async def google_callback(code: str):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Google OAuth not configured"
         )
 
-    tokens = exchange_code_for_tokens(code)
+    tokens = await run_blocking(exchange_code_for_tokens, code)
     id_token = tokens.get("id_token")
     if not id_token:
         raise HTTPException(
@@ -52,7 +54,9 @@ async def google_callback(code: str):
         )
 
     try:
-        claims = verify_google_id_token(id_token)
+        claims = await run_blocking(verify_google_id_token, id_token)
+    except OVERLOAD_ERRORS:
+        raise
     except Exception as exc:
         logger.exception("Google token verification failed")
         raise HTTPException(
@@ -68,7 +72,7 @@ async def google_callback(code: str):
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not found in token"
         )
 
-    user = get_or_create_user_by_email(email)
+    user = await run_blocking(get_or_create_user_by_email, email)
     token = create_access_token(subject=user["EMAIL"])
     if settings.frontend_redirect_url:
         target = settings.frontend_redirect_url.rstrip("/") + f"/#token={token}"
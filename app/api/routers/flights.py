@@ -1,7 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import date
+from itertools import chain
 
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.etag import conditional_get
+from app.api.responses import model_response, page_response
 from app.auth.deps import get_current_user
+from app.db.executor import run_blocking
+from app.middleware import accepted_encodings
+from app.models.bulk import FlightBulkRequest, BulkResponse
 from app.models.flight import FlightCreate, FlightList, FlightOut, FlightUpdate
+from app.services.export_service import MEDIA_TYPES, export_flights
+from app.services.bulk_service import BulkLimitError, bulk_flights
 from app.services.flight_service import (
     create_flight,
     delete_flight,
@@ -15,33 +26,132 @@ router = APIRouter(prefix="/flights", tags=["flights"], dependencies=[Depends(ge
 
 @router.post("", response_model=FlightOut, status_code=status.HTTP_201_CREATED)
 async def create(payload: FlightCreate):
-    return create_flight(payload)
+    return await run_blocking(create_flight, payload)
+
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk(payload: FlightBulkRequest):
+    try:
+        return await run_blocking(bulk_flights, payload.operations)
+    except BulkLimitError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)
+        ) from exc
+
+
+def _negotiate_export_format(accept: str | None) -> str | None:
+    if not accept:
+        return "ndjson"
+    for part in accept.split(","):
+        media_type = part.split(";")[0].strip().lower()
+        for fmt, candidate in MEDIA_TYPES.items():
+            if media_type == candidate:
+                return fmt
+        if media_type in ("*/*", "application/*", "application/json"):
+            return "ndjson"
+    return None
+
+
+def _date_range(date_from: date | None, date_to: date | None) -> tuple[str | None, str | None]:
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must be before date_to"
+        )
+    return (
+        date_from.isoformat() if date_from else None,
+        date_to.isoformat() if date_to else None,
+    )
+
+
+@router.get("/export")
+async def export(
+    dep_iata: list[str] | None = Query(None),
+    arr_iata: list[str] | None = Query(None),
+    flight_date: str | None = None,
+    status_filter: list[str] | None = Query(None, alias="status"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    accept: str | None = Header(None),
+    accept_encoding: str | None = Header(None),
+):
+    date_range = _date_range(date_from, date_to)
+    fmt = _negotiate_export_format(accept)
+    if not fmt:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Supported formats: {', '.join(MEDIA_TYPES.values())}",
+        )
+    # Same negotiation as CompressionMiddleware, which passes this response through untouched
+    gzip = "gzip" in accepted_encodings(accept_encoding or "")
+    try:
+        chunks = export_flights(
+            fmt, dep_iata, arr_iata, flight_date, status_filter, *date_range, gzip=gzip
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail=str(exc)) from exc
+    # Pull the first chunk up front so query errors surface as a status code, not a cut stream
+    first = await run_blocking(next, chunks, b"")
+    headers = {
+        "Content-Disposition": f'attachment; filename="flights.{fmt}"',
+        "Vary": "Accept, Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chain([first], chunks), media_type=MEDIA_TYPES[fmt], headers=headers)
 
 
 @router.get("/{flight_nk}", response_model=FlightOut)
-async def get_one(flight_nk: str):
-    row = get_flight(flight_nk)
+async def get_one(flight_nk: str, cache_headers: dict = conditional_get("flights", "flights_seen")):
+    row = await run_blocking(get_flight, flight_nk)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight not found")
-    return row
+    return model_response(FlightOut, row, cache_headers)
 
 
 @router.get("", response_model=FlightList)
 async def list_all(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    dep_iata: str | None = None,
-    arr_iata: str | None = None,
+    dep_iata: list[str] | None = Query(None),
+    arr_iata: list[str] | None = Query(None),
     flight_date: str | None = None,
-    status_filter: str | None = Query(None, alias="status"),
+    status_filter: list[str] | None = Query(None, alias="status"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
+    cache_headers: dict = conditional_get("flights", "flights_seen"),
 ):
-    rows, total = list_flights(limit, offset, dep_iata, arr_iata, flight_date, status_filter)
-    return FlightList(items=rows, total=total, limit=limit, offset=offset)
+    date_range = _date_range(date_from, date_to)
+    try:
+        columns, total, next_cursor = await run_blocking(
+            list_flights,
+            limit,
+            offset,
+            dep_iata,
+            arr_iata,
+            flight_date,
+            status_filter,
+            cursor,
+            include_total,
+            *date_range,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return page_response(
+        FlightList,
+        columns,
+        cache_headers,
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor,
+    )
 
 
 @router.put("/{flight_nk}", response_model=FlightOut)
 async def update(flight_nk: str, payload: FlightUpdate):
-    row = update_flight(flight_nk, payload)
+    row = await run_blocking(update_flight, flight_nk, payload)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight not found")
     return row
@@ -49,5 +159,5 @@ async def update(flight_nk: str, payload: FlightUpdate):
 
 @router.delete("/{flight_nk}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete(flight_nk: str):
-    delete_flight(flight_nk)
+    await run_blocking(delete_flight, flight_nk)
     return None
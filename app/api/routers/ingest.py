@@ -1,28 +1,130 @@
 import logging
+import math
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.auth.deps import get_current_user
-from app.models.ingest import IngestResponse
-from app.services.ingest_service import ingest_flights
+from app.db.executor import run_blocking
+from app.db.snowflake import OVERLOAD_ERRORS
+from app.config import get_settings
+from app.http_client import RateLimitTimeout
+from app.models.ingest import (
+    IngestBatchRequest,
+    IngestBatchResponse,
+    IngestJobOut,
+    IngestJobRequest,
+    IngestResponse,
+    ScheduledAirportStatus,
+)
+from app.services.ingest_jobs import get_job_queue
+from app.services.ingest_service import ingest_airports, ingest_flights
+from app.services.scheduler import get_scheduler
 
 router = APIRouter(prefix="/ingest", tags=["ingest"], dependencies=[Depends(get_current_user)])
 logger = logging.getLogger(__name__)
 
 
+def rate_limited(exc: RateLimitTimeout) -> HTTPException:
+    # Jobs (POST /ingest/jobs) queue for the upstream rate limit instead
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(exc),
+        headers={"Retry-After": str(max(1, math.ceil(exc.wait)))},
+    )
+
+
 @router.post("/flights", response_model=IngestResponse)
 async def ingest(
     dep_iata: str | None = Query(None, min_length=3, max_length=4),
     arr_iata: str | None = Query(None, min_length=3, max_length=4),
     limit: int = Query(50, ge=1, le=100),
+    mode: str | None = Query(None, pattern="^(bulk|per_record)$"),
 ):
     try:
-        result = ingest_flights(dep_iata=dep_iata, arr_iata=arr_iata, limit=limit)
+        result = await run_blocking(
+            ingest_flights, dep_iata=dep_iata, arr_iata=arr_iata, limit=limit, mode=mode
+        )
         return result
+    except OVERLOAD_ERRORS:
+        raise
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except RateLimitTimeout as exc:
+        raise rate_limited(exc) from exc
     except Exception as exc:
         logger.exception("Ingest failed: dep_iata=%s limit=%s", dep_iata, limit)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
         ) from exc
+
+
+@router.post("/flights/batch", response_model=IngestBatchResponse)
+async def ingest_batch(payload: IngestBatchRequest):
+    max_targets = get_settings().ingest_batch_max_targets
+    if len(payload.targets) > max_targets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_targets} airports per batch",
+        )
+    targets = [(t.iata.upper(), t.direction) for t in payload.targets]
+    try:
+        return await run_blocking(
+            ingest_airports,
+            targets,
+            payload.limit,
+            max_concurrency=payload.max_concurrency,
+            mode=payload.mode,
+        )
+    except OVERLOAD_ERRORS:
+        raise
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except RateLimitTimeout as exc:
+        raise rate_limited(exc) from exc
+    except Exception as exc:
+        logger.exception("Batch ingest failed: targets=%s", targets)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        ) from exc
+
+
+@router.post("/jobs", response_model=IngestJobOut, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(payload: IngestJobRequest):
+    settings = get_settings()
+    # Params double as the dedupe key, so spell out defaults and normalize codes
+    params: dict = {"limit": payload.limit, "mode": payload.mode or settings.ingest_mode}
+    if payload.targets:
+        if len(payload.targets) > settings.ingest_batch_max_targets:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Too many airports")
+        kind = "batch"
+        params["targets"] = [(t.iata.upper(), t.direction) for t in payload.targets]
+        params["max_concurrency"] = payload.max_concurrency or settings.ingest_max_concurrency
+    elif payload.dep_iata or payload.arr_iata:
+        kind = "flights"
+        params["dep_iata"] = payload.dep_iata.upper() if payload.dep_iata else None
+        params["arr_iata"] = payload.arr_iata.upper() if payload.arr_iata else None
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide dep_iata, arr_iata or targets",
+        )
+    job, deduplicated = await run_blocking(get_job_queue().submit, kind, params, payload.priority)
+    return IngestJobOut(**job, deduplicated=deduplicated)
+
+
+@router.get("/jobs", response_model=list[IngestJobOut])
+async def list_jobs(limit: int = Query(50, ge=1, le=200)):
+    return await run_blocking(get_job_queue().recent, limit)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestJobOut)
+async def get_job(job_id: str):
+    job = await run_blocking(get_job_queue().get, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/schedule", response_model=list[ScheduledAirportStatus])
+async def schedule_status():
+    return get_scheduler().status()
@@ -0,0 +1,39 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.etag import conditional_get
+from app.auth.deps import get_current_user
+from app.db.executor import run_blocking
+from app.models.kpi import DelayKpiResponse
+from app.services.kpi_service import delay_kpis
+
+router = APIRouter(prefix="/kpis", tags=["kpis"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/delays", response_model=DelayKpiResponse, dependencies=[conditional_get("flights")])
+async def delays(
+    group_by: str = Query("airport", pattern="^(airport|arr_airport|airline|route|hour|date)$"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    dep_iata: str | None = Query(None, min_length=3, max_length=4),
+    arr_iata: str | None = Query(None, min_length=3, max_length=4),
+    airline_iata: str | None = Query(None, min_length=2, max_length=3),
+    on_time_threshold_min: int = Query(15, ge=0, le=240),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must be before date_to"
+        )
+    return await run_blocking(
+        delay_kpis,
+        group_by,
+        date_from.isoformat() if date_from else None,
+        date_to.isoformat() if date_to else None,
+        dep_iata,
+        arr_iata,
+        airline_iata,
+        on_time_threshold_min,
+        limit,
+    )
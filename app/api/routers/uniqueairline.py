@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Depends
 
+from app.api.etag import conditional_get
 from app.auth.deps import get_current_user
+from app.db.executor import run_blocking
 from app.models.unique import UniqueAirlineResponse
 from app.services.uniqueservice import get_unique_airlines
 
 router = APIRouter(prefix="", tags=["unique-airlines"], dependencies=[Depends(get_current_user)])
 
 
-@router.get("/airports/{iata}/unique-airlines", response_model=UniqueAirlineResponse)
+@router.get(
+    "/airports/{iata}/unique-airlines",
+    response_model=UniqueAirlineResponse,
+    dependencies=[conditional_get("flights", "airlines")],
+)
 async def unique_airlines(iata: str):
-    items = get_unique_airlines(iata)
+    items = await run_blocking(get_unique_airlines, iata)
     return UniqueAirlineResponse(airport_iata=iata, items=items)
@@ -2,7 +2,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.auth.jwt import get_subject_from_token
-from app.services.user_service import get_user_by_email
+from app.db.executor import run_blocking
+from app.services.user_service import get_cached_user, get_user_by_email
 
 security = HTTPBearer()
 
@@ -12,7 +13,9 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     subject = get_subject_from_token(token)
     if not subject:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = get_user_by_email(subject)
+    user = get_cached_user(subject)
+    if not user:
+        user = await run_blocking(get_user_by_email, subject)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
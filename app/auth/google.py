@@ -4,6 +4,7 @@ from typing import Dict, Optional
 import requests
 from jose import jwt
 
+from app import http_client
 from app.config import get_settings
 
 JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
@@ -18,7 +19,7 @@ def _get_jwks() -> dict:
     if _JWKS_CACHE["keys"] and _JWKS_CACHE["expires_at"] > now:
         return _JWKS_CACHE["keys"]  # type: ignore[return-value]
 
-    resp = requests.get(JWKS_URL, timeout=10)
+    resp = http_client.get("google_jwks", JWKS_URL, timeout=10)
     resp.raise_for_status()
     jwks = resp.json()
     _JWKS_CACHE["keys"] = jwks
@@ -67,7 +68,7 @@ def exchange_code_for_tokens(code: str) -> dict:
         "redirect_uri": settings.google_redirect_uri,
         "grant_type": "authorization_code",
     }
-    resp = requests.post(TOKEN_URL, data=data, timeout=15)
+    resp = http_client.post("google_token", TOKEN_URL, timeout=15, data=data)
     resp.raise_for_status()
     return resp.json()
 
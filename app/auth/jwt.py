@@ -1,10 +1,18 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from jose import JWTError, jwt
 
+from app.cache import TTLCache
 from app.config import get_settings
 
+_settings = get_settings()
+_token_cache = TTLCache(
+    "auth_token", _settings.token_cache_max_entries, _settings.token_cache_ttl_seconds
+)
+
 
 def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
     settings = get_settings()
@@ -20,8 +28,19 @@ def decode_token(token: str) -> dict[str, Any]:
 
 
 def get_subject_from_token(token: str) -> Optional[str]:
+    key = hashlib.sha256(token.encode()).hexdigest()
+    subject = _token_cache.get(key)
+    if subject:
+        return subject
     try:
         payload = decode_token(token)
-        return payload.get("sub")
     except JWTError:
         return None
+    subject = payload.get("sub")
+    exp = payload.get("exp")
+    if subject and exp:
+        # Never trust a cached verification past the token's own expiry
+        ttl = min(float(exp) - time.time(), get_settings().token_cache_ttl_seconds)
+        if ttl > 0:
+            _token_cache.set(key, subject, ttl=ttl)
+    return subject
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.singleflight import SingleFlight
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float) -> None:
+        self.name = name
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Concurrent misses for the same key share one load
+        self._loads = SingleFlight(name)
+        _register(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+            self._misses += 1
+            return _MISSING
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        self._data[key] = (time.monotonic() + (self._ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+        return self._loads.do(key, lambda: self._load(key, loader))
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            # Another load may have finished between our miss and taking the lead
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            generation = self._generation
+        value = loader()
+        with self._lock:
+            # Skip the store if an invalidation raced with the load
+            if generation == self._generation:
+                self._store(key, value, None)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+        self._loads.forget(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+        self._loads.forget()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+_caches: dict[str, TTLCache] = {}
+
+
+def _register(cache: TTLCache) -> None:
+    _caches[cache.name] = cache
+
+
+def cache_stats() -> list[dict]:
+    return [cache.stats() for cache in _caches.values()]
+
+
+def flush_caches(name: Optional[str] = None) -> list[str]:
+    targets = [_caches[name]] if name else list(_caches.values())
+    for cache in targets:
+        cache.clear()
+    return [cache.name for cache in targets]
@@ -10,8 +10,42 @@ class Settings(BaseSettings):
     secret_key: str = os.getenv("SECRET_KEY", "change-me")
     algorithm: str = os.getenv("JWT_ALGORITHM", "HS256")
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+    token_cache_ttl_seconds: float = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    token_cache_max_entries: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "4096"))
+    user_cache_ttl_seconds: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    user_cache_max_entries: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
 
     aviationstack_access_key: str = os.getenv("AVIATIONSTACK_ACCESS_KEY", "")
+    aviationstack_base_url: str = os.getenv(
+        "AVIATIONSTACK_BASE_URL", "https://api.aviationstack.com"
+    )
+    aviationstack_rate_per_second: float = float(os.getenv("AVIATIONSTACK_RATE_PER_SECOND", "1"))
+    aviationstack_burst: float = float(os.getenv("AVIATIONSTACK_BURST", "5"))
+    http_pool_maxsize: int = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+    http_rate_limit_max_wait_seconds: float = float(
+        os.getenv("HTTP_RATE_LIMIT_MAX_WAIT_SECONDS", "300")
+    )
+    http_rate_limit_request_wait_seconds: float = float(
+        os.getenv("HTTP_RATE_LIMIT_REQUEST_WAIT_SECONDS", "2")
+    )
+    ingest_mode: str = os.getenv("INGEST_MODE", "bulk")
+    ingest_max_concurrency: int = int(os.getenv("INGEST_MAX_CONCURRENCY", "8"))
+    ingest_batch_max_targets: int = int(os.getenv("INGEST_BATCH_MAX_TARGETS", "100"))
+    ingest_job_workers: int = int(os.getenv("INGEST_JOB_WORKERS", "2"))
+    bulk_max_operations: int = int(os.getenv("BULK_MAX_OPERATIONS", "1000"))
+    ingest_job_db_path: str = os.getenv("INGEST_JOB_DB_PATH", "var/ingest_jobs.sqlite3")
+    ingest_job_stale_seconds: float = float(os.getenv("INGEST_JOB_STALE_SECONDS", "300"))
+    ingest_reuse_seconds: float = float(os.getenv("INGEST_REUSE_SECONDS", "0"))
+    ingest_change_detection: bool = os.getenv("INGEST_CHANGE_DETECTION", "true").lower() == "true"
+    fingerprint_cache_ttl_seconds: float = float(os.getenv("FINGERPRINT_CACHE_TTL_SECONDS", "3600"))
+    fingerprint_cache_max_entries: int = int(os.getenv("FINGERPRINT_CACHE_MAX_ENTRIES", "50000"))
+    scheduler_enabled: bool = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+    scheduler_airports: str = os.getenv("SCHEDULER_AIRPORTS", "")
+    scheduler_limit: int = int(os.getenv("SCHEDULER_LIMIT", "100"))
+    scheduler_max_concurrency: int = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "2"))
+    scheduler_fetch_concurrency: int = int(os.getenv("SCHEDULER_FETCH_CONCURRENCY", "2"))
+    scheduler_jitter_ratio: float = float(os.getenv("SCHEDULER_JITTER_RATIO", "0.1"))
+    scheduler_max_backoff_seconds: float = float(os.getenv("SCHEDULER_MAX_BACKOFF_SECONDS", "3600"))
 
     google_client_id: str = os.getenv("GOOGLE_CLIENT_ID", "")
     google_client_secret: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
@@ -20,6 +54,18 @@ class Settings(BaseSettings):
 
     gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
     gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    gemini_base_url: str = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+    gemini_timeout_seconds: float = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+    gemini_rate_per_second: float = float(os.getenv("GEMINI_RATE_PER_SECOND", "0"))
+    gemini_burst: float = float(os.getenv("GEMINI_BURST", "5"))
+    gemini_max_retries: int = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+    gemini_backoff_base_seconds: float = float(os.getenv("GEMINI_BACKOFF_BASE_SECONDS", "0.5"))
+    gemini_backoff_max_seconds: float = float(os.getenv("GEMINI_BACKOFF_MAX_SECONDS", "10"))
+    ai_answer_cache_ttl_seconds: float = float(os.getenv("AI_ANSWER_CACHE_TTL_SECONDS", "600"))
+    ai_answer_cache_max_entries: int = int(os.getenv("AI_ANSWER_CACHE_MAX_ENTRIES", "512"))
+    ai_context_max_tokens: int = int(os.getenv("AI_CONTEXT_MAX_TOKENS", "6000"))
+    ai_context_max_rows: int = int(os.getenv("AI_CONTEXT_MAX_ROWS", "300"))
+    ai_context_lookback_days: int = int(os.getenv("AI_CONTEXT_LOOKBACK_DAYS", "7"))
 
     snowflake_account: str = os.getenv("SNOWFLAKE_ACCOUNT", "")
     snowflake_user: str = os.getenv("SNOWFLAKE_USER", "")
@@ -29,6 +75,38 @@ class Settings(BaseSettings):
     snowflake_database: str = os.getenv("SNOWFLAKE_DATABASE", "")
     snowflake_schema: str = os.getenv("SNOWFLAKE_SCHEMA", "")
 
+    snowflake_pool_size: int = int(os.getenv("SNOWFLAKE_POOL_SIZE", "8"))
+    snowflake_pool_warmup: int = int(os.getenv("SNOWFLAKE_POOL_WARMUP", "2"))
+    snowflake_pool_timeout_seconds: float = float(os.getenv("SNOWFLAKE_POOL_TIMEOUT_SECONDS", "30"))
+    snowflake_pool_max_idle_seconds: float = float(
+        os.getenv("SNOWFLAKE_POOL_MAX_IDLE_SECONDS", "600")
+    )
+    snowflake_pool_max_lifetime_seconds: float = float(
+        os.getenv("SNOWFLAKE_POOL_MAX_LIFETIME_SECONDS", "3600")
+    )
+    snowflake_pool_health_check_seconds: float = float(
+        os.getenv("SNOWFLAKE_POOL_HEALTH_CHECK_SECONDS", "60")
+    )
+
+    profiler_enabled: bool = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+    profiler_threshold_seconds: float = float(os.getenv("PROFILER_THRESHOLD_SECONDS", "1.0"))
+    profiler_sample_rate: float = float(os.getenv("PROFILER_SAMPLE_RATE", "1.0"))
+    profiler_interval_seconds: float = float(os.getenv("PROFILER_INTERVAL_SECONDS", "0.005"))
+    profiler_dir: str = os.getenv("PROFILER_DIR", "var/profiles")
+    profiler_keep: int = int(os.getenv("PROFILER_KEEP", "50"))
+    db_slow_query_seconds: float = float(os.getenv("DB_SLOW_QUERY_SECONDS", "1.0"))
+    db_executor_workers: int = int(os.getenv("DB_EXECUTOR_WORKERS", "8"))
+    db_executor_max_queue: int = int(os.getenv("DB_EXECUTOR_MAX_QUEUE", "256"))
+
+    dim_cache_ttl_seconds: float = float(os.getenv("DIM_CACHE_TTL_SECONDS", "300"))
+    dim_cache_max_entries: int = int(os.getenv("DIM_CACHE_MAX_ENTRIES", "1024"))
+    flight_list_reuse_seconds: float = float(os.getenv("FLIGHT_LIST_REUSE_SECONDS", "0"))
+    fast_json: bool = os.getenv("FAST_JSON", "true").lower() == "true"
+    compression_min_bytes: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    etag_max_staleness_seconds: float = float(os.getenv("ETAG_MAX_STALENESS_SECONDS", "60"))
+    kpi_cache_ttl_seconds: float = float(os.getenv("KPI_CACHE_TTL_SECONDS", "300"))
+    kpi_cache_max_entries: int = int(os.getenv("KPI_CACHE_MAX_ENTRIES", "256"))
+
 
 @lru_cache
 def get_settings() -> Settings:
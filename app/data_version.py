@@ -0,0 +1,21 @@
+import threading
+from uuid import uuid4
+
+DOMAINS = ("flights", "flights_seen", "airports", "airlines")
+
+# A fresh epoch per process keeps versions from different workers or restarts distinct
+_epoch = uuid4().hex[:8]
+_versions = {domain: 0 for domain in DOMAINS}
+_lock = threading.Lock()
+
+
+def bump(*domains: str) -> None:
+    with _lock:
+        for domain in domains:
+            _versions[domain] += 1
+
+
+def current(*domains: str) -> str:
+    with _lock:
+        counters = ".".join(str(_versions[domain]) for domain in domains or DOMAINS)
+    return f"{_epoch}-{counters}"
@@ -0,0 +1,118 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import get_settings
+from app.metrics import Gauge
+from app.profiling import attach_thread
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int, max_queue: int, name: str = "db") -> None:
+        self._max_workers = max(1, max_workers)
+        self._max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            with attach_thread():
+                return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self._max_queue and self._queued >= self._max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError("Database executor queue is full")
+            self._queued += 1
+        # Carry contextvars (request-scoped state) into the worker thread
+        ctx = contextvars.copy_context()
+        try:
+            future = self._pool.submit(ctx.run, self._run, func, *args, **kwargs)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: Future) -> None:
+        # Cancelled before a worker picked it up, so _run never decremented the queue
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "max_queue": self._max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[BoundedExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> BoundedExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                settings = get_settings()
+                _executor = BoundedExecutor(
+                    settings.db_executor_workers, settings.db_executor_max_queue
+                )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await get_executor().run(func, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return get_executor().stats()
+
+
+def _executor_gauge() -> dict:
+    if _executor is None:
+        return {}
+    stats = _executor.stats()
+    return {(state,): stats[state] for state in ("active", "queued", "completed", "rejected")}
+
+
+Gauge("db_executor_tasks", "Blocking-call executor tasks by state", ("state",), _executor_gauge)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
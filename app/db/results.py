@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from typing import Any, Iterable, Optional
+
+from snowflake.connector.errors import NotSupportedError
+
+from app.db.snowflake import get_connection, run_statement, timed_fetch
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+
+@contextmanager
+def _cursor():
+    with get_connection() as conn:
+        cur = conn.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+
+def _columns(cur) -> list[str]:
+    return [col[0].lower() for col in cur.description]
+
+
+def _arrow_tables(cur):
+    # Column names are lowered once per batch rather than once per row
+    for table in cur.fetch_arrow_batches():
+        yield table.rename_columns([name.lower() for name in table.column_names])
+
+
+def records_from_cursor(cur) -> list[dict]:
+    if pa is not None:
+        try:
+            records: list[dict] = []
+            for table in _arrow_tables(cur):
+                records.extend(table.to_pylist())
+            return records
+        except NotSupportedError:
+            # Result came back as JSON (e.g. SHOW commands); use the row path below
+            pass
+    columns = _columns(cur)
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def columns_from_cursor(cur) -> dict[str, list]:
+    if pa is not None:
+        try:
+            tables = list(_arrow_tables(cur))
+            if tables:
+                return pa.concat_tables(tables).to_pydict()
+        except NotSupportedError:
+            pass
+    columns = _columns(cur)
+    rows = cur.fetchall()
+    if not rows:
+        return {name: [] for name in columns}
+    return {name: list(values) for name, values in zip(columns, zip(*rows))}
+
+
+def fetch_records(
+    sql: str, params: Optional[Iterable[Any]] = None, name: Optional[str] = None
+) -> list[dict]:
+    with _cursor() as cur:
+        name = run_statement(cur, sql, params, name)
+        with timed_fetch(name):
+            return records_from_cursor(cur)
+
+
+def fetch_record(
+    sql: str, params: Optional[Iterable[Any]] = None, name: Optional[str] = None
+) -> Optional[dict]:
+    with _cursor() as cur:
+        name = run_statement(cur, sql, params, name)
+        with timed_fetch(name):
+            row = cur.fetchone()
+        if row is None:
+            return None
+        return dict(zip(_columns(cur), row))
+
+
+def fetch_columns(
+    sql: str, params: Optional[Iterable[Any]] = None, name: Optional[str] = None
+) -> dict[str, list]:
+    with _cursor() as cur:
+        name = run_statement(cur, sql, params, name)
+        with timed_fetch(name):
+            return columns_from_cursor(cur)
@@ -1,17 +1,214 @@
 import logging
+import re
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Any, Iterable, Optional
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 import snowflake.connector
 
 from app.config import get_settings
+from app.db.executor import ExecutorSaturatedError, run_blocking
+from app.metrics import Counter, Gauge, Histogram
 
 logger = logging.getLogger(__name__)
 
+QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Snowflake statement execution time", ("statement",)
+)
+FETCH_SECONDS = Histogram(
+    "db_fetch_duration_seconds", "Time spent fetching Snowflake results", ("statement",)
+)
+QUERY_ROWS = Counter("db_query_rows_total", "Rows returned or affected", ("statement",))
+QUERY_ERRORS = Counter("db_query_errors_total", "Failed Snowflake statements", ("statement",))
+ACQUIRE_SECONDS = Histogram("db_pool_acquire_seconds", "Time waiting for a pooled connection")
+CONNECT_SECONDS = Histogram(
+    "db_connect_seconds", "New Snowflake session setup time by phase", ("phase",)
+)
 
-@contextmanager
-def get_connection():
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+([A-Za-z_][\w.$]*)", re.IGNORECASE)
+
+
+class PoolTimeoutError(RuntimeError):
+    pass
+
+
+# Back-pressure errors: routers let these through to the app-level 503 handler
+OVERLOAD_ERRORS = (ExecutorSaturatedError, PoolTimeoutError)
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used_at")
+
+    def __init__(self, conn: Any) -> None:
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used_at = now
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int,
+        timeout: float,
+        max_idle_seconds: float,
+        max_lifetime_seconds: float,
+        health_check_seconds: float,
+    ) -> None:
+        self._connect = connect
+        self._max_size = max(1, max_size)
+        self._timeout = timeout
+        self._max_idle = max_idle_seconds
+        self._max_lifetime = max_lifetime_seconds
+        self._health_check = health_check_seconds
+        self._idle: deque[_PooledConnection] = deque()
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._closed = 0
+        self._timeouts = 0
+
+    def _expired(self, pooled: _PooledConnection, now: float) -> bool:
+        return (
+            now - pooled.created_at > self._max_lifetime
+            or now - pooled.last_used_at > self._max_idle
+        )
+
+    def _open(self) -> _PooledConnection:
+        pooled = _PooledConnection(self._connect())
+        with self._cond:
+            self._created += 1
+        return pooled
+
+    def _close(self, pooled: _PooledConnection) -> None:
+        try:
+            pooled.conn.close()
+        except Exception:
+            logger.debug("Error closing pooled connection", exc_info=True)
+        with self._cond:
+            self._closed += 1
+
+    def _healthy(self, pooled: _PooledConnection, now: float) -> bool:
+        try:
+            if pooled.conn.is_closed():
+                return False
+            if now - pooled.last_used_at > self._health_check:
+                with pooled.conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+        except Exception:
+            logger.warning("Pooled Snowflake connection failed health check", exc_info=True)
+            return False
+        return True
+
+    def _checkout(self, deadline: float, stale: list) -> Optional[_PooledConnection]:
+        # None means a slot was reserved for a new connection; expired idle ones land in `stale`.
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                fresh = [p for p in self._idle if not self._expired(p, now)]
+                if len(fresh) != len(self._idle):
+                    stale.extend(p for p in self._idle if self._expired(p, now))
+                    self._idle = deque(fresh)
+                if self._idle:
+                    self._in_use += 1
+                    return self._idle.pop()
+                if self._in_use < self._max_size:
+                    self._in_use += 1
+                    return None
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self._timeout:.0f}s waiting for a Snowflake connection"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+    def acquire(self) -> _PooledConnection:
+        deadline = time.monotonic() + self._timeout
+        while True:
+            stale: list[_PooledConnection] = []
+            try:
+                pooled = self._checkout(deadline, stale)
+            finally:
+                for old in stale:
+                    self._close(old)
+            if pooled is None:
+                try:
+                    return self._open()
+                except Exception:
+                    with self._cond:
+                        self._in_use -= 1
+                        self._cond.notify()
+                    raise
+            if self._healthy(pooled, time.monotonic()):
+                return pooled
+            self.release(pooled, discard=True)
+
+    def release(self, pooled: _PooledConnection, discard: bool = False) -> None:
+        if not discard:
+            try:
+                discard = pooled.conn.is_closed()
+            except Exception:
+                discard = True
+        with self._cond:
+            self._in_use -= 1
+            if not discard:
+                pooled.last_used_at = time.monotonic()
+                self._idle.append(pooled)
+            self._cond.notify()
+        if discard:
+            self._close(pooled)
+
+    def warm(self, count: int) -> int:
+        with self._cond:
+            target = max(0, min(count, self._max_size) - len(self._idle) - self._in_use)
+            self._in_use += target
+        opened = 0
+        try:
+            for _ in range(target):
+                pooled = self._open()
+                with self._cond:
+                    self._in_use -= 1
+                    self._idle.append(pooled)
+                    self._cond.notify()
+                opened += 1
+        finally:
+            with self._cond:
+                self._in_use -= target - opened
+                self._cond.notify_all()
+        return opened
+
+    def close_idle(self) -> None:
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "max_size": self._max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "created": self._created,
+                "closed": self._closed,
+                "timeouts": self._timeouts,
+            }
+
+
+def _connect():
     settings = get_settings()
+    started = time.perf_counter()
     conn = snowflake.connector.connect(
         account=settings.snowflake_account,
         user=settings.snowflake_user,
@@ -21,8 +218,10 @@ def get_connection():
         database=settings.snowflake_database or None,
         schema=settings.snowflake_schema or None,
     )
+    connected = time.perf_counter()
+    CONNECT_SECONDS.observe(connected - started, "connect")
     try:
-        # Ensure session context even if envs were empty on connect
+        # Ensure session context even if envs were empty on connect; runs once per pooled session
         with conn.cursor() as cur:
             if settings.snowflake_warehouse:
                 cur.execute(f"USE WAREHOUSE {settings.snowflake_warehouse}")
@@ -30,9 +229,167 @@ def get_connection():
                 cur.execute(f"USE DATABASE {settings.snowflake_database}")
             if settings.snowflake_schema:
                 cur.execute(f"USE SCHEMA {settings.snowflake_schema}")
-        yield conn
-    finally:
+    except Exception:
         conn.close()
+        raise
+    CONNECT_SECONDS.observe(time.perf_counter() - connected, "session")
+    return conn
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                settings = get_settings()
+                _pool = ConnectionPool(
+                    _connect,
+                    max_size=settings.snowflake_pool_size,
+                    timeout=settings.snowflake_pool_timeout_seconds,
+                    max_idle_seconds=settings.snowflake_pool_max_idle_seconds,
+                    max_lifetime_seconds=settings.snowflake_pool_max_lifetime_seconds,
+                    health_check_seconds=settings.snowflake_pool_health_check_seconds,
+                )
+    return _pool
+
+
+def warm_pool() -> int:
+    settings = get_settings()
+    if not settings.snowflake_account:
+        return 0
+    return get_pool().warm(settings.snowflake_pool_warmup)
+
+
+def close_pool() -> None:
+    if _pool is not None:
+        _pool.close_idle()
+
+
+def pool_stats() -> dict:
+    return get_pool().stats()
+
+
+def _pool_gauge() -> dict:
+    if _pool is None:
+        return {}
+    stats = _pool.stats()
+    return {(state,): stats[state] for state in ("in_use", "idle", "waiting")}
+
+
+Gauge("db_pool_connections", "Pooled Snowflake connections by state", ("state",), _pool_gauge)
+
+
+@lru_cache(maxsize=1024)
+def statement_name(sql: str) -> str:
+    words = sql.split(None, 1)
+    if not words:
+        return "empty"
+    match = _TABLE_RE.search(sql)
+    verb = words[0].lower()
+    return f"{verb}:{match.group(1).lower()}" if match else verb
+
+
+def run_statement(
+    cur, sql: str, params: Any = None, name: Optional[str] = None, many: bool = False
+):
+    name = name or statement_name(sql)
+    started = time.perf_counter()
+    try:
+        if many:
+            cur.executemany(sql, params)
+        else:
+            cur.execute(sql, params)
+    except Exception:
+        QUERY_ERRORS.inc(name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        QUERY_SECONDS.observe(elapsed, name)
+    rowcount = getattr(cur, "rowcount", None)
+    if rowcount and rowcount > 0:
+        QUERY_ROWS.inc(name, amount=rowcount)
+    if elapsed >= get_settings().db_slow_query_seconds:
+        logger.info(
+            "Slow statement %s took %.3fs rows=%s sfqid=%s",
+            name,
+            elapsed,
+            rowcount,
+            getattr(cur, "sfqid", None),
+        )
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Statement %s took %.3fs rows=%s sfqid=%s",
+            name,
+            elapsed,
+            rowcount,
+            getattr(cur, "sfqid", None),
+        )
+    return name
+
+
+def run_chunked(
+    cur, template: str, keys: list, name: str, chunk_size: int = 1000, fetch: bool = False
+) -> list[tuple]:
+    # Expands "{}" in the template into an IN list of at most chunk_size placeholders
+    rows = []
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start : start + chunk_size]
+        run_statement(cur, template.format(", ".join(["%s"] * len(chunk))), chunk, name)
+        if fetch:
+            rows.extend(cur.fetchall())
+    return rows
+
+
+@contextmanager
+def timed_fetch(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        FETCH_SECONDS.observe(time.perf_counter() - started, name)
+
+
+def _rollback(conn) -> bool:
+    try:
+        conn.rollback()
+    except Exception:
+        logger.warning("Rollback failed; discarding pooled connection", exc_info=True)
+        return False
+    return True
+
+
+@contextmanager
+def get_connection():
+    pool = get_pool()
+    started = time.perf_counter()
+    pooled = pool.acquire()
+    ACQUIRE_SECONDS.observe(time.perf_counter() - started)
+    discard = False
+    try:
+        yield pooled.conn
+    except Exception:
+        discard = not _rollback(pooled.conn)
+        raise
+    finally:
+        pool.release(pooled, discard=discard)
+
+
+@contextmanager
+def transaction(cur):
+    cur.execute("BEGIN")
+    try:
+        yield cur
+    except Exception:
+        try:
+            cur.execute("ROLLBACK")
+        except Exception:
+            logger.warning("Rollback failed", exc_info=True)
+        raise
+    cur.execute("COMMIT")
 
 
 @contextmanager
@@ -46,23 +403,59 @@ def get_cursor():
             cur.close()
 
 
-def execute(sql: str, params: Optional[Iterable[Any]] = None) -> None:
+def execute(sql: str, params: Optional[Iterable[Any]] = None, name: Optional[str] = None) -> None:
     with get_cursor() as cur:
-        cur.execute(sql, params)
+        run_statement(cur, sql, params, name)
 
 
-def execute_many(sql: str, params_seq: Iterable[Iterable[Any]]) -> None:
+def execute_many(sql: str, params_seq: Iterable[Iterable[Any]], name: Optional[str] = None) -> None:
     with get_cursor() as cur:
-        cur.executemany(sql, params_seq)
+        run_statement(cur, sql, params_seq, name, many=True)
 
 
-def fetch_one(sql: str, params: Optional[Iterable[Any]] = None) -> Optional[dict]:
+def fetch_one(
+    sql: str, params: Optional[Iterable[Any]] = None, name: Optional[str] = None
+) -> Optional[dict]:
     with get_cursor() as cur:
-        cur.execute(sql, params)
-        return cur.fetchone()
+        name = run_statement(cur, sql, params, name)
+        with timed_fetch(name):
+            return cur.fetchone()
 
 
-def fetch_all(sql: str, params: Optional[Iterable[Any]] = None) -> list[dict]:
+def fetch_all(
+    sql: str, params: Optional[Iterable[Any]] = None, name: Optional[str] = None
+) -> list[dict]:
     with get_cursor() as cur:
-        cur.execute(sql, params)
-        return cur.fetchall()
+        name = run_statement(cur, sql, params, name)
+        with timed_fetch(name):
+            return cur.fetchall()
+
+
+def stream_batches(
+    sql: str, params: Optional[Iterable[Any]] = None, batch_size: int = 5000
+) -> Iterator[tuple[list[str], list[tuple]]]:
+    # Holds one pooled connection until the caller exhausts or closes the generator.
+    with get_connection() as conn:
+        cur = conn.cursor()
+        try:
+            run_statement(cur, sql, params, "export")
+            columns = [col[0].lower() for col in cur.description]
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield columns, rows
+        finally:
+            cur.close()
+
+
+async def execute_async(sql: str, params: Optional[Iterable[Any]] = None) -> None:
+    await run_blocking(execute, sql, params)
+
+
+async def fetch_one_async(sql: str, params: Optional[Iterable[Any]] = None) -> Optional[dict]:
+    return await run_blocking(fetch_one, sql, params)
+
+
+async def fetch_all_async(sql: str, params: Optional[Iterable[Any]] = None) -> list[dict]:
+    return await run_blocking(fetch_all, sql, params)
@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import get_settings
+from app.metrics import Histogram, timed_request
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_WAIT = Histogram(
+    "http_client_rate_limit_wait_seconds",
+    "Time outbound calls waited for an upstream rate limit token",
+    ("upstream",),
+)
+
+
+class RateLimitTimeout(RuntimeError):
+    def __init__(self, wait: float, max_wait: float) -> None:
+        super().__init__(f"rate limit wait of {wait:.1f}s exceeds {max_wait:.1f}s")
+        self.wait = wait
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average with bursts of up to `capacity`.
+
+    Callers that find the bucket empty reserve a token and sleep until it is
+    due, so concurrent callers queue in arrival order instead of failing.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, max_wait: Optional[float]) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                raise RateLimitTimeout(wait, max_wait)
+            self._tokens -= 1
+            return wait
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        wait = self._reserve(max_wait)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+_sessions: dict[str, requests.Session] = {}
+_limiters: dict[str, Optional[TokenBucket]] = {}
+_lock = threading.Lock()
+
+
+def _limits(upstream: str) -> tuple[float, float]:
+    settings = get_settings()
+    if upstream == "aviationstack":
+        return settings.aviationstack_rate_per_second, settings.aviationstack_burst
+    if upstream == "gemini":
+        return settings.gemini_rate_per_second, settings.gemini_burst
+    return 0, 0
+
+
+def get_limiter(upstream: str) -> Optional[TokenBucket]:
+    with _lock:
+        if upstream not in _limiters:
+            rate, burst = _limits(upstream)
+            _limiters[upstream] = TokenBucket(rate, burst) if rate > 0 else None
+        return _limiters[upstream]
+
+
+def get_session(url: str) -> requests.Session:
+    # One pool per scheme and host, so every call to an upstream reuses its connections
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    with _lock:
+        session = _sessions.get(origin)
+        if session is None:
+            size = get_settings().http_pool_maxsize
+            session = requests.Session()
+            session.mount(origin, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+            _sessions[origin] = session
+        return session
+
+
+def request(
+    upstream: str,
+    method: str,
+    url: str,
+    timeout: float,
+    max_wait: Optional[float] = None,
+    **kwargs: Any,
+):
+    """Sends one call through the upstream's pooled session and rate limiter.
+
+    `max_wait` caps how long the call may queue for a rate limit token before
+    RateLimitTimeout. It defaults to HTTP_RATE_LIMIT_REQUEST_WAIT_SECONDS,
+    since most callers hold an API worker thread; jobs and the scheduler pass
+    HTTP_RATE_LIMIT_MAX_WAIT_SECONDS to queue for longer.
+    """
+    limiter = get_limiter(upstream)
+    if limiter is not None:
+        if max_wait is None:
+            max_wait = get_settings().http_rate_limit_request_wait_seconds
+        waited = limiter.acquire(max_wait)
+        RATE_LIMIT_WAIT.observe(waited, upstream)
+        if waited:
+            logger.debug("Waited %.2fs for %s rate limit", waited, upstream)
+    session = get_session(url)
+    return timed_request(upstream, session.request, method, url, timeout=timeout, **kwargs)
+
+
+def get(upstream: str, url: str, timeout: float, **kwargs: Any):
+    return request(upstream, "GET", url, timeout, **kwargs)
+
+
+def post(upstream: str, url: str, timeout: float, **kwargs: Any):
+    return request(upstream, "POST", url, timeout, **kwargs)
+
+
+def reset() -> None:
+    """Closes pooled connections and rebuilds rate limiters from current settings."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _limiters.clear()
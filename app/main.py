@@ -1,13 +1,53 @@
 import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
-from app.api.routers import ai, uniqueairline, airlines, airports, auth, flights, ingest
+from app.api.routers import (
+    admin,
+    ai,
+    airlines,
+    airports,
+    auth,
+    flights,
+    ingest,
+    kpis,
+    uniqueairline,
+)
+from app.db.executor import shutdown_executor
+from app.db.snowflake import OVERLOAD_ERRORS, close_pool, warm_pool
+from app.metrics import CONTENT_TYPE, render
+from app.middleware import CompressionMiddleware, RequestMetricsMiddleware
+from app.services.ingest_jobs import get_job_queue
+from app.services.scheduler import get_scheduler
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        opened = warm_pool()
+        logger.info("Warmed Snowflake pool with %s connections", opened)
+    except Exception:
+        logger.warning(
+            "Snowflake pool warm-up failed; connections will open on demand", exc_info=True
+        )
+    resumed = get_job_queue().start()
+    if resumed:
+        logger.info("Resumed %s queued ingest jobs", resumed)
+    get_scheduler().start()
+    yield
+    get_scheduler().stop()
+    get_job_queue().stop()
+    shutdown_executor()
+    close_pool()
 
-app = FastAPI(title="Airport Snowflake API", version="1.0.0")
+
+app = FastAPI(title="Airport Snowflake API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,6 +56,20 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+
+
+async def overloaded(request: Request, exc: Exception):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+for _error in OVERLOAD_ERRORS:
+    app.add_exception_handler(_error, overloaded)
 
 
 @app.get("/health")
@@ -23,10 +77,17 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render(), media_type=CONTENT_TYPE)
+
+
 app.include_router(auth.router)
 app.include_router(ingest.router)
 app.include_router(airports.router)
 app.include_router(airlines.router)
 app.include_router(flights.router)
 app.include_router(uniqueairline.router)
+app.include_router(kpis.router)
 app.include_router(ai.router)
+app.include_router(admin.router)
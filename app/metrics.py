@@ -0,0 +1,185 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        _register(self)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values: Any, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: Any) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for values, total in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, values)} {_format_value(total)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple = (),
+        collect: Optional[Callable[[], dict[tuple, float]]] = None,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, *label_values: Any) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def inc(self, *label_values: Any, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: Any, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def render(self) -> list[str]:
+        if self._collect is not None:
+            try:
+                values = self._collect()
+            except Exception:
+                values = {}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        lines = self._header()
+        for label_values, value in sorted(values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values: Any) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values: Any) -> int:
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        lines = self._header()
+        for values, (counts, total, n) in items:
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {n}")
+        return lines
+
+
+_metrics: dict[str, _Metric] = {}
+_metrics_lock = threading.Lock()
+
+
+def _register(metric: _Metric) -> None:
+    with _metrics_lock:
+        if metric.name in _metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        _metrics[metric.name] = metric
+
+
+def render() -> str:
+    with _metrics_lock:
+        metrics = list(_metrics.values())
+    lines: list[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+HTTP_CLIENT_SECONDS = Histogram(
+    "http_client_request_duration_seconds",
+    "Outbound HTTP request latency by upstream and status",
+    ("upstream", "status"),
+)
+
+
+def timed_request(upstream: str, send: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    started = time.perf_counter()
+    status = "error"
+    try:
+        resp = send(*args, **kwargs)
+        status = str(resp.status_code)
+        return resp
+    finally:
+        HTTP_CLIENT_SECONDS.observe(time.perf_counter() - started, upstream, status)
@@ -0,0 +1,174 @@
+import gzip
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.metrics import Counter, Gauge, Histogram
+from app.profiling import activate, deactivate, get_profiler
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+MAX_ROUTE_CACHE = 4096
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by templated route",
+    ("method", "route", "status"),
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being served", ("method", "route"))
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes", "Response body size", ("route",), buckets=SIZE_BUCKETS
+)
+COMPRESSED_BYTES = Counter(
+    "http_response_compression_bytes_total",
+    "Response bytes before and after compression",
+    ("encoding", "stage"),
+)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._routes: dict[tuple[str, str], str] = {}
+
+    def _route(self, scope: Scope) -> str:
+        key = (scope["method"], scope["path"])
+        route = self._routes.get(key)
+        if route is not None:
+            return route
+        # Label by the route template so /flights/{flight_nk} stays one series
+        route = "unmatched"
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate.path
+                break
+            if match == Match.PARTIAL and route == "unmatched":
+                route = candidate.path
+        if len(self._routes) >= MAX_ROUTE_CACHE:
+            self._routes.clear()
+        self._routes[key] = route
+        return route
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route(scope)
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        profiler = get_profiler()
+        profile = profiler.begin(method, route) if profiler else None
+        token = activate(profile) if profile else None
+        IN_FLIGHT.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec(method, route)
+            REQUEST_SECONDS.observe(elapsed, method, route, str(status))
+            RESPONSE_BYTES.observe(size, route)
+            if profile:
+                deactivate(token)
+                profiler.end(profile, elapsed)
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Content codings an Accept-Encoding header allows; q=0 entries are refused."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        name, _, quality = params.strip().partition("=")
+        try:
+            if name.strip() == "q" and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        min_bytes = get_settings().compression_min_bytes
+        start: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not headers.get("content-type", "").startswith(
+                    COMPRESSIBLE_TYPES
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streaming responses go out as they are
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            if len(body) >= min_bytes:
+                compressed = _compress(body, encoding)
+                COMPRESSED_BYTES.inc(encoding, "identity", amount=len(body))
+                COMPRESSED_BYTES.inc(encoding, "encoded", amount=len(compressed))
+                body = compressed
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    max_size: int
+    in_use: int
+    idle: int
+    waiting: int
+    created: int
+    closed: int
+    timeouts: int
+
+
+class ExecutorStats(BaseModel):
+    max_workers: int
+    max_queue: int
+    active: int
+    queued: int
+    completed: int
+    rejected: int
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    max_entries: int
+    ttl_seconds: Optional[float] = None
+    hits: int
+    misses: int
+    evictions: int
+
+
+class CacheFlushResponse(BaseModel):
+    flushed: list[str]
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    route: str
+    started_at: datetime
+    duration_seconds: Optional[float] = None
+    samples: int
@@ -8,3 +8,4 @@ class AiAskRequest(BaseModel):
 class AiAskResponse(BaseModel):
     answer: str
     model: str
+    cached: bool = False
@@ -25,6 +25,7 @@ class AirlineOut(AirlineBase):
 
 class AirlineList(BaseModel):
     items: list[AirlineOut]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
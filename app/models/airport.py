@@ -27,6 +27,7 @@ class AirportOut(AirportBase):
 
 class AirportList(BaseModel):
     items: list[AirportOut]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,74 @@
+from typing import Annotated, Generic, Literal, Optional, TypeVar, Union
+
+from pydantic import BaseModel, Field
+
+from app.config import get_settings
+from app.models.airline import AirlineCreate, AirlineUpdate
+from app.models.airport import AirportCreate, AirportUpdate
+from app.models.flight import FlightCreate, FlightUpdate
+
+# Checked before any operation is validated, so oversized batches are rejected cheaply
+MAX_OPERATIONS = get_settings().bulk_max_operations
+
+CreateT = TypeVar("CreateT", bound=BaseModel)
+UpdateT = TypeVar("UpdateT", bound=BaseModel)
+
+
+class BulkCreate(BaseModel, Generic[CreateT]):
+    op: Literal["create"]
+    data: CreateT
+
+
+class BulkUpdate(BaseModel, Generic[UpdateT]):
+    op: Literal["update"]
+    key: str
+    data: UpdateT
+
+
+class BulkDelete(BaseModel):
+    op: Literal["delete"]
+    key: str
+
+
+FlightBulkOp = Annotated[
+    Union[BulkCreate[FlightCreate], BulkUpdate[FlightUpdate], BulkDelete],
+    Field(discriminator="op"),
+]
+AirportBulkOp = Annotated[
+    Union[BulkCreate[AirportCreate], BulkUpdate[AirportUpdate], BulkDelete],
+    Field(discriminator="op"),
+]
+AirlineBulkOp = Annotated[
+    Union[BulkCreate[AirlineCreate], BulkUpdate[AirlineUpdate], BulkDelete],
+    Field(discriminator="op"),
+]
+
+
+class FlightBulkRequest(BaseModel):
+    operations: list[FlightBulkOp] = Field(..., min_length=1, max_length=MAX_OPERATIONS)
+
+
+class AirportBulkRequest(BaseModel):
+    operations: list[AirportBulkOp] = Field(..., min_length=1, max_length=MAX_OPERATIONS)
+
+
+class AirlineBulkRequest(BaseModel):
+    operations: list[AirlineBulkOp] = Field(..., min_length=1, max_length=MAX_OPERATIONS)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    op: str
+    key: str
+    status: Literal[
+        "created", "updated", "unchanged", "deleted", "not_found", "conflict", "duplicate"
+    ]
+    detail: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    created: int
+    updated: int
+    deleted: int
+    failed: int
+    items: list[BulkItemResult]
@@ -47,6 +47,7 @@ class FlightOut(FlightBase):
 
 class FlightList(BaseModel):
     items: list[FlightOut]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
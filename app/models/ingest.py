@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
 
 
 class IngestResponse(BaseModel):
@@ -7,3 +10,73 @@ class IngestResponse(BaseModel):
     airports_upserted: int
     airlines_upserted: int
     flights_updated: int
+    flights_changed: int = 0
+    flights_unchanged: int = 0
+
+
+class IngestTarget(BaseModel):
+    iata: str = Field(..., min_length=3, max_length=4)
+    direction: Literal["dep", "arr", "both"] = "dep"
+
+
+class IngestBatchRequest(BaseModel):
+    targets: list[IngestTarget] = Field(..., min_length=1)
+    limit: int = Field(50, ge=1, le=100)
+    max_concurrency: Optional[int] = Field(None, ge=1, le=32)
+    mode: Optional[Literal["bulk", "per_record"]] = None
+
+
+class IngestTargetResult(BaseModel):
+    iata: str
+    direction: str
+    fetched: int
+    flights: int
+    error: Optional[str] = None
+
+
+class IngestBatchResponse(IngestResponse):
+    duplicates_skipped: int
+    targets: list[IngestTargetResult]
+
+
+class IngestJobRequest(BaseModel):
+    dep_iata: Optional[str] = Field(None, min_length=3, max_length=4)
+    arr_iata: Optional[str] = Field(None, min_length=3, max_length=4)
+    targets: Optional[list[IngestTarget]] = None
+    limit: int = Field(50, ge=1, le=100)
+    max_concurrency: Optional[int] = Field(None, ge=1, le=32)
+    mode: Optional[Literal["bulk", "per_record"]] = None
+    priority: int = Field(0, ge=0, le=9)
+
+
+class IngestJobOut(BaseModel):
+    id: str
+    kind: str
+    state: str
+    priority: int
+    stage: Optional[str] = None
+    progress: float
+    params: dict[str, Any]
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    result: Optional[Union[IngestBatchResponse, IngestResponse]] = None
+    error: Optional[str] = None
+    deduplicated: bool = False
+
+
+class ScheduledAirportStatus(BaseModel):
+    iata: str
+    direction: str
+    interval_seconds: float
+    peak_interval_seconds: float
+    running: bool
+    runs: int
+    consecutive_failures: int
+    next_run_in_seconds: float
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    last_rows_changed: Optional[int] = None
+    last_error: Optional[str] = None
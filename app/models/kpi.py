@@ -0,0 +1,26 @@
+from datetime import date
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class DelayKpiRow(BaseModel):
+    key: Optional[str] = None
+    flights: int
+    avg_dep_delay_min: Optional[float] = None
+    avg_arr_delay_min: Optional[float] = None
+    p50_dep_delay_min: Optional[float] = None
+    p90_dep_delay_min: Optional[float] = None
+    p50_arr_delay_min: Optional[float] = None
+    p90_arr_delay_min: Optional[float] = None
+    on_time_pct: Optional[float] = None
+    status_counts: dict[str, int]
+
+
+class DelayKpiResponse(BaseModel):
+    group_by: Literal["airport", "arr_airport", "airline", "route", "hour", "date"]
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    data_version: str
+    totals: Optional[DelayKpiRow] = None
+    items: list[DelayKpiRow]
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Optional
 
 from pydantic import BaseModel
@@ -6,6 +7,10 @@ from pydantic import BaseModel
 class UniqueAirlineItem(BaseModel):
     airline_iata: str
     airline_name: Optional[str] = None
+    departures: Optional[int] = None
+    arrivals: Optional[int] = None
+    first_seen_date: Optional[date] = None
+    last_seen_date: Optional[date] = None
 
 
 class UniqueAirlineResponse(BaseModel):
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+from uuid import uuid4
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+MAX_STACK_DEPTH = 64
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+def _fold(frame) -> str:
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class RequestProfile:
+    def __init__(self, method: str, route: str) -> None:
+        self.id = uuid4().hex[:12]
+        self.method = method
+        self.route = route
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_seconds: Optional[float] = None
+        self.samples = 0
+        self.stacks: dict[str, int] = {}
+        self._lock = threading.Lock()
+        # The loop thread is shared by every request, so it is only sampled while this
+        # request's own task is the one running on it
+        self.loop_thread = threading.get_ident()
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+            self.task: Optional[asyncio.Task] = asyncio.current_task()
+        except RuntimeError:
+            self.loop = self.task = None
+        # Executor threads working for this request, added by attach_thread
+        self.threads: set[int] = set()
+
+    def owns_loop(self) -> bool:
+        return self.task is not None and asyncio.current_task(self.loop) is self.task
+
+    def record(self, stack: str) -> None:
+        with self._lock:
+            self.samples += 1
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def folded(self) -> str:
+        with self._lock:
+            ordered = sorted(self.stacks.items(), key=lambda item: -item[1])
+        return "".join(f"{stack} {count}\n" for stack, count in ordered)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "route": self.route,
+            "started_at": self.started_at,
+            "duration_seconds": self.duration_seconds,
+            "samples": self.samples,
+        }
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        interval_seconds: float,
+        threshold_seconds: float,
+        sample_rate: float,
+        directory: str,
+        keep: int,
+    ) -> None:
+        self._interval = interval_seconds
+        self._threshold = threshold_seconds
+        self._sample_rate = sample_rate
+        self._directory = Path(directory) if directory else None
+        self._recent: deque[RequestProfile] = deque(maxlen=max(1, keep))
+        self._active: set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self, method: str, route: str) -> Optional[RequestProfile]:
+        if self._sample_rate < 1 and random.random() >= self._sample_rate:
+            return None
+        profile = RequestProfile(method, route)
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return profile
+
+    def end(self, profile: RequestProfile, duration: float) -> None:
+        with self._lock:
+            self._active.discard(profile)
+        if duration < self._threshold:
+            return
+        profile.duration_seconds = round(duration, 4)
+        with self._lock:
+            self._recent.append(profile)
+        if self._directory is not None:
+            self._write(profile)
+
+    def _write(self, profile: RequestProfile) -> None:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", profile.route).strip("_") or "root"
+        name = f"{profile.started_at:%Y%m%dT%H%M%S}-{profile.method}-{slug}-{profile.id}.folded"
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            (self._directory / name).write_text(profile.folded())
+        except OSError:
+            logger.warning("Could not write request profile %s", name, exc_info=True)
+
+    def _loop(self) -> None:
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._wake.clear()
+            if not active:
+                self._wake.wait()
+                continue
+            running = {profile: profile.owns_loop() for profile in active}
+            frames = sys._current_frames()
+            for profile in active:
+                # Still the running task after the snapshot, so the loop frame is its own
+                if running[profile] and profile.owns_loop():
+                    frame = frames.get(profile.loop_thread)
+                    if frame is not None:
+                        profile.record(_fold(frame))
+                for ident in tuple(profile.threads):
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        profile.record(_fold(frame))
+            del frames
+            time.sleep(self._interval)
+
+    def recent(self) -> list[dict]:
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._recent)]
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return next((p for p in self._recent if p.id == profile_id), None)
+
+
+def activate(profile: RequestProfile):
+    return _current.set(profile)
+
+
+def deactivate(token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def attach_thread() -> Iterator[None]:
+    # Used by worker threads so their stacks are sampled into the caller's profile
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    ident = threading.get_ident()
+    profile.threads.add(ident)
+    try:
+        yield
+    finally:
+        profile.threads.discard(ident)
+
+
+_profiler: Optional[SamplingProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Optional[SamplingProfiler]:
+    global _profiler
+    settings = get_settings()
+    if not settings.profiler_enabled:
+        return None
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = SamplingProfiler(
+                    settings.profiler_interval_seconds,
+                    settings.profiler_threshold_seconds,
+                    settings.profiler_sample_rate,
+                    settings.profiler_dir,
+                    settings.profiler_keep,
+                )
+    return _profiler
@@ -0,0 +1,322 @@
+import csv
+import io
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from app import data_version
+from app.cache import TTLCache
+from app.config import get_settings
+from app.db.results import fetch_columns, fetch_records
+from app.metrics import Histogram
+from app.services.flight_service import flight_filters
+
+DETAIL_COLUMNS = (
+    "FLIGHT_IATA",
+    "FLIGHT_DATE",
+    "FLIGHT_STATUS",
+    "AIRLINE_IATA",
+    "DEP_IATA",
+    "ARR_IATA",
+    "DEP_TERMINAL",
+    "DEP_GATE",
+    "ARR_GATE",
+    "DEP_SCHEDULED_UTC",
+    "DEP_ACTUAL_UTC",
+    "ARR_SCHEDULED_UTC",
+    "ARR_ACTUAL_UTC",
+    "DEP_DELAY_MIN",
+    "ARR_DELAY_MIN",
+)
+
+SUMMARY_ROWS_PER_GROUP = 15
+
+# data_version domains build_context reads: DIM_AIRPORT/DIM_AIRLINE names and FACT_FLIGHT
+# content. It never reads LAST_SEEN_AT, so touch-only ingests (flights_seen) don't count.
+CONTEXT_DOMAINS = ("flights", "airports", "airlines")
+
+# About four characters per token for English and CSV; only used to stay under the budget
+CHARS_PER_TOKEN = 4
+
+AIRPORT_CODE_RE = re.compile(r"\b[A-Z]{3}\b")
+AIRLINE_CODE_RE = re.compile(r"\b[A-Z0-9]{2}\b")
+FLIGHT_RE = re.compile(r"\b([A-Z][A-Z0-9]|[0-9][A-Z])( ?)(\d{1,4})\b", re.IGNORECASE)
+ISO_DATE_RE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+LAST_DAYS_RE = re.compile(r"\b(?:last|past)\s+(\d{1,3})\s+days\b", re.IGNORECASE)
+LAST_WEEK_RE = re.compile(r"\b(?:last|past)\s+week\b", re.IGNORECASE)
+ROUTE_RE = re.compile(r"\bfrom\s+([A-Z]{3})\b.*?\bto\s+([A-Z]{3})\b", re.DOTALL)
+
+# Two-letter words that are also airline codes
+AIRLINE_CODE_STOPWORDS = {"AM", "PM", "US", "OK", "IT", "TV", "UK", "EU", "ID", "NO"}
+NAME_NOISE_RE = re.compile(r"\b(international|intl|airport|airlines?|air lines|airways)\b")
+
+STATUS_WORDS = {
+    "cancel": "cancelled",
+    "divert": "diverted",
+    "landed": "landed",
+    "incident": "incident",
+    "in the air": "active",
+}
+
+CONTEXT_TOKENS = Histogram(
+    "ai_context_tokens",
+    "Estimated prompt context size per question",
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+
+_settings = get_settings()
+_vocabulary_cache = TTLCache("ai_vocabulary", 4, _settings.dim_cache_ttl_seconds)
+
+
+def _alias(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    alias = " ".join(NAME_NOISE_RE.sub(" ", name.lower()).split())
+    return alias if len(alias) >= 4 else None
+
+
+def _load_vocabulary() -> dict:
+    airports = fetch_records(
+        "SELECT AIRPORT_IATA, AIRPORT_NAME FROM DIM_AIRPORT", name="ai_airport_vocabulary"
+    )
+    airlines = fetch_records(
+        "SELECT AIRLINE_IATA, AIRLINE_NAME FROM DIM_AIRLINE", name="ai_airline_vocabulary"
+    )
+    return {
+        "airports": {r["airport_iata"]: _alias(r["airport_name"]) for r in airports},
+        "airlines": {r["airline_iata"]: _alias(r["airline_name"]) for r in airlines},
+    }
+
+
+def _vocabulary() -> dict:
+    # Keyed on the dimension data version so admin edits and ingests are picked up
+    version = data_version.current("airports", "airlines")
+    return _vocabulary_cache.get_or_load(version, _load_vocabulary)
+
+
+def _by_name(text: str, names: dict[str, Optional[str]]) -> list[str]:
+    lowered = text.lower()
+    return [
+        code
+        for code, alias in names.items()
+        if alias and re.search(rf"\b{re.escape(alias)}\b", lowered)
+    ]
+
+
+def extract_entities(question: str, vocabulary: dict, today: date) -> dict:
+    airports, airlines = vocabulary["airports"], vocabulary["airlines"]
+
+    found_airports = [c for c in AIRPORT_CODE_RE.findall(question) if c in airports]
+    found_airports += _by_name(question, airports)
+
+    flights = []
+    for prefix, space, number in FLIGHT_RE.findall(question):
+        # "at 10" is not a flight; a spaced number needs an upper-case, known airline code
+        if prefix.upper() in airlines and (not space or prefix.isupper()):
+            flights.append(f"{prefix.upper()}{number}")
+
+    found_airlines = [
+        c
+        for c in AIRLINE_CODE_RE.findall(question)
+        if c in airlines and c not in AIRLINE_CODE_STOPWORDS
+    ]
+    found_airlines += _by_name(question, airlines)
+
+    route = None
+    match = ROUTE_RE.search(question)
+    if match and match.group(1) in airports and match.group(2) in airports:
+        route = (match.group(1), match.group(2))
+
+    dates = sorted(date.fromisoformat(d) for d in ISO_DATE_RE.findall(question) if _valid(d))
+    lowered = question.lower()
+    for word, offset in (("yesterday", -1), ("today", 0), ("tomorrow", 1)):
+        if word in lowered:
+            dates.append(today + timedelta(days=offset))
+    date_from = date_to = None
+    if dates:
+        date_from, date_to = min(dates), max(dates)
+    days = LAST_DAYS_RE.search(question)
+    if days or LAST_WEEK_RE.search(question):
+        # "last 0 days" reads as today rather than a range ending before it starts
+        date_from = today - timedelta(days=max(int(days.group(1)), 1) - 1 if days else 6)
+        date_to = today
+
+    return {
+        "airports": list(dict.fromkeys(found_airports)),
+        "route": route,
+        "airlines": list(dict.fromkeys(found_airlines)),
+        "flights": list(dict.fromkeys(flights)),
+        "statuses": [s for word, s in STATUS_WORDS.items() if word in lowered],
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+
+
+def _valid(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _in(column: str, values: list[str]) -> str:
+    return f"{column} IN ({', '.join(['%s'] * len(values))})"
+
+
+def context_filters(
+    entities: dict, today: date, lookback_days: int
+) -> tuple[list[str], list, dict]:
+    date_from, date_to = entities["date_from"], entities["date_to"]
+    if date_from is None and date_to is None and not entities["flights"]:
+        # Nothing pins the time range: default to recent days so the scan can prune
+        date_from = today - timedelta(days=lookback_days - 1)
+    dep, arr = entities["route"] or (None, None)
+    conditions, params = flight_filters(
+        dep,
+        arr,
+        None,
+        entities["statuses"],
+        date_from.isoformat() if date_from else None,
+        date_to.isoformat() if date_to else None,
+    )
+    applied = {}
+    if entities["route"]:
+        applied["route"] = f"{dep}-{arr}"
+    elif entities["airports"]:
+        airports = entities["airports"]
+        conditions.append(f"({_in('DEP_IATA', airports)} OR {_in('ARR_IATA', airports)})")
+        params.extend(airports * 2)
+        applied["airport"] = ",".join(airports)
+    if entities["airlines"]:
+        conditions.append(_in("AIRLINE_IATA", entities["airlines"]))
+        params.extend(entities["airlines"])
+        applied["airline"] = ",".join(entities["airlines"])
+    if entities["flights"]:
+        conditions.append(_in("FLIGHT_IATA", entities["flights"]))
+        params.extend(entities["flights"])
+        applied["flight"] = ",".join(entities["flights"])
+    if entities["statuses"]:
+        applied["status"] = ",".join(entities["statuses"])
+    if date_from or date_to:
+        applied["dates"] = f"{date_from or ''}..{date_to or ''}"
+    return conditions, params, applied
+
+
+def _summary_sql(where_clause: str) -> str:
+    # One scan: totals plus the busiest airlines and airports under the same filters
+    return f"""
+    SELECT * FROM (
+        SELECT
+            CASE
+                WHEN GROUPING(AIRLINE_IATA) = 0 THEN 'airline'
+                WHEN GROUPING(DEP_IATA) = 0 THEN 'dep_airport'
+                WHEN GROUPING(ARR_IATA) = 0 THEN 'arr_airport'
+                ELSE 'all'
+            END AS "group",
+            COALESCE(AIRLINE_IATA, DEP_IATA, ARR_IATA) AS "key",
+            COUNT(*) AS "flights",
+            COUNT_IF(FLIGHT_STATUS = 'cancelled') AS "cancelled",
+            COUNT_IF(COALESCE(ARR_DELAY_MIN, DEP_DELAY_MIN) > 15) AS "delayed_over_15",
+            ROUND(AVG(DEP_DELAY_MIN), 1) AS "avg_dep_delay",
+            ROUND(AVG(ARR_DELAY_MIN), 1) AS "avg_arr_delay",
+            MAX(DEP_DELAY_MIN) AS "max_dep_delay",
+            MIN(FLIGHT_DATE) AS "first_date",
+            MAX(FLIGHT_DATE) AS "last_date"
+        FROM FACT_FLIGHT
+        {where_clause}
+        GROUP BY GROUPING SETS ((AIRLINE_IATA), (DEP_IATA), (ARR_IATA), ())
+    )
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY "group" ORDER BY "flights" DESC) <= %s
+    ORDER BY "group", "flights" DESC
+    """
+
+
+def _detail_sql(where_clause: str) -> str:
+    return f"""
+    SELECT {", ".join(DETAIL_COLUMNS)}
+    FROM FACT_FLIGHT
+    {where_clause}
+    ORDER BY FLIGHT_DATE DESC NULLS LAST, DEP_SCHEDULED_UTC DESC NULLS LAST
+    LIMIT %s
+    """
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def csv_lines(columns: dict[str, list]) -> list[str]:
+    # Columns that are empty in every row are left out entirely
+    kept = [name for name, values in columns.items() if any(v is not None for v in values)]
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(kept)
+    for row in zip(*(columns[name] for name in kept)):
+        writer.writerow([_cell(v) for v in row])
+    return buf.getvalue().splitlines()
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def pack(sections: list[tuple[str, list[str]]], max_tokens: int) -> tuple[str, int]:
+    """Adds each section's header and as many rows as fit; returns (text, rows kept)."""
+    parts: list[str] = []
+    used = 0
+    kept = 0
+    for title, lines in sections:
+        if not lines:
+            continue
+        block = [title, lines[0]]
+        used += estimate_tokens("\n".join(block)) + 1
+        rows = lines[1:]
+        for i, line in enumerate(rows):
+            cost = estimate_tokens(line) + 1
+            if used + cost > max_tokens:
+                block.append(f"... {len(rows) - i} more rows not shown")
+                break
+            block.append(line)
+            used += cost
+            kept += 1
+        parts.append("\n".join(block))
+    return "\n\n".join(parts), kept
+
+
+def build_context(question: str, today: Optional[date] = None) -> dict:
+    settings = get_settings()
+    today = today or datetime.now(timezone.utc).date()
+    entities = extract_entities(question, _vocabulary(), today)
+    conditions, params, applied = context_filters(
+        entities, today, settings.ai_context_lookback_days
+    )
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+    summary = fetch_columns(
+        _summary_sql(where_clause), [*params, SUMMARY_ROWS_PER_GROUP], name="ai_context_summary"
+    )
+    detail = fetch_columns(
+        _detail_sql(where_clause),
+        [*params, settings.ai_context_max_rows],
+        name="ai_context_flights",
+    )
+    total = next(
+        (n for g, n in zip(summary.get("group", []), summary.get("flights", [])) if g == "all"), 0
+    )
+    text, rows = pack(
+        [
+            ("Summary (CSV, group=all is the total):", csv_lines(summary)),
+            (f"Flights (CSV, newest first, {total} matching):", csv_lines(detail)),
+        ],
+        settings.ai_context_max_tokens,
+    )
+    tokens = estimate_tokens(text)
+    CONTEXT_TOKENS.observe(tokens)
+    return {"text": text, "filters": applied, "rows": rows, "matching": total, "tokens": tokens}
@@ -1,65 +1,145 @@
-import json
 import logging
+import random
+import re
+import time
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
 
 import requests
 
+from app import data_version, http_client
+from app.cache import TTLCache
 from app.config import get_settings
-from app.db.snowflake import fetch_all
+from app.metrics import Counter
+from app.services.ai_context import CONTEXT_DOMAINS, build_context
 
 logger = logging.getLogger(__name__)
 
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
-def _fetch_flight_context(limit: int = 50) -> list[dict]:
-    sql = """
-    SELECT *
-    FROM FACT_FLIGHT
-    ORDER BY LAST_SEEN_AT DESC
-    LIMIT %s
-    """
-    return fetch_all(sql, (limit,))
+GEMINI_RETRIES = Counter("gemini_retries_total", "Retried Gemini calls by reason", ("reason",))
 
+_settings = get_settings()
+_answers = TTLCache(
+    "ai_answers", _settings.ai_answer_cache_max_entries, _settings.ai_answer_cache_ttl_seconds
+)
 
-def _build_prompt(question: str, flights: list[dict]) -> str:
-    data_blob = json.dumps(flights, default=str)
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+
+def _build_prompt(question: str, context: dict, today: date) -> str:
+    filters = ", ".join(f"{k}={v}" for k, v in context["filters"].items()) or "none"
     return (
         "You are a data assistant for an airport operations dashboard. "
         "Answer ONLY using the provided flight data. If the data is insufficient, say so.\n\n"
+        f"Today (UTC): {today.isoformat()}\n"
         f"Question: {question}\n\n"
-        f"Flight data (last 50 rows, most recent first, JSON):\n{data_blob}"
+        f"Flight data selected for this question (filters: {filters}). "
+        "Times are UTC, delays are in minutes, empty cells are unknown.\n\n"
+        f"{context['text']}"
     )
 
 
-def ask_ai(question: str) -> tuple[str, str]:
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    if re.fullmatch(r"\d+(\.\d+)?", value.strip()):
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _backoff(attempt: int, base: float, cap: float) -> float:
+    # Full jitter: concurrent callers that failed together don't retry together
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def _generate(prompt: str, model: str) -> requests.Response:
     settings = get_settings()
-    if not settings.gemini_api_key:
-        raise ValueError("GEMINI_API_KEY is not set")
+    url = f"{settings.gemini_base_url.rstrip('/')}/v1beta/models/{model}:generateContent"
+    body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+    attempt = 0
+    while True:
+        try:
+            resp = http_client.post(
+                "gemini",
+                url,
+                timeout=settings.gemini_timeout_seconds,
+                params={"key": settings.gemini_api_key},
+                json=body,
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= settings.gemini_max_retries:
+                raise
+            reason, delay = "connection", None
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt >= settings.gemini_max_retries:
+                return resp
+            reason, delay = str(resp.status_code), _retry_after(resp)
+            if delay is not None and delay > settings.gemini_backoff_max_seconds:
+                # Quota resets later than we're willing to hold a worker thread for
+                return resp
+        if delay is None:
+            delay = _backoff(
+                attempt, settings.gemini_backoff_base_seconds, settings.gemini_backoff_max_seconds
+            )
+        GEMINI_RETRIES.inc(reason)
+        logger.info("Retrying Gemini call (%s) in %.2fs", reason, delay)
+        time.sleep(delay)
+        attempt += 1
 
-    flights = _fetch_flight_context()
-    prompt = _build_prompt(question, flights)
 
-    model = settings.gemini_model
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
-    resp = requests.post(
-        url,
-        params={"key": settings.gemini_api_key},
-        json={
-            "contents": [
-                {
-                    "role": "user",
-                    "parts": [{"text": prompt}],
-                }
-            ]
-        },
-        timeout=30,
+class _Unparsed(Exception):
+    # Raised inside the cache loader so an unusable Gemini reply is never cached
+    pass
+
+
+def _answer(question: str, model: str, today: date) -> str:
+    context = build_context(question, today)
+    logger.debug(
+        "AI context: filters=%s rows=%s tokens~%s",
+        context["filters"],
+        context["rows"],
+        context["tokens"],
     )
+    resp = _generate(_build_prompt(question, context, today), model)
     if resp.status_code == 429:
         raise RuntimeError("Gemini rate limit exceeded. Please try again later.")
     resp.raise_for_status()
     payload = resp.json()
     try:
-        answer = payload["candidates"][0]["content"]["parts"][0]["text"]
-    except (KeyError, IndexError, TypeError):
+        return payload["candidates"][0]["content"]["parts"][0]["text"]
+    except (KeyError, IndexError, TypeError) as exc:
         logger.exception("Unexpected Gemini response: %s", payload)
-        answer = "Sorry, I couldn't parse a response from the AI model."
+        raise _Unparsed() from exc
+
 
-    return answer, model
+def ask_ai(question: str) -> tuple[str, str, bool]:
+    settings = get_settings()
+    if not settings.gemini_api_key:
+        raise ValueError("GEMINI_API_KEY is not set")
+
+    model = settings.gemini_model
+    today = datetime.now(timezone.utc).date()
+    # Relative questions ("today") change meaning at midnight, so the date is part of the key.
+    # Versions are read before the context, so an answer never outlives the data it saw.
+    key = (normalize_question(question), model, today, data_version.current(*CONTEXT_DOMAINS))
+    generated = []
+
+    def load() -> str:
+        generated.append(True)
+        return _answer(question, model, today)
+
+    # Identical questions asked concurrently share one Gemini call
+    try:
+        answer = _answers.get_or_load(key, load)
+    except _Unparsed:
+        return "Sorry, I couldn't parse a response from the AI model.", model, False
+    return answer, model, not generated
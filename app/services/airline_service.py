@@ -1,17 +1,23 @@
 from typing import Optional
 
-from app.db.snowflake import execute, fetch_all, fetch_one
+from app import data_version
+from app.cache import TTLCache
+from app.config import get_settings
+from app.db.results import fetch_columns, fetch_record
+from app.db.snowflake import execute, fetch_one
 from app.models.airline import AirlineCreate, AirlineUpdate
+from app.services.pagination import decode_cursor, next_cursor
+from app.services.uniqueservice import invalidate_unique_airlines
 
+_settings = get_settings()
+_cache = TTLCache("dim_airline", _settings.dim_cache_max_entries, _settings.dim_cache_ttl_seconds)
 
-def _normalize(row: Optional[dict]) -> Optional[dict]:
-    if not row:
-        return None
-    return {k.lower(): v for k, v in row.items()}
 
-
-def _normalize_list(rows: list[dict]) -> list[dict]:
-    return [{k.lower(): v for k, v in row.items()} for row in rows]
+def invalidate_airline_cache() -> None:
+    _cache.clear()
+    # Unique-airline rows carry the airline name
+    invalidate_unique_airlines()
+    data_version.bump("airlines")
 
 
 def create_airline(data: AirlineCreate) -> dict:
@@ -20,24 +26,48 @@ def create_airline(data: AirlineCreate) -> dict:
     VALUES (%s, %s, %s, CURRENT_TIMESTAMP())
     """
     execute(sql, (data.airline_iata, data.airline_icao, data.airline_name))
+    invalidate_airline_cache()
     return get_airline(data.airline_iata)
 
 
 def get_airline(iata: str) -> Optional[dict]:
     sql = "SELECT * FROM DIM_AIRLINE WHERE AIRLINE_IATA = %s"
-    return _normalize(fetch_one(sql, (iata,)))
-
-
-def list_airlines(limit: int, offset: int) -> tuple[list[dict], int]:
-    total_row = fetch_one("SELECT COUNT(*) AS CNT FROM DIM_AIRLINE")
-    total = int(total_row["CNT"]) if total_row else 0
-    sql = """
+    return _cache.get_or_load(("row", iata), lambda: fetch_record(sql, (iata,)))
+
+
+def list_airlines(
+    limit: int, offset: int, cursor: Optional[str] = None, include_total: bool = True
+) -> tuple[dict[str, list], Optional[int], Optional[str]]:
+    return _cache.get_or_load(
+        ("list", limit, offset, cursor, include_total),
+        lambda: _load_airlines(limit, offset, cursor, include_total),
+    )
+
+
+def _load_airlines(
+    limit: int, offset: int, cursor: Optional[str], include_total: bool
+) -> tuple[dict[str, list], Optional[int], Optional[str]]:
+    total = None
+    if include_total:
+        total_row = fetch_one("SELECT COUNT(*) AS CNT FROM DIM_AIRLINE")
+        total = int(total_row["CNT"]) if total_row else 0
+
+    where_clause = ""
+    params: list = []
+    if cursor:
+        (after,) = decode_cursor(cursor, 1)
+        where_clause = "WHERE AIRLINE_IATA > %s"
+        params.append(after)
+        offset = 0
+    sql = f"""
     SELECT * FROM DIM_AIRLINE
+    {where_clause}
     ORDER BY AIRLINE_IATA
     LIMIT %s OFFSET %s
     """
-    rows = fetch_all(sql, (limit, offset))
-    return _normalize_list(rows), total
+    columns = fetch_columns(sql, params + [limit + 1, offset])
+    columns, cursor_out = next_cursor(columns, limit, "airline_iata")
+    return columns, total, cursor_out
 
 
 def update_airline(iata: str, data: AirlineUpdate) -> Optional[dict]:
@@ -55,10 +85,12 @@ def update_airline(iata: str, data: AirlineUpdate) -> Optional[dict]:
     sql = f"UPDATE DIM_AIRLINE SET {', '.join(fields)}, UPDATED_AT = CURRENT_TIMESTAMP() WHERE AIRLINE_IATA = %s"
     params.append(iata)
     execute(sql, params)
+    invalidate_airline_cache()
     return get_airline(iata)
 
 
 def delete_airline(iata: str) -> bool:
     sql = "DELETE FROM DIM_AIRLINE WHERE AIRLINE_IATA = %s"
     execute(sql, (iata,))
+    invalidate_airline_cache()
     return True
@@ -1,17 +1,20 @@
 from typing import Optional
 
-from app.db.snowflake import execute, fetch_one, fetch_all
+from app import data_version
+from app.cache import TTLCache
+from app.config import get_settings
+from app.db.results import fetch_columns, fetch_record
+from app.db.snowflake import execute, fetch_one
 from app.models.airport import AirportCreate, AirportUpdate
+from app.services.pagination import decode_cursor, next_cursor
 
+_settings = get_settings()
+_cache = TTLCache("dim_airport", _settings.dim_cache_max_entries, _settings.dim_cache_ttl_seconds)
 
-def _normalize(row: Optional[dict]) -> Optional[dict]:
-    if not row:
-        return None
-    return {k.lower(): v for k, v in row.items()}
 
-
-def _normalize_list(rows: list[dict]) -> list[dict]:
-    return [{k.lower(): v for k, v in row.items()} for row in rows]
+def invalidate_airport_cache() -> None:
+    _cache.clear()
+    data_version.bump("airports")
 
 
 def create_airport(data: AirportCreate) -> dict:
@@ -20,24 +23,48 @@ def create_airport(data: AirportCreate) -> dict:
     VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP())
     """
     execute(sql, (data.airport_iata, data.airport_name, data.timezone, data.icao))
+    invalidate_airport_cache()
     return get_airport(data.airport_iata)
 
 
 def get_airport(iata: str) -> Optional[dict]:
     sql = "SELECT * FROM DIM_AIRPORT WHERE AIRPORT_IATA = %s"
-    return _normalize(fetch_one(sql, (iata,)))
-
-
-def list_airports(limit: int, offset: int) -> tuple[list[dict], int]:
-    total_row = fetch_one("SELECT COUNT(*) AS CNT FROM DIM_AIRPORT")
-    total = int(total_row["CNT"]) if total_row else 0
-    sql = """
+    return _cache.get_or_load(("row", iata), lambda: fetch_record(sql, (iata,)))
+
+
+def list_airports(
+    limit: int, offset: int, cursor: Optional[str] = None, include_total: bool = True
+) -> tuple[dict[str, list], Optional[int], Optional[str]]:
+    return _cache.get_or_load(
+        ("list", limit, offset, cursor, include_total),
+        lambda: _load_airports(limit, offset, cursor, include_total),
+    )
+
+
+def _load_airports(
+    limit: int, offset: int, cursor: Optional[str], include_total: bool
+) -> tuple[dict[str, list], Optional[int], Optional[str]]:
+    total = None
+    if include_total:
+        total_row = fetch_one("SELECT COUNT(*) AS CNT FROM DIM_AIRPORT")
+        total = int(total_row["CNT"]) if total_row else 0
+
+    where_clause = ""
+    params: list = []
+    if cursor:
+        (after,) = decode_cursor(cursor, 1)
+        where_clause = "WHERE AIRPORT_IATA > %s"
+        params.append(after)
+        offset = 0
+    sql = f"""
     SELECT * FROM DIM_AIRPORT
+    {where_clause}
     ORDER BY AIRPORT_IATA
     LIMIT %s OFFSET %s
     """
-    rows = fetch_all(sql, (limit, offset))
-    return _normalize_list(rows), total
+    columns = fetch_columns(sql, params + [limit + 1, offset])
+    columns, cursor_out = next_cursor(columns, limit, "airport_iata")
+    return columns, total, cursor_out
 
 
 def update_airport(iata: str, data: AirportUpdate) -> Optional[dict]:
@@ -58,10 +85,12 @@ def update_airport(iata: str, data: AirportUpdate) -> Optional[dict]:
     sql = f"UPDATE DIM_AIRPORT SET {', '.join(fields)}, UPDATED_AT = CURRENT_TIMESTAMP() WHERE AIRPORT_IATA = %s"
     params.append(iata)
     execute(sql, params)
+    invalidate_airport_cache()
     return get_airport(iata)
 
 
 def delete_airport(iata: str) -> bool:
     sql = "DELETE FROM DIM_AIRPORT WHERE AIRPORT_IATA = %s"
     execute(sql, (iata,))
+    invalidate_airport_cache()
     return True
@@ -0,0 +1,230 @@
+from contextlib import AbstractContextManager, nullcontext
+from typing import Callable, Optional
+
+from app import data_version
+from app.config import get_settings
+from app.db.snowflake import get_connection, run_chunked, run_statement, transaction
+from app.models.airline import AirlineBase, AirlineUpdate
+from app.models.airport import AirportBase, AirportUpdate
+from app.models.flight import FlightBase, FlightUpdate
+from app.services.airline_service import invalidate_airline_cache
+from app.services.airport_service import invalidate_airport_cache
+from app.services.ingest_service import CLEAR_FINGERPRINT, forget_flight_fingerprint
+from app.services.uniqueservice import airline_summary_delta
+
+BULK_CHUNK = 1000
+
+APPLIED = {"create": "created", "update": "updated", "delete": "deleted"}
+
+
+class BulkLimitError(ValueError):
+    pass
+
+
+class BulkTable:
+    def __init__(
+        self,
+        table: str,
+        key: str,
+        columns: tuple[str, ...],
+        update_columns: tuple[str, ...],
+        stamp: str,
+        after_write: Callable[[list[str]], None],
+        set_on_update: tuple[str, ...] = (),
+        around_write: Optional[Callable[[object, list[str]], AbstractContextManager]] = None,
+        tracked_columns: tuple[str, ...] = (),
+    ) -> None:
+        self.table = table
+        self.key = key
+        self.columns = columns
+        self.update_columns = tuple(c for c in update_columns if c != key)
+        self.stamp = stamp
+        self.after_write = after_write
+        self.set_on_update = set_on_update
+        self.around_write = around_write
+        self.tracked_columns = tracked_columns
+
+    def _values(self, n: int, width: int) -> str:
+        return ", ".join(["(" + ", ".join(["%s"] * width) + ")"] * n)
+
+    def insert_sql(self, n: int) -> str:
+        columns = ", ".join(c.upper() for c in self.columns)
+        placeholders = ", ".join(["%s"] * len(self.columns))
+        values = ", ".join([f"({placeholders}, CURRENT_TIMESTAMP())"] * n)
+        return f"INSERT INTO {self.table} ({columns}, {self.stamp}) VALUES {values}"
+
+    def update_sql(self, fields: tuple[str, ...], n: int) -> str:
+        # One statement per set of supplied fields; omitted fields keep their stored value
+        assignments = [f"{f.upper()} = s.{f.upper()}" for f in fields]
+        assignments.append(f"{self.stamp} = CURRENT_TIMESTAMP()")
+        assignments.extend(self.set_on_update)
+        source = ", ".join(f.upper() for f in (self.key, *fields))
+        return (
+            f"UPDATE {self.table} AS t SET {', '.join(assignments)} "
+            f"FROM (VALUES {self._values(n, len(fields) + 1)}) AS s ({source}) "
+            f"WHERE t.{self.key.upper()} = s.{self.key.upper()}"
+        )
+
+    def select_keys_sql(self) -> str:
+        return f"SELECT {self.key.upper()} FROM {self.table} WHERE {self.key.upper()} IN ({{}})"
+
+    def delete_sql(self) -> str:
+        return f"DELETE FROM {self.table} WHERE {self.key.upper()} IN ({{}})"
+
+
+def _after_flights(keys: list[str]) -> None:
+    for flight_nk in keys:
+        forget_flight_fingerprint(flight_nk)
+    data_version.bump("flights")
+
+
+FLIGHTS = BulkTable(
+    "FACT_FLIGHT",
+    "flight_nk",
+    tuple(FlightBase.model_fields),
+    tuple(FlightUpdate.model_fields),
+    "LAST_SEEN_AT",
+    _after_flights,
+    set_on_update=(CLEAR_FINGERPRINT,),
+    around_write=airline_summary_delta,
+    tracked_columns=("flight_date", "airline_iata", "dep_iata", "arr_iata"),
+)
+AIRPORTS = BulkTable(
+    "DIM_AIRPORT",
+    "airport_iata",
+    tuple(AirportBase.model_fields),
+    tuple(AirportUpdate.model_fields),
+    "UPDATED_AT",
+    lambda keys: invalidate_airport_cache(),
+)
+AIRLINES = BulkTable(
+    "DIM_AIRLINE",
+    "airline_iata",
+    tuple(AirlineBase.model_fields),
+    tuple(AirlineUpdate.model_fields),
+    "UPDATED_AT",
+    lambda keys: invalidate_airline_cache(),
+)
+
+
+def _key(spec: BulkTable, operation) -> str:
+    return getattr(operation.data, spec.key) if operation.op == "create" else operation.key
+
+
+def _plan(spec: BulkTable, operations: list, existing: set[str]) -> list[dict]:
+    # Outcomes are decided up front so every write below is one set-based statement
+    results = []
+    seen: set[str] = set()
+    for index, operation in enumerate(operations):
+        key = _key(spec, operation)
+        result = {"index": index, "op": operation.op, "key": key, "detail": None}
+        if key in seen:
+            result["status"] = "duplicate"
+            result["detail"] = "Key already used earlier in this batch"
+        elif operation.op == "create" and key in existing:
+            result["status"] = "conflict"
+            result["detail"] = "Already exists"
+        elif operation.op != "create" and key not in existing:
+            result["status"] = "not_found"
+        elif operation.op == "update" and not operation.data.model_dump(exclude_none=True):
+            result["status"] = "unchanged"
+        else:
+            result["status"] = APPLIED[operation.op]
+        if result["status"] in (*APPLIED.values(), "unchanged"):
+            seen.add(key)
+        results.append(result)
+    return results
+
+
+def _chunks(items: list) -> list[list]:
+    return [items[start : start + BULK_CHUNK] for start in range(0, len(items), BULK_CHUNK)]
+
+
+def _tracked_keys(spec: BulkTable, operations: list, results: list[dict]) -> list[str]:
+    # Updates that leave every tracked column alone don't need the around_write hook
+    keys = []
+    for operation, result in zip(operations, results):
+        if result["status"] == "updated":
+            values = operation.data.model_dump(exclude_none=True)
+            if not any(column in values for column in spec.tracked_columns):
+                continue
+        elif result["status"] not in ("created", "deleted"):
+            continue
+        keys.append(result["key"])
+    return keys
+
+
+def _write(cur, spec: BulkTable, operations: list, results: list[dict]) -> None:
+    creates, updates, deletes = [], {}, []
+    for operation, result in zip(operations, results):
+        if result["status"] == "created":
+            creates.append(tuple(getattr(operation.data, c) for c in spec.columns))
+        elif result["status"] == "updated":
+            values = operation.data.model_dump(exclude_none=True)
+            fields = tuple(f for f in spec.update_columns if f in values)
+            updates.setdefault(fields, []).append((result["key"], *(values[f] for f in fields)))
+        elif result["status"] == "deleted":
+            deletes.append(result["key"])
+
+    table = spec.table.lower()
+    for chunk in _chunks(creates):
+        params = [value for row in chunk for value in row]
+        run_statement(cur, spec.insert_sql(len(chunk)), params, f"bulk_insert:{table}")
+    for fields, rows in updates.items():
+        for chunk in _chunks(rows):
+            params = [value for row in chunk for value in row]
+            run_statement(cur, spec.update_sql(fields, len(chunk)), params, f"bulk_update:{table}")
+    run_chunked(cur, spec.delete_sql(), deletes, f"bulk_delete:{table}", BULK_CHUNK)
+
+
+def apply_bulk(spec: BulkTable, operations: list) -> dict:
+    max_operations = get_settings().bulk_max_operations
+    if len(operations) > max_operations:
+        raise BulkLimitError(f"At most {max_operations} operations per request")
+    keys = list(dict.fromkeys(_key(spec, operation) for operation in operations))
+
+    with get_connection() as conn:
+        cur = conn.cursor()
+        try:
+            with transaction(cur):
+                existing = {
+                    row[0]
+                    for row in run_chunked(
+                        cur,
+                        spec.select_keys_sql(),
+                        keys,
+                        f"bulk_select:{spec.table.lower()}",
+                        BULK_CHUNK,
+                        fetch=True,
+                    )
+                }
+                results = _plan(spec, operations, existing)
+                scope = nullcontext()
+                if spec.around_write is not None:
+                    scope = spec.around_write(cur, _tracked_keys(spec, operations, results))
+                with scope:
+                    _write(cur, spec, operations, results)
+        finally:
+            cur.close()
+
+    written = [r["key"] for r in results if r["status"] in APPLIED.values()]
+    if written:
+        spec.after_write(written)
+    counts = {status: 0 for status in APPLIED.values()}
+    for result in results:
+        if result["status"] in counts:
+            counts[result["status"]] += 1
+    failed = sum(r["status"] in ("not_found", "conflict", "duplicate") for r in results)
+    return {**counts, "failed": failed, "items": results}
+
+
+def bulk_flights(operations: list) -> dict:
+    return apply_bulk(FLIGHTS, operations)
+
+
+def bulk_airports(operations: list) -> dict:
+    return apply_bulk(AIRPORTS, operations)
+
+
+def bulk_airlines(operations: list) -> dict:
+    return apply_bulk(AIRLINES, operations)
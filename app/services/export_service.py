@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+from app.db.snowflake import stream_batches
+from app.services.flight_service import FilterValues, flight_filters
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_COLUMNS = [
+    ("FLIGHT_NK", "string"),
+    ("FLIGHT_DATE", "date"),
+    ("FLIGHT_STATUS", "string"),
+    ("AIRLINE_IATA", "string"),
+    ("FLIGHT_NUMBER", "string"),
+    ("FLIGHT_IATA", "string"),
+    ("FLIGHT_ICAO", "string"),
+    ("DEP_IATA", "string"),
+    ("ARR_IATA", "string"),
+    ("DEP_TERMINAL", "string"),
+    ("DEP_GATE", "string"),
+    ("ARR_TERMINAL", "string"),
+    ("ARR_GATE", "string"),
+    ("DEP_DELAY_MIN", "int"),
+    ("ARR_DELAY_MIN", "int"),
+    ("DEP_SCHEDULED_UTC", "timestamp"),
+    ("DEP_ESTIMATED_UTC", "timestamp"),
+    ("DEP_ACTUAL_UTC", "timestamp"),
+    ("ARR_SCHEDULED_UTC", "timestamp"),
+    ("ARR_ESTIMATED_UTC", "timestamp"),
+    ("ARR_ACTUAL_UTC", "timestamp"),
+    ("LAST_SEEN_AT", "timestamp"),
+    ("SOURCE", "string"),
+]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def arrow_available() -> bool:
+    return pa is not None
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_ndjson(batches) -> Iterator[bytes]:
+    for columns, rows in batches:
+        lines = [
+            json.dumps(dict(zip(columns, row)), default=_json_default, separators=(",", ":"))
+            for row in rows
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _encode_csv(batches) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow([name.lower() for name, _ in EXPORT_COLUMNS])
+    for _, rows in batches:
+        writer.writerows(rows)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+def _arrow_schema():
+    types = {
+        "string": pa.string(),
+        "date": pa.date32(),
+        "int": pa.int64(),
+        "timestamp": pa.timestamp("us"),
+    }
+    return pa.schema([(name.lower(), types[kind]) for name, kind in EXPORT_COLUMNS])
+
+
+def _encode_arrow(batches) -> Iterator[bytes]:
+    schema = _arrow_schema()
+    buf = io.BytesIO()
+    writer = pa.ipc.new_stream(buf, schema)
+    for _, rows in batches:
+        arrays = [
+            pa.array([row[i] for row in rows], type=field.type) for i, field in enumerate(schema)
+        ]
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    writer.close()
+    yield buf.getvalue()
+
+
+def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+ENCODERS = {"ndjson": _encode_ndjson, "csv": _encode_csv, "arrow": _encode_arrow}
+
+
+def export_flights(
+    fmt: str,
+    dep_iata: FilterValues = None,
+    arr_iata: FilterValues = None,
+    flight_date: Optional[str] = None,
+    status: FilterValues = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    gzip: bool = False,
+) -> Iterator[bytes]:
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "arrow" and not arrow_available():
+        raise ValueError("Arrow export requires pyarrow")
+
+    conditions, params = flight_filters(dep_iata, arr_iata, flight_date, status, date_from, date_to)
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    sql = f"""
+    SELECT {", ".join(name for name, _ in EXPORT_COLUMNS)}
+    FROM FACT_FLIGHT
+    {where_clause}
+    ORDER BY FLIGHT_DATE, FLIGHT_NK
+    """
+    chunks = ENCODERS[fmt](stream_batches(sql, params, EXPORT_BATCH_SIZE))
+    return _gzip(chunks) if gzip else chunks
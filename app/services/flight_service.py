@@ -1,17 +1,22 @@
-from typing import Optional
+from typing import Optional, Sequence, Union
 
-from app.db.snowflake import execute, fetch_one, fetch_all
+from app import data_version
+from app.config import get_settings
+from app.db.results import fetch_columns, fetch_record
+from app.db.snowflake import fetch_one, get_cursor, run_statement, transaction
 from app.models.flight import FlightCreate, FlightUpdate
+from app.services.ingest_service import CLEAR_FINGERPRINT, forget_flight_fingerprint
+from app.services.pagination import decode_cursor, next_cursor
+from app.services.uniqueservice import airline_summary_delta
+from app.singleflight import SingleFlight
 
+_lists = SingleFlight("list_flights", get_settings().flight_list_reuse_seconds)
 
-def _normalize(row: Optional[dict]) -> Optional[dict]:
-    if not row:
-        return None
-    return {k.lower(): v for k, v in row.items()}
 
-
-def _normalize_list(rows: list[dict]) -> list[dict]:
-    return [{k.lower(): v for k, v in row.items()} for row in rows]
+def _write_flight(flight_nk: str, sql: str, params: Sequence) -> None:
+    with get_cursor() as cur, transaction(cur):
+        with airline_summary_delta(cur, [flight_nk]):
+            run_statement(cur, sql, params)
 
 
 def create_flight(data: FlightCreate) -> dict:
@@ -33,7 +38,8 @@ def create_flight(data: FlightCreate) -> dict:
         CURRENT_TIMESTAMP(), %s
     )
     """
-    execute(
+    _write_flight(
+        data.flight_nk,
         sql,
         (
             data.flight_nk,
@@ -60,51 +66,147 @@ def create_flight(data: FlightCreate) -> dict:
             data.source,
         ),
     )
+    data_version.bump("flights")
     return get_flight(data.flight_nk)
 
 
 def get_flight(flight_nk: str) -> Optional[dict]:
     sql = "SELECT * FROM FACT_FLIGHT WHERE FLIGHT_NK = %s"
-    return _normalize(fetch_one(sql, (flight_nk,)))
+    return fetch_record(sql, (flight_nk,))
 
 
-def list_flights(
-    limit: int,
-    offset: int,
-    dep_iata: Optional[str] = None,
-    arr_iata: Optional[str] = None,
+FilterValues = Optional[Union[str, Sequence[str]]]
+
+
+def filter_values(value: FilterValues) -> list[str]:
+    # Accepts "ORD", "ORD,MDW" or ["ORD", "MDW"]; duplicates and blanks are dropped
+    if not value:
+        return []
+    items = [value] if isinstance(value, str) else value
+    return list(dict.fromkeys(v.strip() for item in items for v in item.split(",") if v.strip()))
+
+
+def _match(column: str, value: FilterValues, conditions: list[str], params: list) -> None:
+    values = filter_values(value)
+    if len(values) == 1:
+        conditions.append(f"{column} = %s")
+    elif values:
+        conditions.append(f"{column} IN ({', '.join(['%s'] * len(values))})")
+    params.extend(values)
+
+
+def flight_filters(
+    dep_iata: FilterValues = None,
+    arr_iata: FilterValues = None,
     flight_date: Optional[str] = None,
-    status: Optional[str] = None,
-) -> tuple[list[dict], int]:
+    status: FilterValues = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> tuple[list[str], list]:
     conditions = []
     params = []
-    if dep_iata:
-        conditions.append("DEP_IATA = %s")
-        params.append(dep_iata)
-    if arr_iata:
-        conditions.append("ARR_IATA = %s")
-        params.append(arr_iata)
+    _match("DEP_IATA", dep_iata, conditions, params)
+    _match("ARR_IATA", arr_iata, conditions, params)
     if flight_date:
         conditions.append("FLIGHT_DATE = %s")
         params.append(flight_date)
-    if status:
-        conditions.append("FLIGHT_STATUS = %s")
-        params.append(status)
+    if date_from:
+        conditions.append("FLIGHT_DATE >= %s")
+        params.append(date_from)
+    if date_to:
+        conditions.append("FLIGHT_DATE <= %s")
+        params.append(date_to)
+    _match("FLIGHT_STATUS", status, conditions, params)
+    return conditions, params
 
-    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
 
-    total_sql = f"SELECT COUNT(*) AS CNT FROM FACT_FLIGHT {where_clause}"
-    total_row = fetch_one(total_sql, params)
-    total = int(total_row["CNT"]) if total_row else 0
+def list_flights(
+    limit: int,
+    offset: int,
+    dep_iata: FilterValues = None,
+    arr_iata: FilterValues = None,
+    flight_date: Optional[str] = None,
+    status: FilterValues = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> tuple[dict[str, list], Optional[int], Optional[str]]:
+    # The data version keeps a reused page from outliving a write to FACT_FLIGHT
+    key = (
+        tuple(sorted(filter_values(dep_iata))),
+        tuple(sorted(filter_values(arr_iata))),
+        flight_date,
+        tuple(sorted(filter_values(status))),
+        date_from,
+        date_to,
+        limit,
+        offset,
+        cursor,
+        include_total,
+        data_version.current("flights"),
+    )
+    return _lists.do(
+        key,
+        lambda: _load_flights(
+            limit,
+            offset,
+            dep_iata,
+            arr_iata,
+            flight_date,
+            status,
+            cursor,
+            include_total,
+            date_from,
+            date_to,
+        ),
+    )
+
 
+def _load_flights(
+    limit: int,
+    offset: int,
+    dep_iata: FilterValues,
+    arr_iata: FilterValues,
+    flight_date: Optional[str],
+    status: FilterValues,
+    cursor: Optional[str],
+    include_total: bool,
+    date_from: Optional[str],
+    date_to: Optional[str],
+) -> tuple[dict[str, list], Optional[int], Optional[str]]:
+    conditions, params = flight_filters(dep_iata, arr_iata, flight_date, status, date_from, date_to)
+
+    total = None
+    if include_total:
+        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        total_sql = f"SELECT COUNT(*) AS CNT FROM FACT_FLIGHT {where_clause}"
+        total_row = fetch_one(total_sql, params)
+        total = int(total_row["CNT"]) if total_row else 0
+
+    if cursor:
+        # Keyset on (FLIGHT_DATE DESC NULLS LAST, FLIGHT_NK DESC); dated rows sort before NULLs.
+        after_date, after_nk = decode_cursor(cursor, 2)
+        if after_date is None:
+            conditions.append("(FLIGHT_DATE IS NULL AND FLIGHT_NK < %s)")
+            params.append(after_nk)
+        else:
+            conditions.append(
+                "(FLIGHT_DATE < %s OR (FLIGHT_DATE = %s AND FLIGHT_NK < %s) OR FLIGHT_DATE IS NULL)"
+            )
+            params.extend([after_date, after_date, after_nk])
+        offset = 0
+
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
     list_sql = f"""
     SELECT * FROM FACT_FLIGHT
     {where_clause}
-    ORDER BY FLIGHT_DATE DESC
+    ORDER BY FLIGHT_DATE DESC NULLS LAST, FLIGHT_NK DESC
     LIMIT %s OFFSET %s
     """
-    rows = fetch_all(list_sql, params + [limit, offset])
-    return _normalize_list(rows), total
+    columns = fetch_columns(list_sql, params + [limit + 1, offset])
+    columns, cursor_out = next_cursor(columns, limit, "flight_date", "flight_nk")
+    return columns, total, cursor_out
 
 
 def update_flight(flight_nk: str, data: FlightUpdate) -> Optional[dict]:
@@ -139,13 +241,17 @@ def update_flight(flight_nk: str, data: FlightUpdate) -> Optional[dict]:
     if not fields:
         return get_flight(flight_nk)
 
-    sql = f"UPDATE FACT_FLIGHT SET {', '.join(fields)}, LAST_SEEN_AT = CURRENT_TIMESTAMP() WHERE FLIGHT_NK = %s"
+    sql = f"UPDATE FACT_FLIGHT SET {', '.join(fields)}, LAST_SEEN_AT = CURRENT_TIMESTAMP(), {CLEAR_FINGERPRINT} WHERE FLIGHT_NK = %s"
     params.append(flight_nk)
-    execute(sql, params)
+    _write_flight(flight_nk, sql, params)
+    forget_flight_fingerprint(flight_nk)
+    data_version.bump("flights")
     return get_flight(flight_nk)
 
 
 def delete_flight(flight_nk: str) -> bool:
     sql = "DELETE FROM FACT_FLIGHT WHERE FLIGHT_NK = %s"
-    execute(sql, (flight_nk,))
+    _write_flight(flight_nk, sql, (flight_nk,))
+    forget_flight_fingerprint(flight_nk)
+    data_version.bump("flights")
     return True
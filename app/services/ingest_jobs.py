@@ -0,0 +1,312 @@
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from pathlib import Path
+from typing import Iterator, Optional
+from uuid import uuid4
+
+from app.config import get_settings
+from app.services.ingest_service import ingest_airports, ingest_flights
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("flights", "batch")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS ingest_job (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    dedupe_key TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    submitted_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    result TEXT,
+    error TEXT,
+    owner TEXT,
+    heartbeat_at TEXT
+)
+"""
+
+# Stores created before running jobs recorded who held them
+ADDED_COLUMNS = ("owner", "heartbeat_at")
+
+JOB_COLUMNS = (
+    "id, kind, params, priority, state, stage, progress, "
+    "submitted_at, started_at, finished_at, result, error"
+)
+
+
+def _now(offset_seconds: float = 0) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=offset_seconds)).isoformat()
+
+
+def _row_to_job(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    job["duration_seconds"] = None
+    if job["started_at"] and job["finished_at"]:
+        started = datetime.fromisoformat(job["started_at"])
+        finished = datetime.fromisoformat(job["finished_at"])
+        job["duration_seconds"] = round((finished - started).total_seconds(), 3)
+    return job
+
+
+def _run_job(kind: str, params: dict, progress) -> dict:
+    # Jobs run off the request path, so they may queue for the upstream rate limit
+    max_wait = get_settings().http_rate_limit_max_wait_seconds
+    if kind == "flights":
+        return ingest_flights(
+            params.get("dep_iata"),
+            params.get("arr_iata"),
+            params["limit"],
+            mode=params.get("mode"),
+            progress=progress,
+            max_wait=max_wait,
+        )
+    return ingest_airports(
+        [tuple(t) for t in params["targets"]],
+        params["limit"],
+        max_concurrency=params.get("max_concurrency"),
+        mode=params.get("mode"),
+        progress=progress,
+        max_wait=max_wait,
+    )
+
+
+class IngestJobQueue:
+    def __init__(self, db_path: str, workers: int, stale_seconds: float = 300) -> None:
+        self._db_path = db_path
+        self._workers = max(1, workers)
+        self._stale_seconds = stale_seconds
+        # Every process sharing the store gets its own id, so pid reuse across restarts can't match
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = count()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        if self._initialized:
+            return
+        Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(SCHEMA_SQL)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(ingest_job)")}
+            for column in ADDED_COLUMNS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE ingest_job ADD COLUMN {column} TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ingest_job_pending ON ingest_job (dedupe_key, state)"
+            )
+        self._initialized = True
+
+    def _enqueue(self, job_id: str, priority: int) -> None:
+        # Higher priority runs first; the sequence keeps FIFO order within a priority
+        self._queue.put((-priority, next(self._seq), job_id))
+
+    def submit(self, kind: str, params: dict, priority: int = 0) -> tuple[dict, bool]:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        dedupe_key = kind + ":" + json.dumps(params, sort_keys=True)
+        with self._lock:
+            self._init_db()
+            with self._connect() as conn:
+                existing = conn.execute(
+                    f"SELECT {JOB_COLUMNS} FROM ingest_job WHERE dedupe_key = ? AND state = 'queued'",
+                    (dedupe_key,),
+                ).fetchone()
+                if existing:
+                    if priority <= existing["priority"]:
+                        return _row_to_job(existing), True
+                    # A more urgent resubmit promotes the queued job; the stale entry is skipped
+                    conn.execute(
+                        "UPDATE ingest_job SET priority = ? WHERE id = ?",
+                        (priority, existing["id"]),
+                    )
+                    self._enqueue(existing["id"], priority)
+                    return _row_to_job(existing) | {"priority": priority}, True
+                job_id = str(uuid4())
+                conn.execute(
+                    "INSERT INTO ingest_job (id, kind, params, dedupe_key, priority, state, "
+                    "submitted_at) VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+                    (job_id, kind, json.dumps(params), dedupe_key, priority, _now()),
+                )
+        self._enqueue(job_id, priority)
+        return self.get(job_id), False
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            self._init_db()
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {JOB_COLUMNS} FROM ingest_job WHERE id = ?", (job_id,)
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        with self._lock:
+            self._init_db()
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {JOB_COLUMNS} FROM ingest_job ORDER BY submitted_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._init_db()
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM ingest_job GROUP BY state").fetchall()
+        return {"workers": self._workers, "states": {state: n for state, n in rows}}
+
+    def _update(self, job_id: str, **fields) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE ingest_job SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+            )
+
+    def _claim(self, job_id: str) -> Optional[sqlite3.Row]:
+        now = _now()
+        with self._lock, self._connect() as conn:
+            # Conditional on state so two processes sharing the store can't both claim a job
+            claimed = conn.execute(
+                "UPDATE ingest_job SET state = 'running', stage = 'starting', started_at = ?, "
+                "owner = ?, heartbeat_at = ? WHERE id = ? AND state = 'queued'",
+                (now, self._owner, now, job_id),
+            ).rowcount
+            if not claimed:
+                return None
+            return conn.execute(
+                "SELECT kind, params FROM ingest_job WHERE id = ?", (job_id,)
+            ).fetchone()
+
+    def _heartbeat(self) -> None:
+        while not self._stopping.wait(self._stale_seconds / 3):
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "UPDATE ingest_job SET heartbeat_at = ? "
+                        "WHERE owner = ? AND state = 'running'",
+                        (_now(), self._owner),
+                    )
+            except sqlite3.Error:
+                logger.warning("Ingest job heartbeat failed", exc_info=True)
+
+    def _execute(self, job_id: str) -> None:
+        row = self._claim(job_id)
+        if row is None:
+            return
+
+        def progress(stage: str, fraction: float) -> None:
+            self._update(job_id, stage=stage, progress=round(fraction, 3), heartbeat_at=_now())
+
+        try:
+            result = _run_job(row["kind"], json.loads(row["params"]), progress)
+        except Exception as exc:
+            logger.exception("Ingest job %s failed", job_id)
+            self._update(job_id, state="failed", error=str(exc), finished_at=_now())
+            return
+        self._update(
+            job_id,
+            state="succeeded",
+            stage="done",
+            progress=1.0,
+            result=json.dumps(result),
+            finished_at=_now(),
+        )
+
+    def _worker(self) -> None:
+        while True:
+            _, _, job_id = self._queue.get()
+            if job_id is None:
+                return
+            try:
+                self._execute(job_id)
+            except Exception:
+                logger.exception("Ingest worker error for job %s", job_id)
+
+    def start(self) -> int:
+        with self._lock:
+            if self._threads:
+                return 0
+            self._init_db()
+            with self._connect() as conn:
+                # Jobs whose process died stop heartbeating and start over; jobs another
+                # live process holds in the same store are left to it
+                conn.execute(
+                    "UPDATE ingest_job SET state = 'queued', stage = NULL, progress = 0, "
+                    "owner = NULL WHERE state = 'running' "
+                    "AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                    (_now(-self._stale_seconds),),
+                )
+                pending = conn.execute(
+                    "SELECT id, priority FROM ingest_job WHERE state = 'queued' "
+                    "ORDER BY submitted_at"
+                ).fetchall()
+            for row in pending:
+                self._enqueue(row["id"], row["priority"])
+            self._stopping.clear()
+            for i in range(self._workers):
+                thread = threading.Thread(target=self._worker, name=f"ingest-job-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            heartbeat = threading.Thread(
+                target=self._heartbeat, name="ingest-job-heartbeat", daemon=True
+            )
+            heartbeat.start()
+            self._threads.append(heartbeat)
+        return len(pending)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        threads, self._threads = self._threads, []
+        self._stopping.set()
+        for _ in range(self._workers if threads else 0):
+            # Sentinels jump the queue; jobs still queued stay in the store for the next start
+            self._queue.put((float("-inf"), next(self._seq), None))
+        for thread in threads:
+            thread.join(timeout)
+
+
+_job_queue: Optional[IngestJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> IngestJobQueue:
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                settings = get_settings()
+                _job_queue = IngestJobQueue(
+                    settings.ingest_job_db_path,
+                    settings.ingest_job_workers,
+                    settings.ingest_job_stale_seconds,
+                )
+    return _job_queue
@@ -1,21 +1,118 @@
+import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Callable, Optional
 from uuid import uuid4
 
-import requests
-
+from app import data_version, http_client
+from app.cache import TTLCache
 from app.config import get_settings
-from app.db.snowflake import get_connection
+from app.db.snowflake import get_connection, run_chunked, run_statement, transaction
 from app.db.sql import load_sql
+from app.singleflight import SingleFlight
+from app.services.airline_service import invalidate_airline_cache
+from app.services.airport_service import invalidate_airport_cache
+from app.services.uniqueservice import airline_summary_delta
 
 logger = logging.getLogger(__name__)
 
+SOURCE = "aviationstack"
+INGEST_MODES = ("bulk", "per_record")
+
+ProgressCallback = Callable[[str, float], None]
+
+FINGERPRINT_LOOKUP_CHUNK = 1000
+
+_settings = get_settings()
+_fingerprint_cache = TTLCache(
+    "flight_fingerprint",
+    _settings.fingerprint_cache_max_entries,
+    _settings.fingerprint_cache_ttl_seconds,
+)
+# Last written DIM_AIRPORT/DIM_AIRLINE row per code, tagged with the domain's data version
+_dimension_rows = TTLCache(
+    "dimension_rows",
+    _settings.fingerprint_cache_max_entries,
+    _settings.fingerprint_cache_ttl_seconds,
+)
+_ingests = SingleFlight("ingest_flights", _settings.ingest_reuse_seconds)
+
 MERGE_AIRPORT_SQL = load_sql("02_merge_dim_airport.sql")
 MERGE_AIRLINE_SQL = load_sql("03_merge_dim_airline.sql")
 MERGE_FLIGHT_SQL = load_sql("04_merge_fact_flight.sql")
 
+STAGE_TABLES_SQL = [s.strip() for s in load_sql("06_bulk_stage_tables.sql").split(";") if s.strip()]
+BULK_INSERT_RAW_SQL = load_sql("07_bulk_insert_raw.sql")
+BULK_MERGE_FLIGHT_SQL = load_sql("08_bulk_merge_fact_flight.sql")
+BULK_MERGE_AIRPORT_SQL = load_sql("09_bulk_merge_dim_airport.sql")
+BULK_MERGE_AIRLINE_SQL = load_sql("10_bulk_merge_dim_airline.sql")
+
+INSERT_RAW_SQL = """
+INSERT INTO RAW_AVSTACK_FLIGHTS (
+    INGEST_ID, INGESTED_AT, FLIGHT_DATE, FLIGHT_IATA,
+    DEP_IATA, ARR_IATA, RECORD, SOURCE
+)
+SELECT %s, %s, %s, %s, %s, %s, PARSE_JSON(%s), %s
+"""
+
+STAGE_RAW_SQL = """
+INSERT INTO STG_RAW_AVSTACK_FLIGHTS (FLIGHT_DATE, FLIGHT_IATA, DEP_IATA, ARR_IATA, RECORD_JSON)
+VALUES (%s, %s, %s, %s, %s)
+"""
+
+STAGE_FLIGHT_SQL = """
+INSERT INTO STG_FACT_FLIGHT (
+    FLIGHT_NK, FLIGHT_DATE, FLIGHT_STATUS, AIRLINE_IATA, FLIGHT_NUMBER,
+    FLIGHT_IATA, FLIGHT_ICAO, DEP_IATA, ARR_IATA, DEP_TERMINAL, DEP_GATE,
+    ARR_TERMINAL, ARR_GATE, DEP_DELAY_MIN, ARR_DELAY_MIN,
+    DEP_SCHEDULED_UTC, DEP_ESTIMATED_UTC, DEP_ACTUAL_UTC,
+    ARR_SCHEDULED_UTC, ARR_ESTIMATED_UTC, ARR_ACTUAL_UTC, SOURCE, ROW_FINGERPRINT
+)
+VALUES (
+    %s, %s, %s, %s, %s,
+    %s, %s, %s, %s, %s, %s,
+    %s, %s, %s, %s,
+    %s, %s, %s,
+    %s, %s, %s, %s, %s
+)
+"""
+
+SELECT_FINGERPRINTS_SQL = (
+    "SELECT FLIGHT_NK, ROW_FINGERPRINT, FLIGHT_DATE, AIRLINE_IATA, DEP_IATA, ARR_IATA "
+    "FROM FACT_FLIGHT WHERE FLIGHT_NK IN ({})"
+)
+
+SELECT_DIMENSION_SQL = {
+    "airports": (
+        "SELECT AIRPORT_IATA, AIRPORT_NAME, TIMEZONE, ICAO FROM DIM_AIRPORT "
+        "WHERE AIRPORT_IATA IN ({})"
+    ),
+    "airlines": (
+        "SELECT AIRLINE_IATA, AIRLINE_ICAO, AIRLINE_NAME FROM DIM_AIRLINE "
+        "WHERE AIRLINE_IATA IN ({})"
+    ),
+}
+
+TOUCH_FLIGHTS_SQL = (
+    "UPDATE FACT_FLIGHT SET LAST_SEEN_AT = CURRENT_TIMESTAMP() WHERE FLIGHT_NK IN ({})"
+)
+
+# SET clause for manual flight edits: without a fingerprint the next ingest
+# can't skip the row as unchanged, so Aviationstack overwrites the edit
+CLEAR_FINGERPRINT = "ROW_FINGERPRINT = NULL"
+
+STAGE_AIRPORT_SQL = """
+INSERT INTO STG_DIM_AIRPORT (AIRPORT_IATA, AIRPORT_NAME, TIMEZONE, ICAO)
+VALUES (%s, %s, %s, %s)
+"""
+
+STAGE_AIRLINE_SQL = """
+INSERT INTO STG_DIM_AIRLINE (AIRLINE_IATA, AIRLINE_ICAO, AIRLINE_NAME)
+VALUES (%s, %s, %s)
+"""
+
 
 def parse_ts(value: Optional[str]) -> Optional[datetime]:
     if not value:
@@ -29,14 +126,28 @@ def parse_ts(value: Optional[str]) -> Optional[datetime]:
     return dt
 
 
-def ingest_flights(dep_iata: str | None, arr_iata: str | None, limit: int) -> dict:
+def flight_fingerprint(row: tuple) -> str:
+    payload = json.dumps(row, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def forget_flight_fingerprint(flight_nk: str | None = None) -> None:
+    if flight_nk is None:
+        _fingerprint_cache.clear()
+    else:
+        _fingerprint_cache.invalidate(flight_nk)
+
+
+def fetch_aviationstack_flights(
+    dep_iata: str | None, arr_iata: str | None, limit: int, max_wait: float | None = None
+) -> list:
     settings = get_settings()
     if not settings.aviationstack_access_key:
         raise ValueError("AVIATIONSTACK_ACCESS_KEY is not set")
     if not dep_iata and not arr_iata:
         raise ValueError("Provide dep_iata and/or arr_iata")
 
-    url = "https://api.aviationstack.com/v1/flights"
+    url = f"{settings.aviationstack_base_url.rstrip('/')}/v1/flights"
     params = {
         "access_key": settings.aviationstack_access_key,
         "limit": limit,
@@ -45,145 +156,411 @@ def ingest_flights(dep_iata: str | None, arr_iata: str | None, limit: int) -> di
         params["dep_iata"] = dep_iata
     if arr_iata:
         params["arr_iata"] = arr_iata
-    resp = requests.get(
-        url,
-        params=params,
-        timeout=30,
-    )
+    resp = http_client.get("aviationstack", url, timeout=30, max_wait=max_wait, params=params)
     resp.raise_for_status()
     payload = resp.json()
-    data = payload.get("data", [])
+    return payload.get("data", [])
 
-    ingest_id = str(uuid4())
-    ingested_at = datetime.now(timezone.utc)
 
-    raw_inserted = 0
+def forget_dimension_rows() -> None:
+    _dimension_rows.clear()
+
+
+def flatten_records(data: list) -> dict:
+    raw_rows = []
+    raw_keys = []
+    flight_rows = []
     airports = {}
     airlines = {}
-    flights_upserted = 0
+
+    for record in data:
+        flight_date = record.get("flight_date")
+        flight = record.get("flight", {}) or {}
+        departure = record.get("departure", {}) or {}
+        arrival = record.get("arrival", {}) or {}
+        airline = record.get("airline", {}) or {}
+
+        flight_iata = flight.get("iata")
+        dep_iata_val = departure.get("iata")
+        arr_iata_val = arrival.get("iata")
+
+        raw_rows.append(
+            (
+                flight_date,
+                flight_iata,
+                dep_iata_val,
+                arr_iata_val,
+                json.dumps(record, ensure_ascii=False),
+            )
+        )
+
+        if dep_iata_val:
+            airports[dep_iata_val] = (
+                dep_iata_val,
+                departure.get("airport"),
+                departure.get("timezone"),
+                departure.get("icao"),
+            )
+        if arr_iata_val:
+            airports[arr_iata_val] = (
+                arr_iata_val,
+                arrival.get("airport"),
+                arrival.get("timezone"),
+                arrival.get("icao"),
+            )
+        if airline.get("iata"):
+            airlines[airline.get("iata")] = (
+                airline.get("iata"),
+                airline.get("icao"),
+                airline.get("name"),
+            )
+
+        flight_nk = None
+        if flight_iata and flight_date:
+            flight_nk = f"{flight_iata}:{flight_date}"
+        raw_keys.append(flight_nk)
+
+        if not flight_nk:
+            logger.warning("Skipping flight without key: %s", record)
+            continue
+
+        row = (
+            flight_nk,
+            flight_date,
+            record.get("flight_status"),
+            airline.get("iata"),
+            flight.get("number"),
+            flight_iata,
+            flight.get("icao"),
+            dep_iata_val,
+            arr_iata_val,
+            departure.get("terminal"),
+            departure.get("gate"),
+            arrival.get("terminal"),
+            arrival.get("gate"),
+            departure.get("delay"),
+            arrival.get("delay"),
+            parse_ts(departure.get("scheduled")),
+            parse_ts(departure.get("estimated")),
+            parse_ts(departure.get("actual")),
+            parse_ts(arrival.get("scheduled")),
+            parse_ts(arrival.get("estimated")),
+            parse_ts(arrival.get("actual")),
+            SOURCE,
+        )
+        flight_rows.append((*row, flight_fingerprint(row)))
+
+    return {
+        "raw_rows": raw_rows,
+        "raw_keys": raw_keys,
+        "flight_rows": flight_rows,
+        "airports": airports,
+        "airlines": airlines,
+    }
+
+
+def _write_per_record(cur, batch: dict, ingest_id: str, ingested_at: datetime) -> None:
+    for raw in batch["raw_rows"]:
+        run_statement(cur, INSERT_RAW_SQL, (ingest_id, ingested_at, *raw, SOURCE), "insert_raw")
+    for row in batch["flight_rows"]:
+        run_statement(cur, MERGE_FLIGHT_SQL, row, "merge_fact_flight")
+    for airport in batch["airports"].values():
+        run_statement(cur, MERGE_AIRPORT_SQL, airport, "merge_dim_airport")
+    for airline in batch["airlines"].values():
+        run_statement(cur, MERGE_AIRLINE_SQL, airline, "merge_dim_airline")
+
+
+def _write_bulk(cur, batch: dict, ingest_id: str, ingested_at: datetime) -> None:
+    # MERGE rejects duplicate source keys; keep the last record per flight like the
+    # per-record path would.
+    flights = list({row[0]: row for row in batch["flight_rows"]}.values())
+
+    if batch["raw_rows"]:
+        run_statement(cur, STAGE_RAW_SQL, batch["raw_rows"], "stage_raw", many=True)
+        run_statement(cur, BULK_INSERT_RAW_SQL, (ingest_id, ingested_at, SOURCE), "bulk_insert_raw")
+    if flights:
+        run_statement(cur, STAGE_FLIGHT_SQL, flights, "stage_fact_flight", many=True)
+        run_statement(cur, BULK_MERGE_FLIGHT_SQL, name="bulk_merge_fact_flight")
+    if batch["airports"]:
+        airports = list(batch["airports"].values())
+        run_statement(cur, STAGE_AIRPORT_SQL, airports, "stage_dim_airport", many=True)
+        run_statement(cur, BULK_MERGE_AIRPORT_SQL, name="bulk_merge_dim_airport")
+    if batch["airlines"]:
+        airlines = list(batch["airlines"].values())
+        run_statement(cur, STAGE_AIRLINE_SQL, airlines, "stage_dim_airline", many=True)
+        run_statement(cur, BULK_MERGE_AIRLINE_SQL, name="bulk_merge_dim_airline")
+
+
+def _placement(values) -> tuple:
+    # FLIGHT_DATE, AIRLINE_IATA, DEP_IATA, ARR_IATA: what AIRPORT_AIRLINE_SUMMARY counts by
+    return tuple(None if value is None else str(value) for value in values)
+
+
+def _row_placement(row: tuple) -> tuple:
+    return _placement((row[1], row[3], row[7], row[8]))
+
+
+def _split_unchanged(cur, batch: dict) -> tuple[dict, list[str]]:
+    latest = {row[0]: row for row in batch["flight_rows"]}
+    # flight_nk -> (fingerprint, placement) of the stored row
+    stored = {}
+    missing = []
+    for flight_nk in latest:
+        cached = _fingerprint_cache.get(flight_nk)
+        if cached is None:
+            missing.append(flight_nk)
+        else:
+            stored[flight_nk] = cached
+    for flight_nk, fingerprint, *placement in run_chunked(
+        cur,
+        SELECT_FINGERPRINTS_SQL,
+        missing,
+        "select_fingerprints",
+        FINGERPRINT_LOOKUP_CHUNK,
+        fetch=True,
+    ):
+        stored[flight_nk] = (fingerprint, _placement(placement))
+
+    unchanged = {nk for nk, row in latest.items() if nk in stored and stored[nk][0] == row[-1]}
+    changed = dict(batch)
+    changed["flight_rows"] = [row for row in batch["flight_rows"] if row[0] not in unchanged]
+    # Status, time and delay changes leave the airline summary alone
+    changed["summary_keys"] = [
+        nk
+        for nk, row in latest.items()
+        if nk not in unchanged and stored.get(nk, (None, None))[1] != _row_placement(row)
+    ]
+    changed["raw_rows"] = [
+        raw for raw, nk in zip(batch["raw_rows"], batch["raw_keys"]) if nk not in unchanged
+    ]
+    return changed, sorted(unchanged)
+
+
+def _changed_dimensions(cur, domain: str, rows: dict[str, tuple]) -> dict[str, tuple]:
+    # Admin edits bump the domain version, which retires rows cached before them
+    version = data_version.current(domain)
+    stored = {}
+    missing = []
+    for code in rows:
+        cached = _dimension_rows.get((domain, code))
+        if cached is not None and cached[0] == version:
+            stored[code] = cached[1]
+        else:
+            missing.append(code)
+    for row in run_chunked(
+        cur,
+        SELECT_DIMENSION_SQL[domain],
+        missing,
+        f"select_{domain}",
+        FINGERPRINT_LOOKUP_CHUNK,
+        fetch=True,
+    ):
+        stored[row[0]] = tuple(row)
+    return {code: row for code, row in rows.items() if stored.get(code) != row}
+
+
+def _remember_dimensions(domain: str, rows: dict[str, tuple]) -> None:
+    version = data_version.current(domain)
+    for code, row in rows.items():
+        _dimension_rows.set((domain, code), (version, row))
+
+
+def _resolve_mode(mode: str | None) -> str:
+    mode = mode or get_settings().ingest_mode
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode: {mode}")
+    return mode
+
+
+def write_batch(batch: dict, mode: str, detect_changes: bool | None = None) -> dict:
+    if detect_changes is None:
+        detect_changes = get_settings().ingest_change_detection
+    ingest_id = str(uuid4())
+    ingested_at = datetime.now(timezone.utc)
 
     with get_connection() as conn:
         cur = conn.cursor()
         try:
-            for record in data:
-                flight_date = record.get("flight_date")
-                flight = record.get("flight", {}) or {}
-                departure = record.get("departure", {}) or {}
-                arrival = record.get("arrival", {}) or {}
-                airline = record.get("airline", {}) or {}
-
-                flight_iata = flight.get("iata")
-                dep_iata_val = departure.get("iata")
-                arr_iata_val = arrival.get("iata")
-
-                insert_raw_sql = """
-                INSERT INTO RAW_AVSTACK_FLIGHTS (
-                    INGEST_ID, INGESTED_AT, FLIGHT_DATE, FLIGHT_IATA,
-                    DEP_IATA, ARR_IATA, RECORD, SOURCE
-                )
-                SELECT %s, %s, %s, %s, %s, %s, PARSE_JSON(%s), %s
-                """
-                cur.execute(
-                    insert_raw_sql,
-                    (
-                        ingest_id,
-                        ingested_at,
-                        flight_date,
-                        flight_iata,
-                        dep_iata_val,
-                        arr_iata_val,
-                        json.dumps(record, ensure_ascii=False),
-                        "aviationstack",
-                    ),
-                )
-                raw_inserted += 1
-
-                if dep_iata_val:
-                    airports[dep_iata_val] = {
-                        "iata": dep_iata_val,
-                        "name": departure.get("airport"),
-                        "timezone": departure.get("timezone"),
-                        "icao": departure.get("icao"),
-                    }
-                if arr_iata_val:
-                    airports[arr_iata_val] = {
-                        "iata": arr_iata_val,
-                        "name": arrival.get("airport"),
-                        "timezone": arrival.get("timezone"),
-                        "icao": arrival.get("icao"),
-                    }
-                if airline.get("iata"):
-                    airlines[airline.get("iata")] = {
-                        "iata": airline.get("iata"),
-                        "icao": airline.get("icao"),
-                        "name": airline.get("name"),
-                    }
-
-                flight_nk = None
-                if flight_iata and flight_date:
-                    flight_nk = f"{flight_iata}:{flight_date}"
-
-                if not flight_nk:
-                    logger.warning("Skipping flight without key: %s", record)
-                    continue
-
-                cur.execute(
-                    MERGE_FLIGHT_SQL,
-                    (
-                        flight_nk,
-                        flight_date,
-                        record.get("flight_status"),
-                        airline.get("iata"),
-                        flight.get("number"),
-                        flight_iata,
-                        flight.get("icao"),
-                        dep_iata_val,
-                        arr_iata_val,
-                        departure.get("terminal"),
-                        departure.get("gate"),
-                        arrival.get("terminal"),
-                        arrival.get("gate"),
-                        departure.get("delay"),
-                        arrival.get("delay"),
-                        parse_ts(departure.get("scheduled")),
-                        parse_ts(departure.get("estimated")),
-                        parse_ts(departure.get("actual")),
-                        parse_ts(arrival.get("scheduled")),
-                        parse_ts(arrival.get("estimated")),
-                        parse_ts(arrival.get("actual")),
-                        "aviationstack",
-                    ),
-                )
-                flights_upserted += 1
-
-            for airport in airports.values():
-                cur.execute(
-                    MERGE_AIRPORT_SQL,
-                    (
-                        airport["iata"],
-                        airport.get("name"),
-                        airport.get("timezone"),
-                        airport.get("icao"),
-                    ),
-                )
-
-            for airline in airlines.values():
-                cur.execute(
-                    MERGE_AIRLINE_SQL,
-                    (
-                        airline["iata"],
-                        airline.get("icao"),
-                        airline.get("name"),
-                    ),
-                )
-            conn.commit()
+            if mode == "bulk":
+                # DDL commits implicitly in Snowflake, so stage tables are created before BEGIN.
+                for statement in STAGE_TABLES_SQL:
+                    run_statement(cur, statement, name="create_stage_table")
+            with transaction(cur):
+                changed, unchanged = batch, []
+                summary_keys = [row[0] for row in batch["flight_rows"]]
+                if detect_changes:
+                    changed, unchanged = _split_unchanged(cur, batch)
+                    changed["airports"] = _changed_dimensions(cur, "airports", batch["airports"])
+                    changed["airlines"] = _changed_dimensions(cur, "airlines", batch["airlines"])
+                    run_chunked(
+                        cur,
+                        TOUCH_FLIGHTS_SQL,
+                        unchanged,
+                        "touch_fact_flight",
+                        FINGERPRINT_LOOKUP_CHUNK,
+                    )
+                    summary_keys = changed["summary_keys"]
+                with airline_summary_delta(cur, summary_keys):
+                    if mode == "bulk":
+                        _write_bulk(cur, changed, ingest_id, ingested_at)
+                    else:
+                        _write_per_record(cur, changed, ingest_id, ingested_at)
         finally:
             cur.close()
 
+    if detect_changes:
+        for row in batch["flight_rows"]:
+            _fingerprint_cache.set(row[0], (row[-1], _row_placement(row)))
+    # Only a dimension MERGE that wrote something retires the dimension caches and ETags
+    if changed["airports"]:
+        invalidate_airport_cache()
+    if changed["airlines"]:
+        invalidate_airline_cache()
+    if detect_changes:
+        _remember_dimensions("airports", batch["airports"])
+        _remember_dimensions("airlines", batch["airlines"])
+
+    changed_keys = {row[0] for row in changed["flight_rows"]}
+    if changed_keys:
+        data_version.bump("flights")
+    if unchanged:
+        data_version.bump("flights_seen")
     return {
         "ingest_id": ingest_id,
-        "raw_inserted": raw_inserted,
-        "airports_upserted": len(airports),
-        "airlines_upserted": len(airlines),
-        "flights_updated": flights_upserted,
+        "raw_inserted": len(changed["raw_rows"]),
+        "airports_upserted": len(changed["airports"]),
+        "airlines_upserted": len(changed["airlines"]),
+        "flights_updated": len(batch["flight_rows"]),
+        "flights_changed": len(changed_keys),
+        "flights_unchanged": len(unchanged),
     }
+
+
+def _report(progress: ProgressCallback | None, stage: str, fraction: float) -> None:
+    if progress:
+        progress(stage, fraction)
+
+
+def ingest_flights(
+    dep_iata: str | None,
+    arr_iata: str | None,
+    limit: int,
+    mode: str | None = None,
+    progress: ProgressCallback | None = None,
+    max_wait: float | None = None,
+) -> dict:
+    mode = _resolve_mode(mode)
+    dep_iata = dep_iata.upper() if dep_iata else None
+    arr_iata = arr_iata.upper() if arr_iata else None
+    # Identical ingests already running share one Aviationstack call and write. The
+    # rate-limit wait is part of the key so API callers never queue behind a job.
+    return _ingests.do(
+        (dep_iata, arr_iata, limit, mode, max_wait),
+        lambda: _ingest_flights(dep_iata, arr_iata, limit, mode, progress, max_wait),
+    )
+
+
+def _ingest_flights(
+    dep_iata: str | None,
+    arr_iata: str | None,
+    limit: int,
+    mode: str,
+    progress: ProgressCallback | None,
+    max_wait: float | None,
+) -> dict:
+    _report(progress, "fetching", 0.0)
+    data = fetch_aviationstack_flights(dep_iata, arr_iata, limit, max_wait)
+    _report(progress, "writing", 0.5)
+    result = write_batch(flatten_records(data), mode)
+    _report(progress, "done", 1.0)
+    return result
+
+
+def _record_key(record: dict) -> str | None:
+    flight_iata = (record.get("flight") or {}).get("iata")
+    flight_date = record.get("flight_date")
+    if flight_iata and flight_date:
+        return f"{flight_iata}:{flight_date}"
+    return None
+
+
+def _expand_targets(targets: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    expanded = []
+    for iata, direction in targets:
+        if direction not in ("dep", "arr", "both"):
+            raise ValueError(f"Unknown direction: {direction}")
+        for d in ("dep", "arr") if direction == "both" else (direction,):
+            if (iata, d) not in expanded:
+                expanded.append((iata, d))
+    return expanded
+
+
+def ingest_airports(
+    targets: list[tuple[str, str]],
+    limit: int,
+    max_concurrency: int | None = None,
+    mode: str | None = None,
+    progress: ProgressCallback | None = None,
+    max_wait: float | None = None,
+) -> dict:
+    mode = _resolve_mode(mode)
+    targets = _expand_targets(targets)
+    if not targets:
+        raise ValueError("Provide at least one airport")
+    if not get_settings().aviationstack_access_key:
+        raise ValueError("AVIATIONSTACK_ACCESS_KEY is not set")
+    workers = min(max_concurrency or get_settings().ingest_max_concurrency, len(targets))
+
+    def fetch(target: tuple[str, str]) -> list:
+        iata, direction = target
+        if direction == "dep":
+            return fetch_aviationstack_flights(iata, None, limit, max_wait)
+        return fetch_aviationstack_flights(None, iata, limit, max_wait)
+
+    per_target = []
+    errors: list[Exception] = []
+    keyed: dict[str, dict] = {}
+    unkeyed: list[dict] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ingest") as pool:
+        futures = [pool.submit(fetch, target) for target in targets]
+        _report(progress, "fetching", 0.0)
+        for done, ((iata, direction), future) in enumerate(zip(targets, futures), start=1):
+            result = {
+                "iata": iata,
+                "direction": direction,
+                "fetched": 0,
+                "flights": 0,
+                "error": None,
+            }
+            try:
+                data = future.result()
+            except Exception as exc:
+                logger.warning("Ingest fetch failed: %s %s", direction, iata, exc_info=True)
+                result["error"] = str(exc)
+                errors.append(exc)
+                per_target.append(result)
+                _report(progress, "fetching", 0.5 * done / len(targets))
+                continue
+            result["fetched"] = len(data)
+            for record in data:
+                key = _record_key(record)
+                if key:
+                    keyed[key] = record
+                    result["flights"] += 1
+                else:
+                    unkeyed.append(record)
+            per_target.append(result)
+            _report(progress, "fetching", 0.5 * done / len(targets))
+
+    fetched_total = sum(t["fetched"] for t in per_target)
+    if len(errors) == len(per_target):
+        if all(isinstance(exc, http_client.RateLimitTimeout) for exc in errors):
+            raise min(errors, key=lambda exc: exc.wait)
+        raise RuntimeError("All airport fetches failed")
+
+    _report(progress, "writing", 0.5)
+    summary = write_batch(flatten_records(list(keyed.values()) + unkeyed), mode)
+    _report(progress, "done", 1.0)
+    summary["duplicates_skipped"] = fetched_total - len(keyed) - len(unkeyed)
+    summary["targets"] = per_target
+    return summary
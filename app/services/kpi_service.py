@@ -0,0 +1,144 @@
+from typing import Optional
+
+from app import data_version
+from app.cache import TTLCache
+from app.config import get_settings
+from app.db.results import fetch_records
+from app.services.flight_service import flight_filters
+
+GROUPS = {
+    "airport": ("DEP_IATA",),
+    "arr_airport": ("ARR_IATA",),
+    "airline": ("AIRLINE_IATA",),
+    "route": ("DEP_IATA", "ARR_IATA"),
+    "hour": ("HOUR(DEP_SCHEDULED_UTC)",),
+    "date": ("FLIGHT_DATE",),
+}
+
+STATUSES = ("scheduled", "active", "landed", "cancelled", "incident", "diverted")
+
+# On-time percentages only cover flights that have flown, and a flight with no
+# reported delay is not assumed to be on time
+FLOWN = "(FLIGHT_STATUS = 'landed' OR ARR_ACTUAL_UTC IS NOT NULL)"
+ON_TIME = f"{FLOWN} AND COALESCE(ARR_DELAY_MIN, DEP_DELAY_MIN) <= %s"
+
+_settings = get_settings()
+_cache = TTLCache("kpi", _settings.kpi_cache_max_entries, _settings.kpi_cache_ttl_seconds)
+
+
+def _kpi_sql(keys: tuple[str, ...], where_clause: str) -> str:
+    key_columns = ", ".join(f"{expr} AS K{i}" for i, expr in enumerate(keys))
+    key_list = ", ".join(keys)
+    status_counts = ",\n        ".join(
+        f"COUNT_IF(FLIGHT_STATUS = '{s}') AS STATUS_{s.upper()}" for s in STATUSES
+    )
+    # GROUPING SETS adds the overall totals row to the same scan
+    return f"""
+    SELECT
+        {key_columns},
+        GROUPING({keys[0]}) AS IS_TOTAL,
+        COUNT(*) AS FLIGHTS,
+        AVG(DEP_DELAY_MIN) AS AVG_DEP_DELAY_MIN,
+        AVG(ARR_DELAY_MIN) AS AVG_ARR_DELAY_MIN,
+        APPROX_PERCENTILE(DEP_DELAY_MIN, 0.5) AS P50_DEP_DELAY_MIN,
+        APPROX_PERCENTILE(DEP_DELAY_MIN, 0.9) AS P90_DEP_DELAY_MIN,
+        APPROX_PERCENTILE(ARR_DELAY_MIN, 0.5) AS P50_ARR_DELAY_MIN,
+        APPROX_PERCENTILE(ARR_DELAY_MIN, 0.9) AS P90_ARR_DELAY_MIN,
+        COUNT_IF({FLOWN}) AS OPERATED,
+        COUNT_IF({ON_TIME}) AS ON_TIME,
+        {status_counts}
+    FROM FACT_FLIGHT
+    {where_clause}
+    GROUP BY GROUPING SETS (({key_list}), ())
+    ORDER BY IS_TOTAL DESC, FLIGHTS DESC
+    LIMIT %s
+    """
+
+
+def _round(value) -> Optional[float]:
+    return None if value is None else round(float(value), 2)
+
+
+def _to_row(record: dict, key_count: int) -> dict:
+    key = None
+    if not record["is_total"]:
+        key = "-".join(
+            "" if record[f"k{i}"] is None else str(record[f"k{i}"]) for i in range(key_count)
+        )
+    operated = record["operated"] or 0
+    return {
+        "key": key,
+        "flights": record["flights"],
+        "avg_dep_delay_min": _round(record["avg_dep_delay_min"]),
+        "avg_arr_delay_min": _round(record["avg_arr_delay_min"]),
+        "p50_dep_delay_min": _round(record["p50_dep_delay_min"]),
+        "p90_dep_delay_min": _round(record["p90_dep_delay_min"]),
+        "p50_arr_delay_min": _round(record["p50_arr_delay_min"]),
+        "p90_arr_delay_min": _round(record["p90_arr_delay_min"]),
+        "on_time_pct": round(100 * record["on_time"] / operated, 2) if operated else None,
+        "status_counts": {s: record[f"status_{s}"] for s in STATUSES},
+    }
+
+
+def delay_kpis(
+    group_by: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    dep_iata: Optional[str] = None,
+    arr_iata: Optional[str] = None,
+    airline_iata: Optional[str] = None,
+    on_time_threshold_min: int = 15,
+    limit: int = 100,
+) -> dict:
+    if group_by not in GROUPS:
+        raise ValueError(f"Unknown group_by: {group_by}")
+    version = data_version.current("flights")
+    filters = (date_from, date_to, dep_iata, arr_iata, airline_iata, on_time_threshold_min, limit)
+    return _cache.get_or_load(
+        (group_by, filters, version),
+        lambda: _load_delay_kpis(
+            group_by,
+            date_from,
+            date_to,
+            dep_iata,
+            arr_iata,
+            airline_iata,
+            on_time_threshold_min,
+            limit,
+            version,
+        ),
+    )
+
+
+def _load_delay_kpis(
+    group_by: str,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    dep_iata: Optional[str],
+    arr_iata: Optional[str],
+    airline_iata: Optional[str],
+    on_time_threshold_min: int,
+    limit: int,
+    version: str,
+) -> dict:
+    keys = GROUPS[group_by]
+    conditions, params = flight_filters(dep_iata, arr_iata, None, None, date_from, date_to)
+    if airline_iata:
+        conditions.append("AIRLINE_IATA = %s")
+        params.append(airline_iata)
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    records = fetch_records(
+        _kpi_sql(keys, where_clause),
+        (on_time_threshold_min, *params, limit + 1),
+        name=f"kpi_{group_by}",
+    )
+    rows = [_to_row(record, len(keys)) for record in records]
+    totals = next((row for row in rows if row["key"] is None), None)
+    return {
+        "group_by": group_by,
+        "date_from": date_from,
+        "date_to": date_to,
+        "data_version": version,
+        "totals": totals,
+        "items": [row for row in rows if row["key"] is not None],
+    }
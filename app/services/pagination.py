@@ -0,0 +1,30 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional
+
+
+def encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def next_cursor(
+    columns: dict[str, list], limit: int, *keys: str
+) -> tuple[dict[str, list], Optional[str]]:
+    # Callers fetch limit + 1 rows; the extra row only signals that another page exists.
+    if len(columns[keys[0]]) <= limit:
+        return columns, None
+    columns = {name: values[:limit] for name, values in columns.items()}
+    return columns, encode_cursor([columns[key][-1] for key in keys])
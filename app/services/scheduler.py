@@ -0,0 +1,198 @@
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from app.config import get_settings
+from app.services.ingest_service import ingest_airports
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledAirport:
+    def __init__(
+        self,
+        iata: str,
+        direction: str = "both",
+        interval_seconds: float = 900,
+        peak_interval_seconds: Optional[float] = None,
+        peak_hours: Optional[list] = None,
+        timezone: str = "UTC",
+    ) -> None:
+        if direction not in ("dep", "arr", "both"):
+            raise ValueError(f"Unknown direction for {iata}: {direction}")
+        self.iata = iata.upper()
+        self.direction = direction
+        self.interval_seconds = float(interval_seconds)
+        self.peak_interval_seconds = float(peak_interval_seconds or interval_seconds)
+        self.peak_hours = [(int(start), int(end)) for start, end in peak_hours or []]
+        self.tz = ZoneInfo(timezone)
+        self.next_run = 0.0
+        self.running = False
+        self.runs = 0
+        self.consecutive_failures = 0
+        self.last_started_at: Optional[datetime] = None
+        self.last_finished_at: Optional[datetime] = None
+        self.last_duration_seconds: Optional[float] = None
+        self.last_rows_changed: Optional[int] = None
+        self.last_error: Optional[str] = None
+
+    def interval(self, now: datetime) -> float:
+        # Departure banks: tighter cadence inside any [start, end) local-hour window
+        hour = now.astimezone(self.tz).hour
+        for start, end in self.peak_hours:
+            if start <= hour < end or (start > end and (hour >= start or hour < end)):
+                return self.peak_interval_seconds
+        return self.interval_seconds
+
+    def status(self) -> dict:
+        return {
+            "iata": self.iata,
+            "direction": self.direction,
+            "interval_seconds": self.interval_seconds,
+            "peak_interval_seconds": self.peak_interval_seconds,
+            "running": self.running,
+            "runs": self.runs,
+            "consecutive_failures": self.consecutive_failures,
+            "next_run_in_seconds": max(0.0, round(self.next_run - time.monotonic(), 1)),
+            "last_started_at": self.last_started_at,
+            "last_finished_at": self.last_finished_at,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_rows_changed": self.last_rows_changed,
+            "last_error": self.last_error,
+        }
+
+
+def parse_schedule(raw: str) -> list[ScheduledAirport]:
+    if not raw.strip():
+        return []
+    entries = json.loads(raw)
+    return [ScheduledAirport(**entry) for entry in entries]
+
+
+class IngestScheduler:
+    def __init__(
+        self,
+        airports: list[ScheduledAirport],
+        limit: int,
+        max_concurrency: int,
+        jitter_ratio: float,
+        max_backoff_seconds: float,
+        fetch_concurrency: int,
+    ) -> None:
+        self.airports = airports
+        self._limit = limit
+        self._max_concurrency = max(1, max_concurrency)
+        self._fetch_concurrency = max(1, fetch_concurrency)
+        self._jitter = jitter_ratio
+        self._max_backoff = max_backoff_seconds
+        self._lock = threading.Lock()
+        self._active = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _jittered(self, seconds: float) -> float:
+        return max(1.0, seconds * (1 + random.uniform(-self._jitter, self._jitter)))
+
+    def _run(self, airport: ScheduledAirport) -> None:
+        started = time.monotonic()
+        airport.last_started_at = datetime.now(timezone.utc)
+        try:
+            result = ingest_airports(
+                [(airport.iata, airport.direction)],
+                self._limit,
+                max_concurrency=self._fetch_concurrency,
+                max_wait=get_settings().http_rate_limit_max_wait_seconds,
+            )
+        except Exception as exc:
+            logger.warning("Scheduled ingest failed for %s", airport.iata, exc_info=True)
+            error = str(exc)
+        else:
+            # One direction failing still backs off; the other direction's rows are kept
+            error = "; ".join(t["error"] for t in result["targets"] if t["error"]) or None
+            airport.last_rows_changed = result["flights_changed"]
+        finally:
+            airport.runs += 1
+            airport.last_duration_seconds = round(time.monotonic() - started, 3)
+            airport.last_finished_at = datetime.now(timezone.utc)
+
+        airport.last_error = error
+        delay = airport.interval(datetime.now(timezone.utc))
+        if error:
+            airport.consecutive_failures += 1
+            delay = min(delay * 2**airport.consecutive_failures, self._max_backoff)
+        else:
+            airport.consecutive_failures = 0
+
+        with self._lock:
+            airport.next_run = time.monotonic() + self._jittered(delay)
+            airport.running = False
+            self._active -= 1
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            now = time.monotonic()
+            with self._lock:
+                for airport in sorted(self.airports, key=lambda a: a.next_run):
+                    if self._active >= self._max_concurrency:
+                        break
+                    if airport.running or airport.next_run > now:
+                        continue
+                    airport.running = True
+                    self._active += 1
+                    self._pool.submit(self._run, airport)
+                idle = [a.next_run for a in self.airports if not a.running]
+            wait = min(idle) - now if idle else 1.0
+            self._stop.wait(min(max(wait, 0.5), 30.0))
+
+    def start(self) -> None:
+        if self._thread or not self.airports:
+            return
+        now = time.monotonic()
+        for airport in self.airports:
+            # Spread the first round so a restart doesn't burst every airport at once
+            airport.next_run = now + random.uniform(
+                0, min(airport.interval_seconds, 60) * self._jitter
+            )
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(self._max_concurrency, thread_name_prefix="scheduler")
+        self._thread = threading.Thread(target=self._loop, name="ingest-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Ingest scheduler started for %s airports", len(self.airports))
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(5)
+            self._thread = None
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def status(self) -> list[dict]:
+        with self._lock:
+            return [airport.status() for airport in self.airports]
+
+
+_scheduler: Optional[IngestScheduler] = None
+
+
+def get_scheduler() -> IngestScheduler:
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = IngestScheduler(
+            parse_schedule(settings.scheduler_airports) if settings.scheduler_enabled else [],
+            limit=settings.scheduler_limit,
+            max_concurrency=settings.scheduler_max_concurrency,
+            jitter_ratio=settings.scheduler_jitter_ratio,
+            max_backoff_seconds=settings.scheduler_max_backoff_seconds,
+            fetch_concurrency=settings.scheduler_fetch_concurrency,
+        )
+    return _scheduler
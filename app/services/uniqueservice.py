@@ -1,14 +1,79 @@
-from app.db.snowflake import fetch_all
+from contextlib import contextmanager
+from typing import Iterable
+
+from app import data_version
+from app.cache import TTLCache
+from app.config import get_settings
+from app.db.results import fetch_records
+from app.db.snowflake import execute, run_statement
+from app.db.sql import load_sql
+
+SUMMARY_CHUNK = 1000
+
+MERGE_SUMMARY_SQL = load_sql("13_merge_airport_airline_summary.sql")
+REBUILD_SUMMARY_SQL = load_sql("14_rebuild_airport_airline_summary.sql")
+
+_settings = get_settings()
+_cache = TTLCache(
+    "unique_airlines", _settings.dim_cache_max_entries, _settings.dim_cache_ttl_seconds
+)
+
+
+def invalidate_unique_airlines() -> None:
+    _cache.clear()
 
 
 def get_unique_airlines(airport_iata: str) -> list[dict]:
-    sql = f"""
-    SELECT DISTINCT
-        a.AIRLINE_IATA AS "airline_iata",
-        a.AIRLINE_NAME AS "airline_name"
-    FROM FACT_FLIGHT f
-    JOIN DIM_AIRLINE a ON f.AIRLINE_IATA = a.AIRLINE_IATA
-    WHERE f.DEP_IATA = %s OR f.ARR_IATA = %s
-    ORDER BY a.AIRLINE_IATA
+    # A flight write can move counts between any airports, so entries retire with the versions
+    key = (airport_iata, data_version.current("flights", "airlines"))
+    return _cache.get_or_load(key, lambda: _load_unique_airlines(airport_iata))
+
+
+def _load_unique_airlines(airport_iata: str) -> list[dict]:
+    sql = """
+    SELECT
+        s.AIRLINE_IATA AS "airline_iata",
+        MAX(a.AIRLINE_NAME) AS "airline_name",
+        SUM(IFF(s.DIRECTION = 'dep', s.FLIGHT_COUNT, 0)) AS "departures",
+        SUM(IFF(s.DIRECTION = 'arr', s.FLIGHT_COUNT, 0)) AS "arrivals",
+        MIN(s.FIRST_SEEN_DATE) AS "first_seen_date",
+        MAX(s.LAST_SEEN_DATE) AS "last_seen_date"
+    FROM AIRPORT_AIRLINE_SUMMARY s
+    JOIN DIM_AIRLINE a ON s.AIRLINE_IATA = a.AIRLINE_IATA
+    WHERE s.AIRPORT_IATA = %s
+    GROUP BY s.AIRLINE_IATA
+    ORDER BY s.AIRLINE_IATA
     """
-    return fetch_all(sql, (airport_iata, airport_iata))
+    return fetch_records(sql, (airport_iata,), name="select_unique_airlines")
+
+
+def _shift_summary(cur, keys: list[str], sign: int) -> None:
+    for start in range(0, len(keys), SUMMARY_CHUNK):
+        chunk = keys[start : start + SUMMARY_CHUNK]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        run_statement(
+            cur,
+            MERGE_SUMMARY_SQL.format(keys=placeholders),
+            [*chunk, sign],
+            "merge_airline_summary",
+        )
+
+
+@contextmanager
+def airline_summary_delta(cur, flight_nks: Iterable[str]):
+    """Keeps AIRPORT_AIRLINE_SUMMARY in step with a FACT_FLIGHT write on the same cursor.
+
+    The stored rows for `flight_nks` are counted out before the block and the
+    rows left afterwards are counted back in, so inserts, deletes and flights
+    moved to another airline or airport all adjust the right pairs. Run it
+    inside the write's transaction.
+    """
+    keys = list(dict.fromkeys(flight_nks))
+    _shift_summary(cur, keys, -1)
+    yield
+    _shift_summary(cur, keys, 1)
+
+
+def rebuild_airline_summary() -> None:
+    execute(REBUILD_SUMMARY_SQL, name="rebuild_airline_summary")
+    invalidate_unique_airlines()
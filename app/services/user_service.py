@@ -3,17 +3,41 @@ import uuid
 from typing import Optional
 
 from app.auth.password import verify_password
+from app.cache import TTLCache
+from app.config import get_settings
 from app.db.snowflake import execute, fetch_one
 
 logger = logging.getLogger(__name__)
 
+_settings = get_settings()
+_user_cache = TTLCache(
+    "app_user", _settings.user_cache_max_entries, _settings.user_cache_ttl_seconds
+)
 
-def get_user_by_email(email: str) -> Optional[dict]:
+
+def _load_user(email: str) -> Optional[dict]:
     sql = "SELECT ID, EMAIL, PASSWORD_HASH, CREATED_AT FROM APP_USER WHERE EMAIL = %s"
     return fetch_one(sql, (email,))
 
 
+def get_user_by_email(email: str) -> Optional[dict]:
+    return _user_cache.get_or_load(email, lambda: _load_user(email))
+
+
+def get_cached_user(email: str) -> Optional[dict]:
+    return _user_cache.get(email)
+
+
+def invalidate_user(email: Optional[str] = None) -> None:
+    if email is None:
+        _user_cache.clear()
+    else:
+        _user_cache.invalidate(email)
+
+
 def authenticate_user(email: str, password: str) -> Optional[dict]:
+    # Password checks always read the stored hash so a re-seeded password applies at once
+    invalidate_user(email)
     user = get_user_by_email(email)
     if not user:
         return None
@@ -30,4 +54,5 @@ def get_or_create_user_by_email(email: str) -> dict:
     user_id = str(uuid.uuid4())
     sql = "INSERT INTO APP_USER (ID, EMAIL, PASSWORD_HASH, CREATED_AT) VALUES (%s, %s, %s, CURRENT_TIMESTAMP())"
     execute(sql, (user_id, email, None))
+    invalidate_user(email)
     return get_user_by_email(email)
@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from app.metrics import Counter
+
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "Coalesced calls by group and role (leader ran it, follower waited, reused a recent result)",
+    ("group", "role"),
+)
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "finished_at")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.finished_at = 0.0
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers with the same key share its result.
+
+    With `reuse_seconds` > 0 a finished result is also handed to callers that
+    arrive within that window. Errors are shared with waiting followers but
+    never reused.
+    """
+
+    def __init__(self, name: str, reuse_seconds: float = 0.0) -> None:
+        self.name = name
+        self.reuse_seconds = reuse_seconds
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.done.is_set():
+                if time.monotonic() - call.finished_at < self.reuse_seconds:
+                    SINGLEFLIGHT_CALLS.inc(self.name, "reused")
+                    return call.value
+                del self._calls[key]
+                call = None
+            leader = call is None
+            if leader:
+                if self.reuse_seconds > 0:
+                    self._prune()
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            SINGLEFLIGHT_CALLS.inc(self.name, "follower")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        SINGLEFLIGHT_CALLS.inc(self.name, "leader")
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            call.finished_at = time.monotonic()
+            with self._lock:
+                keep = call.error is None and self.reuse_seconds > 0
+                if not keep and self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.value
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.reuse_seconds
+        for key in [
+            k for k, c in self._calls.items() if c.done.is_set() and c.finished_at < cutoff
+        ]:
+            del self._calls[key]
+
+    def forget(self, key: Hashable = None) -> None:
+        """Stops sharing in-flight or recent results, for one key or all of them.
+
+        A call already running still finishes for the callers waiting on it.
+        """
+        with self._lock:
+            if key is None:
+                self._calls.clear()
+            else:
+                self._calls.pop(key, None)
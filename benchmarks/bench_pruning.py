@@ -0,0 +1,154 @@
+"""Partitions scanned by the flight list/count queries against a real FACT_FLIGHT.
+
+Needs Snowflake credentials (.env) and a populated FACT_FLIGHT. Run it once
+before and once after `python scripts/create_tables.py` has applied the
+clustering key (and, optionally, --search-optimization), then compare:
+
+    python -m benchmarks.bench_pruning > before.json
+    python -m benchmarks.bench_pruning > after.json
+    python -m benchmarks.bench_pruning --compare before.json after.json
+
+Filters are anchored on the newest FLIGHT_DATE and the busiest airports in the
+table, so the same query set works on any data set. Reclustering runs in the
+background, so the "after" numbers keep improving for a while after the ALTER.
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from app.db.snowflake import get_connection, run_statement
+from app.services.flight_service import flight_filters
+
+CLUSTER_KEY = "(FLIGHT_DATE, DEP_IATA)"
+
+OPERATOR_STATS_SQL = """
+SELECT
+    SUM(OPERATOR_STATISTICS:pruning:partitions_scanned::INT),
+    SUM(OPERATOR_STATISTICS:pruning:partitions_total::INT)
+FROM TABLE(GET_QUERY_OPERATOR_STATS(%s))
+WHERE OPERATOR_TYPE = 'TableScan'
+"""
+
+
+def query_set(cur) -> dict[str, dict]:
+    run_statement(cur, "SELECT MAX(FLIGHT_DATE) FROM FACT_FLIGHT", name="bench_anchor")
+    (latest,) = cur.fetchone()
+    run_statement(
+        cur,
+        "SELECT DEP_IATA FROM FACT_FLIGHT WHERE DEP_IATA IS NOT NULL "
+        "GROUP BY DEP_IATA ORDER BY COUNT(*) DESC LIMIT 3",
+        name="bench_anchor",
+    )
+    busiest = [row[0] for row in cur.fetchall()]
+    run_statement(cur, "SELECT MAX(FLIGHT_NK) FROM FACT_FLIGHT", name="bench_anchor")
+    (flight_nk,) = cur.fetchone()
+    week = (latest - timedelta(days=6)).isoformat()
+    month = (latest - timedelta(days=29)).isoformat()
+    return {
+        "date_7d": {"date_from": week, "date_to": latest.isoformat()},
+        "dep_date_7d": {"dep_iata": busiest[:1], "date_from": week},
+        "dep_in_date_30d": {"dep_iata": busiest, "date_from": month},
+        "arr_date_7d": {"arr_iata": busiest[:1], "date_from": week},
+        "status_in_day": {"status": ["landed", "cancelled"], "flight_date": latest.isoformat()},
+        "dep_any_date": {"dep_iata": busiest[:1]},
+        "flight_nk": {"flight_nk": flight_nk},
+    }
+
+
+def statements(filters: dict) -> dict[str, tuple[str, list]]:
+    if "flight_nk" in filters:
+        return {"get": ("SELECT * FROM FACT_FLIGHT WHERE FLIGHT_NK = %s", [filters["flight_nk"]])}
+    conditions, params = flight_filters(**filters)
+    where_clause = "WHERE " + " AND ".join(conditions)
+    return {
+        "count": (f"SELECT COUNT(*) FROM FACT_FLIGHT {where_clause}", params),
+        "page": (
+            f"SELECT * FROM FACT_FLIGHT {where_clause} "
+            "ORDER BY FLIGHT_DATE DESC NULLS LAST, FLIGHT_NK DESC LIMIT 50",
+            params,
+        ),
+    }
+
+
+def measure(cur, sql: str, params: list) -> dict:
+    started = time.perf_counter()
+    run_statement(cur, sql, params, name="bench_pruning")
+    cur.fetchall()
+    elapsed = time.perf_counter() - started
+    query_id = cur.sfqid
+    run_statement(cur, OPERATOR_STATS_SQL, (query_id,), name="bench_operator_stats")
+    scanned, total = cur.fetchone()
+    return {
+        "query_id": query_id,
+        "partitions_scanned": scanned,
+        "partitions_total": total,
+        "seconds": round(elapsed, 3),
+    }
+
+
+def run() -> dict:
+    results = {}
+    with get_connection() as conn:
+        cur = conn.cursor()
+        try:
+            # Otherwise a repeated run is answered from the result cache without scanning
+            run_statement(cur, "ALTER SESSION SET USE_CACHED_RESULT = FALSE", name="bench_session")
+            # Passing the key explicitly reports depth even before the table is clustered
+            run_statement(
+                cur,
+                "SELECT SYSTEM$CLUSTERING_INFORMATION('FACT_FLIGHT', %s)",
+                (CLUSTER_KEY,),
+                name="bench_clustering",
+            )
+            clustering = json.loads(cur.fetchone()[0])
+            for name, filters in query_set(cur).items():
+                for kind, (sql, params) in statements(filters).items():
+                    results[f"{name}.{kind}"] = {"filters": filters, **measure(cur, sql, params)}
+        finally:
+            cur.close()
+    return {
+        "clustering": {
+            "cluster_by_keys": clustering.get("cluster_by_keys"),
+            "total_partition_count": clustering.get("total_partition_count"),
+            "average_depth": clustering.get("average_depth"),
+        },
+        "queries": results,
+    }
+
+
+def compare(before: dict, after: dict) -> dict:
+    rows = {}
+    for name, old in before["queries"].items():
+        new = after["queries"].get(name)
+        if new is None:
+            continue
+        rows[name] = {
+            "partitions_scanned": [old["partitions_scanned"], new["partitions_scanned"]],
+            "partitions_total": [old["partitions_total"], new["partitions_total"]],
+            "seconds": [old["seconds"], new["seconds"]],
+        }
+    return {"clustering": [before["clustering"], after["clustering"]], "queries": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        before, after = (json.loads(path.read_text()) for path in args.compare)
+        report = {"benchmark": "pruning_compare", **compare(before, after)}
+    else:
+        report = {"benchmark": "pruning", **run()}
+    json.dump(report, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Time app.db.results and the list-page renderers on synthetic FACT_FLIGHT rows.
+
+Compares the old DictCursor + lower-casing approach with records_from_cursor and
+columns_from_cursor on the row path and (when pyarrow is installed) the Arrow
+path, then renders a FlightList page from records (model_response) and from
+columns (page_response), the way the list endpoints do.
+
+The fake cursor's row path hands out ready-made tuples, so it leaves out the
+connector's own Arrow-to-Python row conversion; the Arrow paths include
+pyarrow's conversion. Compare row and Arrow numbers against a real warehouse
+before drawing conclusions across the two.
+
+Run from the repo root: python -m benchmarks.bench_results [--sizes 200 100000]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from app.api.responses import model_response, page_response
+from app.db.results import columns_from_cursor, pa, records_from_cursor
+from app.models.flight import FlightList
+from benchmarks.fakes import FakeCursor, fact_rows
+
+COLUMNS = [
+    "FLIGHT_NK",
+    "FLIGHT_DATE",
+    "FLIGHT_STATUS",
+    "AIRLINE_IATA",
+    "FLIGHT_NUMBER",
+    "FLIGHT_IATA",
+    "FLIGHT_ICAO",
+    "DEP_IATA",
+    "ARR_IATA",
+    "DEP_TERMINAL",
+    "DEP_GATE",
+    "ARR_TERMINAL",
+    "ARR_GATE",
+    "DEP_DELAY_MIN",
+    "ARR_DELAY_MIN",
+    "DEP_SCHEDULED_UTC",
+    "DEP_ESTIMATED_UTC",
+    "DEP_ACTUAL_UTC",
+    "ARR_SCHEDULED_UTC",
+    "ARR_ESTIMATED_UTC",
+    "ARR_ACTUAL_UTC",
+    "LAST_SEEN_AT",
+    "SOURCE",
+]
+
+
+def dictcursor_records(cur) -> list[dict]:
+    # The code before app.db.results: DictCursor rows, then every service re-keyed them
+    names = [col[0] for col in cur.description]
+    fetched = [dict(zip(names, row)) for row in cur.fetchall()]
+    return [{k.lower(): v for k, v in row.items()} for row in fetched]
+
+
+def records_page(cur) -> bytes:
+    records = records_from_cursor(cur)
+    page = {"items": records, "total": None, "limit": len(records), "offset": 0}
+    return model_response(FlightList, page).body
+
+
+def columns_page(cur) -> bytes:
+    columns = columns_from_cursor(cur)
+    n = len(columns["flight_nk"])
+    return page_response(FlightList, columns, total=None, limit=n, offset=0).body
+
+
+def measure(label: str, func, rows: list[tuple], arrow: bool, repeat: int) -> dict:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        cur = FakeCursor(rows, COLUMNS, arrow=arrow)
+        start = time.perf_counter()
+        func(cur)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    # Separate run: tracemalloc slows allocation-heavy code down too much to time under it
+    cur = FakeCursor(rows, COLUMNS, arrow=arrow)
+    tracemalloc.start()
+    func(cur)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(rows)
+    return {
+        "path": label,
+        "rows": n,
+        "seconds": round(elapsed, 6),
+        "rows_per_second": round(n / elapsed) if elapsed else None,
+        "peak_bytes": peak,
+    }
+
+
+def run(sizes: list[int], repeat: int) -> list[dict]:
+    paths = [
+        ("dictcursor+normalize", dictcursor_records, False),
+        ("records_from_cursor.rows", records_from_cursor, False),
+        ("columns_from_cursor.rows", columns_from_cursor, False),
+        ("page.records.rows", records_page, False),
+        ("page.columns.rows", columns_page, False),
+    ]
+    if pa is not None:
+        paths += [
+            ("records_from_cursor.arrow", records_from_cursor, True),
+            ("columns_from_cursor.arrow", columns_from_cursor, True),
+            ("page.records.arrow", records_page, True),
+            ("page.columns.arrow", columns_page, True),
+        ]
+    results = []
+    for n in sizes:
+        rows = fact_rows(n, COLUMNS)
+        results.extend(measure(label, func, rows, arrow, repeat) for label, func, arrow in paths)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    results = run(args.sizes, args.repeat)
+    report = {"benchmark": "results", "arrow": pa is not None, "results": results}
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
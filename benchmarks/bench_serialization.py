@@ -0,0 +1,107 @@
+"""Compare FastAPI's validated response path with app.api.responses.page_response.
+
+The validated path is what a /flights handler did before page_response: build
+a FlightList from the rows, then FastAPI's own serialize_response (validate
+against response_model, dump to JSON-able data) and JSONResponse. Reports CPU
+seconds per response, raw body bytes for both paths, and gzip'd and (when
+brotli is installed) brotli'd bytes for the page_response body.
+
+Run from the repo root: python -m benchmarks.bench_serialization [--sizes 50 200 5000]
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api.responses import orjson, page_response
+from app.db.results import columns_from_cursor, records_from_cursor
+from app.models.flight import FlightList
+from benchmarks.bench_results import COLUMNS
+from benchmarks.fakes import FakeCursor, fact_rows
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def _list_route() -> APIRoute:
+    async def list_all():  # pragma: no cover - never called, only its response field is used
+        return None
+
+    return APIRoute("/flights", list_all, response_model=FlightList)
+
+
+ROUTE = _list_route()
+LOOP = asyncio.new_event_loop()
+
+
+def validated_body(page: dict) -> bytes:
+    content = LOOP.run_until_complete(
+        serialize_response(field=ROUTE.response_field, response_content=FlightList(**page))
+    )
+    return JSONResponse(content).body
+
+
+def fast_body(page: dict) -> bytes:
+    return page_response(FlightList, page["columns"], **page["meta"]).body
+
+
+def cpu_per_call(func, page: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        func(page)
+        best = min(best, time.process_time() - started)
+    return best
+
+
+def sizes(body: bytes) -> dict:
+    out = {"raw": len(body), "gzip": len(gzip.compress(body, compresslevel=6))}
+    if brotli is not None:
+        out["br"] = len(brotli.compress(body, quality=4))
+    return out
+
+
+def run(n: int, repeat: int) -> dict:
+    rows = fact_rows(n, COLUMNS)
+    meta = {"total": None, "limit": n, "offset": 0, "next_cursor": None}
+    # Each path gets the service output it is fed in the app
+    records_page = {"items": records_from_cursor(FakeCursor(rows, COLUMNS)), **meta}
+    columns_page = {"columns": columns_from_cursor(FakeCursor(rows, COLUMNS)), "meta": meta}
+    validated = cpu_per_call(validated_body, records_page, repeat)
+    fast = cpu_per_call(fast_body, columns_page, repeat)
+    return {
+        "rows": n,
+        "validated_cpu_ms": round(validated * 1000, 3),
+        "page_response_cpu_ms": round(fast * 1000, 3),
+        "speedup": round(validated / fast, 2) if fast else None,
+        "validated_bytes": len(validated_body(records_page)),
+        "page_response_bytes": sizes(fast_body(columns_page)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "serialization",
+        "orjson": orjson is not None,
+        "brotli": brotli is not None,
+        "results": [run(n, args.repeat) for n in args.sizes],
+    }
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Offline stand-ins for Aviationstack and the Snowflake connector."""
+
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, NamedTuple
+
+from snowflake.connector.errors import NotSupportedError
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+AIRPORTS = ["ORD", "ATL", "DFW", "DEN", "LAX", "JFK", "SFO", "SEA", "MIA", "BOS"]
+AIRLINES = [("AA", "AAL", "American"), ("UA", "UAL", "United"), ("DL", "DAL", "Delta")]
+STATUSES = ["scheduled", "active", "landed", "cancelled"]
+
+
+def aviationstack_payload(n: int, seed: int = 7, flight_date: str = "2024-05-01") -> list[dict]:
+    """Synthetic /v1/flights records shaped like the real API response."""
+    rng = random.Random(seed)
+    base = datetime(2024, 5, 1, 5, 0)
+    records = []
+    for i in range(n):
+        dep, arr = rng.sample(AIRPORTS, 2)
+        iata, icao, name = rng.choice(AIRLINES)
+        number = str(100 + i)
+        scheduled = base + timedelta(minutes=rng.randrange(0, 18 * 60))
+        delay = rng.choice([None, None, 0, 5, 15, 42])
+        records.append(
+            {
+                "flight_date": flight_date,
+                "flight_status": rng.choice(STATUSES),
+                "departure": {
+                    "airport": f"{dep} International",
+                    "timezone": "America/Chicago",
+                    "iata": dep,
+                    "icao": "K" + dep,
+                    "terminal": str(rng.randrange(1, 6)),
+                    "gate": f"{rng.choice('ABCK')}{rng.randrange(1, 40)}",
+                    "delay": delay,
+                    "scheduled": scheduled.isoformat() + "+00:00",
+                    "estimated": scheduled.isoformat() + "+00:00",
+                    "actual": None,
+                },
+                "arrival": {
+                    "airport": f"{arr} International",
+                    "timezone": "America/New_York",
+                    "iata": arr,
+                    "icao": "K" + arr,
+                    "terminal": None,
+                    "gate": None,
+                    "delay": None,
+                    "scheduled": (scheduled + timedelta(hours=2)).isoformat() + "+00:00",
+                    "estimated": None,
+                    "actual": None,
+                },
+                "airline": {"name": name, "iata": iata, "icao": icao},
+                "flight": {"number": number, "iata": iata + number, "icao": icao + number},
+            }
+        )
+    return records
+
+
+def fact_rows(n: int, columns: list[str]) -> list[tuple]:
+    """Rows as FACT_FLIGHT would return them, one value per column in order."""
+    base = datetime(2024, 5, 1, 6, 0)
+    rows = []
+    for i in range(n):
+        ts = base + timedelta(minutes=i)
+        values = {
+            "FLIGHT_NK": f"AA{i}:2024-05-01",
+            "FLIGHT_DATE": date(2024, 5, 1),
+            "FLIGHT_STATUS": "scheduled",
+            "AIRLINE_IATA": "AA",
+            "FLIGHT_NUMBER": str(i),
+            "FLIGHT_IATA": f"AA{i}",
+            "DEP_IATA": "ORD",
+            "ARR_IATA": "JFK",
+            "DEP_GATE": f"K{i % 20}",
+            "DEP_DELAY_MIN": i % 45,
+            "DEP_SCHEDULED_UTC": ts,
+            "ARR_SCHEDULED_UTC": ts + timedelta(hours=2),
+            "LAST_SEEN_AT": ts,
+            "SOURCE": "aviationstack",
+        }
+        rows.append(tuple(values.get(name) for name in columns))
+    return rows
+
+
+class Statement(NamedTuple):
+    verb: str
+    sql: str
+    params: Any
+    many: bool
+
+
+class FakeCursor:
+    """Accepts the connector calls the app makes, counts round trips and records each statement."""
+
+    rowcount = None
+    sfqid = None
+
+    def __init__(
+        self,
+        rows: list[tuple] | None = None,
+        columns: list[str] | None = None,
+        arrow: bool = False,
+        batch_size: int = 10_000,
+    ):
+        self.rows = rows or []
+        self.description = [(name,) for name in columns or []]
+        self.tables = None
+        if arrow and pa is not None:
+            # Built up front: the real connector decodes Arrow batches in C, not in the timed call
+            names = [col[0] for col in self.description]
+            self.tables = [
+                pa.Table.from_pydict(dict(zip(names, map(list, zip(*chunk)))))
+                for chunk in (
+                    self.rows[i : i + batch_size] for i in range(0, len(self.rows), batch_size)
+                )
+            ]
+        self.connection: "FakeConnection | None" = None
+        self.calls: list[Statement] = []
+        self.statements = 0
+        self.rows_sent = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _record(self, sql: str, params: Any, many: bool) -> None:
+        if self.connection is not None and self.connection.broken:
+            raise RuntimeError("connection lost")
+        self.statements += 1
+        self.calls.append(Statement(sql.split()[0].upper(), sql, params, many))
+
+    def verbs(self) -> list[str]:
+        return [call.verb for call in self.calls]
+
+    def execute(self, sql, params=None):
+        self._record(sql, params, False)
+        return self
+
+    def executemany(self, sql, seq):
+        # The connector rewrites INSERT ... VALUES batches into one multi-row statement
+        seq = list(seq)
+        self._record(sql, seq, True)
+        self.rows_sent += len(seq)
+        return self
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def fetch_arrow_batches(self):
+        # Row path unless asked for Arrow, so default runs don't depend on pyarrow
+        if self.tables is None:
+            raise NotSupportedError("fake cursor has no Arrow results")
+        return iter(self.tables)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cur: FakeCursor | None = None):
+        self.closed = False
+        self.broken = False
+        self.cur = cur or FakeCursor()
+
+    @property
+    def cur(self) -> FakeCursor:
+        return self._cur
+
+    @cur.setter
+    def cur(self, cur: FakeCursor) -> None:
+        cur.connection = self
+        self._cur = cur
+
+    def cursor(self, *args):
+        return self.cur
+
+    def commit(self):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,192 @@
+"""Offline micro-benchmarks for the ingest transform and DB layer.
+
+Run from the repo root: python -m benchmarks.suite [--records 500] [--check]
+
+Aviationstack and Snowflake are replaced by benchmarks.fakes, so no network or
+credentials are needed. Results are printed as JSON; --check compares them with
+benchmarks/thresholds.json and exits non-zero on a regression. Statement counts
+are deterministic; throughput floors are deliberately loose so they only trip on
+real regressions, not on a slower machine.
+"""
+
+import argparse
+import json
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from unittest import mock
+
+from pydantic import TypeAdapter
+
+from app.api.responses import page_response
+from app.config import get_settings
+from app.db import results, snowflake
+from app.db.results import columns_from_cursor, records_from_cursor
+from app.models.bulk import FlightBulkOp
+from app.models.flight import FlightList, FlightUpdate
+from app.services import bulk_service, flight_service, ingest_service
+from benchmarks.bench_results import COLUMNS
+from benchmarks.fakes import FakeConnection, FakeCursor, aviationstack_payload, fact_rows
+
+THRESHOLDS_PATH = Path(__file__).with_name("thresholds.json")
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_parse_ts(payload: list[dict], repeat: int) -> dict:
+    values = [r["departure"]["scheduled"] for r in payload] + [None, "", "not-a-date"]
+    seconds = best_of(lambda: [ingest_service.parse_ts(v) for v in values], repeat)
+    return {"parse_ts.calls_per_second": round(len(values) / seconds)}
+
+
+def bench_flatten(payload: list[dict], repeat: int) -> dict:
+    seconds = best_of(lambda: ingest_service.flatten_records(payload), repeat)
+    return {"flatten_records.records_per_second": round(len(payload) / seconds)}
+
+
+def _ingest(payload: list[dict], mode: str, conn: FakeConnection) -> None:
+    with (
+        mock.patch.object(ingest_service, "get_connection", lambda: nullcontext(conn)),
+        mock.patch.object(ingest_service, "fetch_aviationstack_flights", lambda *a, **kw: payload),
+        mock.patch.object(get_settings(), "ingest_change_detection", True),
+    ):
+        ingest_service.ingest_flights("ORD", None, len(payload), mode=mode)
+
+
+def bench_ingest(payload: list[dict], repeat: int) -> dict:
+    n = len(payload)
+    metrics = {}
+    for mode in ingest_service.INGEST_MODES:
+        conn = FakeConnection()
+
+        def first_poll():
+            ingest_service.forget_flight_fingerprint()
+            ingest_service.forget_dimension_rows()
+            conn.cur = FakeCursor()
+            _ingest(payload, mode, conn)
+
+        seconds = best_of(first_poll, repeat)
+        metrics[f"ingest.{mode}.statements_per_record"] = round(conn.cur.statements / n, 4)
+        metrics[f"ingest.{mode}.records_per_second"] = round(n / seconds)
+
+        # Same payload again: every flight is unchanged and known to the local cache
+        conn.cur = FakeCursor()
+        _ingest(payload, mode, conn)
+        metrics[f"ingest.{mode}.repeat_poll_statements"] = conn.cur.statements
+    ingest_service.forget_flight_fingerprint()
+    ingest_service.forget_dimension_rows()
+    return metrics
+
+
+def bench_results(rows: list[tuple], repeat: int) -> dict:
+    seconds = best_of(lambda: records_from_cursor(FakeCursor(rows, COLUMNS)), repeat)
+    return {"results.records_per_second": round(len(rows) / seconds)}
+
+
+def bench_flight_list(rows: list[tuple], repeat: int) -> dict:
+    # The /flights path: columnar fetch, then the page rendered straight from the columns
+    columns = columns_from_cursor(FakeCursor(rows, COLUMNS))
+
+    def serialize():
+        return page_response(FlightList, columns, total=None, limit=len(rows), offset=0)
+
+    seconds = best_of(serialize, repeat)
+    return {"flight_list.serialize.rows_per_second": round(len(rows) / seconds)}
+
+
+def bench_bulk(n: int, repeat: int) -> dict:
+    # A terminal change: re-gate n existing flights, one call each vs one bulk request
+    keys = [f"AA{i}:2024-05-01" for i in range(n)]
+    raw = [
+        {"op": "update", "key": k, "data": {"dep_gate": f"K{i % 20}"}} for i, k in enumerate(keys)
+    ]
+    operations = TypeAdapter(list[FlightBulkOp]).validate_python(raw)
+    conn = FakeConnection()
+
+    def single():
+        conn.cur = FakeCursor()
+        for op in operations:
+            flight_service.update_flight(op.key, FlightUpdate(**op.data.model_dump()))
+
+    def bulk():
+        conn.cur = FakeCursor([(k,) for k in keys])
+        bulk_service.bulk_flights(operations)
+
+    with (
+        mock.patch.object(snowflake, "get_connection", lambda: nullcontext(conn)),
+        mock.patch.object(results, "get_connection", lambda: nullcontext(conn)),
+        mock.patch.object(bulk_service, "get_connection", lambda: nullcontext(conn)),
+    ):
+        single_seconds = best_of(single, repeat)
+        single_statements = conn.cur.statements
+        bulk_seconds = best_of(bulk, repeat)
+        bulk_statements = conn.cur.statements
+    ingest_service.forget_flight_fingerprint()
+    return {
+        "single.flights.statements_per_operation": round(single_statements / n, 4),
+        "bulk.flights.statements": bulk_statements,
+        "bulk.flights.speedup_vs_single": round(single_seconds / bulk_seconds, 1),
+    }
+
+
+def run(records: int, rows: int, repeat: int) -> dict:
+    payload = aviationstack_payload(records)
+    table = fact_rows(rows, COLUMNS)
+    metrics = {}
+    metrics.update(bench_parse_ts(payload, repeat))
+    metrics.update(bench_flatten(payload, repeat))
+    metrics.update(bench_ingest(payload, repeat))
+    metrics.update(bench_results(table, repeat))
+    metrics.update(bench_flight_list(table, repeat))
+    metrics.update(bench_bulk(records, repeat))
+    return metrics
+
+
+def check(metrics: dict, thresholds: dict) -> list[str]:
+    failures = []
+    for name, limits in thresholds.items():
+        value = metrics.get(name)
+        if value is None:
+            failures.append(f"{name}: missing")
+        elif "max" in limits and value > limits["max"]:
+            failures.append(f"{name}: {value} > max {limits['max']}")
+        elif "min" in limits and value < limits["min"]:
+            failures.append(f"{name}: {value} < min {limits['min']}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=500, help="Aviationstack records")
+    parser.add_argument("--rows", type=int, default=5000, help="FACT_FLIGHT rows")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Fail on threshold regressions")
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS_PATH)
+    args = parser.parse_args()
+
+    metrics = run(args.records, args.rows, args.repeat)
+    report = {
+        "benchmark": "suite",
+        "params": {"records": args.records, "rows": args.rows, "repeat": args.repeat},
+        "metrics": metrics,
+    }
+    failures = []
+    if args.check:
+        failures = check(metrics, json.loads(args.thresholds.read_text()))
+        report["failures"] = failures
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
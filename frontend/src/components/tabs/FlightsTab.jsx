@@ -9,18 +9,21 @@ function FlightsTab({ apiRequest }) {
   const [flightDate, setFlightDate] = useState("");
   const [status, setStatus] = useState("");
   const [rows, setRows] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(false);
 
-  const loadFlights = async () => {
+  const loadFlights = async (cursor = null) => {
     setLoading(true);
     setError("");
     try {
+      const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
       const data = await apiRequest(
-        `/flights?dep_iata=${depIata}&arr_iata=${arrIata}&flight_date=${flightDate}&status=${status}&limit=50&offset=0`
+        `/flights?dep_iata=${depIata}&arr_iata=${arrIata}&flight_date=${flightDate}&status=${status}&limit=50&include_total=false${cursorParam}`
       );
       const items = Array.isArray(data) ? data : data?.items || [];
-      setRows(items);
+      setRows((prev) => (cursor ? [...prev, ...items] : items));
+      setNextCursor(data?.next_cursor || null);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -44,7 +47,12 @@ function FlightsTab({ apiRequest }) {
           <input value={status} onChange={(e) => setStatus(e.target.value)} />
         </Field>
       </div>
-      <button onClick={loadFlights} disabled={loading}>{loading ? "Loading..." : "Load Flights"}</button>
+      <button onClick={() => loadFlights()} disabled={loading}>{loading ? "Loading..." : "Load Flights"}</button>
+      {nextCursor && (
+        <button onClick={() => loadFlights(nextCursor)} disabled={loading}>
+          Load More
+        </button>
+      )}
       {error && <div className="error">{error}</div>}
       <DataTable rows={rows} />
     </Panel>
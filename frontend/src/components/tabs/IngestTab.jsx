@@ -5,6 +5,8 @@ function IngestTab({ apiRequest }) {
   const [depIata, setDepIata] = useState("");
   const [arrIata, setArrIata] = useState("");
   const [limit, setLimit] = useState(50);
+  const [batchAirports, setBatchAirports] = useState("");
+  const [batchDirection, setBatchDirection] = useState("dep");
   const [result, setResult] = useState(null);
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(false);
@@ -27,6 +29,28 @@ function IngestTab({ apiRequest }) {
     }
   };
 
+  const ingestBatch = async () => {
+    setLoading(true);
+    setError("");
+    setResult(null);
+    try {
+      const targets = batchAirports
+        .split(/[\s,]+/)
+        .filter(Boolean)
+        .map((iata) => ({ iata, direction: batchDirection }));
+      const data = await apiRequest("/ingest/flights/batch", {
+        method: "POST",
+        timeoutMs: 180000,
+        body: JSON.stringify({ targets, limit })
+      });
+      setResult(data);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   return (
     <Panel title="Ingest Flights">
       <div className="crud-grid">
@@ -42,6 +66,16 @@ function IngestTab({ apiRequest }) {
           <input type="number" placeholder="Limit" value={limit} onChange={(e) => setLimit(Number(e.target.value))} />
           <button onClick={() => ingest("arr")} disabled={loading}>Ingest Arrivals</button>
         </div>
+        <div>
+          <h3>Multiple Airports</h3>
+          <input placeholder="ORD, ATL, DFW" value={batchAirports} onChange={(e) => setBatchAirports(e.target.value.toUpperCase())} />
+          <select value={batchDirection} onChange={(e) => setBatchDirection(e.target.value)}>
+            <option value="dep">Departures</option>
+            <option value="arr">Arrivals</option>
+            <option value="both">Both</option>
+          </select>
+          <button onClick={ingestBatch} disabled={loading}>Ingest All</button>
+        </div>
       </div>
       {loading ? <div className="muted">Ingesting...</div> : null}
       {error && <div className="error">{error}</div>}
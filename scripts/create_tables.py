@@ -1,3 +1,4 @@
+import argparse
 import logging
 import sys
 from pathlib import Path
@@ -25,7 +26,25 @@ def run_sql_file(name: str) -> None:
 
 
 def main() -> None:
-    for name in ["00_setup_check.sql", "01_tables.sql", "05_app_user.sql"]:
+    parser = argparse.ArgumentParser(description="Create or migrate the Snowflake tables.")
+    parser.add_argument(
+        "--search-optimization",
+        action="store_true",
+        help="Also enable search optimization on FACT_FLIGHT (Enterprise Edition, billed)",
+    )
+    args = parser.parse_args()
+
+    names = [
+        "00_setup_check.sql",
+        "01_tables.sql",
+        "05_app_user.sql",
+        "11_fact_flight_fingerprint.sql",
+        "12_airport_airline_summary.sql",
+        "15_fact_flight_clustering.sql",
+    ]
+    if args.search_optimization:
+        names.append("16_fact_flight_search_optimization.sql")
+    for name in names:
         run_sql_file(name)
 
 
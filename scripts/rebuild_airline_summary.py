@@ -0,0 +1,25 @@
+import logging
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.services.uniqueservice import rebuild_airline_summary
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    rebuild_airline_summary()
+    logger.info("Rebuilt AIRPORT_AIRLINE_SUMMARY from FACT_FLIGHT")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,5 +47,7 @@ CREATE TABLE IF NOT EXISTS FACT_FLIGHT (
     ARR_ESTIMATED_UTC TIMESTAMP_NTZ,
     ARR_ACTUAL_UTC TIMESTAMP_NTZ,
     LAST_SEEN_AT TIMESTAMP_NTZ,
-    SOURCE STRING
-);
+    SOURCE STRING,
+    ROW_FINGERPRINT STRING
+)
+CLUSTER BY (FLIGHT_DATE, DEP_IATA);
@@ -0,0 +1,46 @@
+CREATE OR REPLACE TEMPORARY TABLE STG_RAW_AVSTACK_FLIGHTS (
+    FLIGHT_DATE DATE,
+    FLIGHT_IATA STRING,
+    DEP_IATA STRING,
+    ARR_IATA STRING,
+    RECORD_JSON STRING
+);
+
+CREATE OR REPLACE TEMPORARY TABLE STG_FACT_FLIGHT (
+    FLIGHT_NK STRING,
+    FLIGHT_DATE DATE,
+    FLIGHT_STATUS STRING,
+    AIRLINE_IATA STRING,
+    FLIGHT_NUMBER STRING,
+    FLIGHT_IATA STRING,
+    FLIGHT_ICAO STRING,
+    DEP_IATA STRING,
+    ARR_IATA STRING,
+    DEP_TERMINAL STRING,
+    DEP_GATE STRING,
+    ARR_TERMINAL STRING,
+    ARR_GATE STRING,
+    DEP_DELAY_MIN INTEGER,
+    ARR_DELAY_MIN INTEGER,
+    DEP_SCHEDULED_UTC TIMESTAMP_NTZ,
+    DEP_ESTIMATED_UTC TIMESTAMP_NTZ,
+    DEP_ACTUAL_UTC TIMESTAMP_NTZ,
+    ARR_SCHEDULED_UTC TIMESTAMP_NTZ,
+    ARR_ESTIMATED_UTC TIMESTAMP_NTZ,
+    ARR_ACTUAL_UTC TIMESTAMP_NTZ,
+    SOURCE STRING,
+    ROW_FINGERPRINT STRING
+);
+
+CREATE OR REPLACE TEMPORARY TABLE STG_DIM_AIRPORT (
+    AIRPORT_IATA STRING,
+    AIRPORT_NAME STRING,
+    TIMEZONE STRING,
+    ICAO STRING
+);
+
+CREATE OR REPLACE TEMPORARY TABLE STG_DIM_AIRLINE (
+    AIRLINE_IATA STRING,
+    AIRLINE_ICAO STRING,
+    AIRLINE_NAME STRING
+);
@@ -0,0 +1,8 @@
+INSERT INTO RAW_AVSTACK_FLIGHTS (
+    INGEST_ID, INGESTED_AT, FLIGHT_DATE, FLIGHT_IATA,
+    DEP_IATA, ARR_IATA, RECORD, SOURCE
+)
+SELECT
+    %s, %s, s.FLIGHT_DATE, s.FLIGHT_IATA,
+    s.DEP_IATA, s.ARR_IATA, PARSE_JSON(s.RECORD_JSON), %s
+FROM STG_RAW_AVSTACK_FLIGHTS AS s
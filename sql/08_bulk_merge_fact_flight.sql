@@ -0,0 +1,42 @@
+MERGE INTO FACT_FLIGHT AS t
+USING STG_FACT_FLIGHT AS s
+ON t.FLIGHT_NK = s.FLIGHT_NK
+WHEN MATCHED THEN UPDATE SET
+    FLIGHT_DATE = s.FLIGHT_DATE,
+    FLIGHT_STATUS = s.FLIGHT_STATUS,
+    AIRLINE_IATA = s.AIRLINE_IATA,
+    FLIGHT_NUMBER = s.FLIGHT_NUMBER,
+    FLIGHT_IATA = s.FLIGHT_IATA,
+    FLIGHT_ICAO = s.FLIGHT_ICAO,
+    DEP_IATA = s.DEP_IATA,
+    ARR_IATA = s.ARR_IATA,
+    DEP_TERMINAL = s.DEP_TERMINAL,
+    DEP_GATE = s.DEP_GATE,
+    ARR_TERMINAL = s.ARR_TERMINAL,
+    ARR_GATE = s.ARR_GATE,
+    DEP_DELAY_MIN = s.DEP_DELAY_MIN,
+    ARR_DELAY_MIN = s.ARR_DELAY_MIN,
+    DEP_SCHEDULED_UTC = s.DEP_SCHEDULED_UTC,
+    DEP_ESTIMATED_UTC = s.DEP_ESTIMATED_UTC,
+    DEP_ACTUAL_UTC = s.DEP_ACTUAL_UTC,
+    ARR_SCHEDULED_UTC = s.ARR_SCHEDULED_UTC,
+    ARR_ESTIMATED_UTC = s.ARR_ESTIMATED_UTC,
+    ARR_ACTUAL_UTC = s.ARR_ACTUAL_UTC,
+    LAST_SEEN_AT = CURRENT_TIMESTAMP(),
+    SOURCE = s.SOURCE,
+    ROW_FINGERPRINT = s.ROW_FINGERPRINT
+WHEN NOT MATCHED THEN INSERT (
+    FLIGHT_NK, FLIGHT_DATE, FLIGHT_STATUS, AIRLINE_IATA, FLIGHT_NUMBER,
+    FLIGHT_IATA, FLIGHT_ICAO, DEP_IATA, ARR_IATA, DEP_TERMINAL, DEP_GATE,
+    ARR_TERMINAL, ARR_GATE, DEP_DELAY_MIN, ARR_DELAY_MIN,
+    DEP_SCHEDULED_UTC, DEP_ESTIMATED_UTC, DEP_ACTUAL_UTC,
+    ARR_SCHEDULED_UTC, ARR_ESTIMATED_UTC, ARR_ACTUAL_UTC,
+    LAST_SEEN_AT, SOURCE, ROW_FINGERPRINT
+) VALUES (
+    s.FLIGHT_NK, s.FLIGHT_DATE, s.FLIGHT_STATUS, s.AIRLINE_IATA, s.FLIGHT_NUMBER,
+    s.FLIGHT_IATA, s.FLIGHT_ICAO, s.DEP_IATA, s.ARR_IATA, s.DEP_TERMINAL, s.DEP_GATE,
+    s.ARR_TERMINAL, s.ARR_GATE, s.DEP_DELAY_MIN, s.ARR_DELAY_MIN,
+    s.DEP_SCHEDULED_UTC, s.DEP_ESTIMATED_UTC, s.DEP_ACTUAL_UTC,
+    s.ARR_SCHEDULED_UTC, s.ARR_ESTIMATED_UTC, s.ARR_ACTUAL_UTC,
+    CURRENT_TIMESTAMP(), s.SOURCE, s.ROW_FINGERPRINT
+);
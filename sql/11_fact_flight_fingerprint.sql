@@ -0,0 +1 @@
+ALTER TABLE FACT_FLIGHT ADD COLUMN IF NOT EXISTS ROW_FINGERPRINT STRING;
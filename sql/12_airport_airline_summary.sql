@@ -0,0 +1,10 @@
+CREATE TABLE IF NOT EXISTS AIRPORT_AIRLINE_SUMMARY (
+    AIRPORT_IATA STRING,
+    AIRLINE_IATA STRING,
+    DIRECTION STRING,
+    FIRST_SEEN_DATE DATE,
+    LAST_SEEN_DATE DATE,
+    FLIGHT_COUNT INTEGER,
+    UPDATED_AT TIMESTAMP_NTZ
+)
+CLUSTER BY (AIRPORT_IATA);
@@ -0,0 +1,41 @@
+MERGE INTO AIRPORT_AIRLINE_SUMMARY AS t
+USING (
+    WITH moved AS (
+        SELECT AIRLINE_IATA, DEP_IATA, ARR_IATA, FLIGHT_DATE
+        FROM FACT_FLIGHT
+        WHERE FLIGHT_NK IN ({keys})
+    )
+    SELECT
+        AIRPORT_IATA,
+        AIRLINE_IATA,
+        DIRECTION,
+        MIN(FLIGHT_DATE) AS FIRST_SEEN_DATE,
+        MAX(FLIGHT_DATE) AS LAST_SEEN_DATE,
+        COUNT(*) * %s AS DELTA
+    FROM (
+        SELECT
+            IFF(d.DIRECTION = 'dep', m.DEP_IATA, m.ARR_IATA) AS AIRPORT_IATA,
+            m.AIRLINE_IATA,
+            d.DIRECTION,
+            m.FLIGHT_DATE
+        FROM moved AS m
+        CROSS JOIN (VALUES ('dep'), ('arr')) AS d (DIRECTION)
+    )
+    WHERE AIRPORT_IATA IS NOT NULL AND AIRLINE_IATA IS NOT NULL
+    GROUP BY AIRPORT_IATA, AIRLINE_IATA, DIRECTION
+) AS s
+ON t.AIRPORT_IATA = s.AIRPORT_IATA
+    AND t.AIRLINE_IATA = s.AIRLINE_IATA
+    AND t.DIRECTION = s.DIRECTION
+WHEN MATCHED AND t.FLIGHT_COUNT + s.DELTA <= 0 THEN DELETE
+WHEN MATCHED THEN UPDATE SET
+    FIRST_SEEN_DATE = IFF(s.DELTA > 0, LEAST(t.FIRST_SEEN_DATE, s.FIRST_SEEN_DATE), t.FIRST_SEEN_DATE),
+    LAST_SEEN_DATE = IFF(s.DELTA > 0, GREATEST(t.LAST_SEEN_DATE, s.LAST_SEEN_DATE), t.LAST_SEEN_DATE),
+    FLIGHT_COUNT = t.FLIGHT_COUNT + s.DELTA,
+    UPDATED_AT = CURRENT_TIMESTAMP()
+WHEN NOT MATCHED AND s.DELTA > 0 THEN INSERT (
+    AIRPORT_IATA, AIRLINE_IATA, DIRECTION, FIRST_SEEN_DATE, LAST_SEEN_DATE, FLIGHT_COUNT, UPDATED_AT
+) VALUES (
+    s.AIRPORT_IATA, s.AIRLINE_IATA, s.DIRECTION, s.FIRST_SEEN_DATE, s.LAST_SEEN_DATE,
+    s.DELTA, CURRENT_TIMESTAMP()
+);
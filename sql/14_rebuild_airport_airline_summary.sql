@@ -0,0 +1,14 @@
+INSERT OVERWRITE INTO AIRPORT_AIRLINE_SUMMARY (
+    AIRPORT_IATA, AIRLINE_IATA, DIRECTION, FIRST_SEEN_DATE, LAST_SEEN_DATE, FLIGHT_COUNT, UPDATED_AT
+)
+SELECT AIRPORT_IATA, AIRLINE_IATA, DIRECTION, MIN(FLIGHT_DATE), MAX(FLIGHT_DATE), COUNT(*),
+    CURRENT_TIMESTAMP()
+FROM (
+    SELECT DEP_IATA AS AIRPORT_IATA, AIRLINE_IATA, 'dep' AS DIRECTION, FLIGHT_DATE
+    FROM FACT_FLIGHT
+    UNION ALL
+    SELECT ARR_IATA, AIRLINE_IATA, 'arr', FLIGHT_DATE
+    FROM FACT_FLIGHT
+)
+WHERE AIRPORT_IATA IS NOT NULL AND AIRLINE_IATA IS NOT NULL
+GROUP BY AIRPORT_IATA, AIRLINE_IATA, DIRECTION;
@@ -0,0 +1 @@
+ALTER TABLE FACT_FLIGHT CLUSTER BY (FLIGHT_DATE, DEP_IATA);
@@ -0,0 +1 @@
+ALTER TABLE FACT_FLIGHT ADD SEARCH OPTIMIZATION ON EQUALITY(FLIGHT_NK, ARR_IATA, FLIGHT_STATUS);
@@ -0,0 +1,92 @@
+import json
+import sys
+import threading
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app import http_client
+from app.db import snowflake
+from benchmarks.fakes import FakeConnection
+
+
+class FakeUpstream:
+    """Local HTTP server that replays queued (status, headers, json) responses."""
+
+    def __init__(self) -> None:
+        self.responses: list[tuple[int, dict, object]] = []
+        self.requests: list[dict] = []
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                url = urlsplit(self.path)
+                upstream.requests.append(
+                    {
+                        "method": self.command,
+                        "path": url.path,
+                        "query": {k: v[0] for k, v in parse_qs(url.query).items()},
+                        "body": body,
+                        "port": self.client_address[1],
+                    }
+                )
+                status, headers, payload = upstream.responses.pop(0)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _reply
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def ports(self) -> set[int]:
+        return {r["port"] for r in self.requests}
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_upstream():
+    http_client.reset()
+    upstream = FakeUpstream()
+    yield upstream
+    upstream.close()
+    http_client.reset()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """One recording FakeConnection behind every get_connection() in the app.
+
+    Statements land in `fake_db.cur.calls`; set `fake_db.cur.rows` for what
+    fetchall() returns.
+    """
+    conn = FakeConnection()
+    original = snowflake.get_connection
+
+    def get_connection():
+        return nullcontext(conn)
+
+    # Services import get_connection by name, so patch every module holding it
+    for name, module in list(sys.modules.items()):
+        if name.split(".")[0] == "app" and getattr(module, "get_connection", None) is original:
+            monkeypatch.setattr(module, "get_connection", get_connection)
+    return conn
@@ -0,0 +1,66 @@
+import json
+from datetime import date, datetime
+
+from app.services import ai_context
+
+VOCABULARY = {
+    "airports": {"ORD": "o'hare", "JFK": "john f kennedy", "LAX": None},
+    "airlines": {"AA": "american", "UA": "united", "AT": "royal maroc"},
+}
+TODAY = date(2024, 5, 10)
+
+
+def test_extracts_route_flights_and_dates():
+    entities = ai_context.extract_entities(
+        "Was AA100 from ORD to JFK late on 2024-05-03, and where is United at 10 am?",
+        VOCABULARY,
+        TODAY,
+    )
+    assert entities["route"] == ("ORD", "JFK")
+    assert entities["flights"] == ["AA100"]
+    assert entities["airlines"] == ["UA"]
+    assert (entities["date_from"], entities["date_to"]) == (date(2024, 5, 3), date(2024, 5, 3))
+
+
+def test_last_n_days_never_ends_before_it_starts():
+    for question, start in (("ORD in the last 3 days", 8), ("ORD in the past 0 days", 10)):
+        entities = ai_context.extract_entities(question, VOCABULARY, TODAY)
+        assert (entities["date_from"], entities["date_to"]) == (date(2024, 5, start), TODAY)
+
+
+def test_filters_default_to_lookback_and_match_either_side():
+    entities = ai_context.extract_entities("Any cancellations at O'Hare?", VOCABULARY, TODAY)
+    conditions, params, applied = ai_context.context_filters(entities, TODAY, 7)
+    assert conditions == [
+        "FLIGHT_DATE >= %s",
+        "FLIGHT_STATUS = %s",
+        "(DEP_IATA IN (%s) OR ARR_IATA IN (%s))",
+    ]
+    assert params == ["2024-05-04", "cancelled", "ORD", "ORD"]
+    assert applied == {"airport": "ORD", "status": "cancelled", "dates": "2024-05-04.."}
+
+
+def test_context_is_compact_and_within_budget(monkeypatch):
+    n = 500
+    detail = {
+        "flight_iata": [f"AA{i}" for i in range(n)],
+        "flight_date": [date(2024, 5, 1)] * n,
+        "dep_iata": ["ORD"] * n,
+        "dep_gate": [None] * n,
+        "dep_scheduled_utc": [datetime(2024, 5, 1, 6, i % 60) for i in range(n)],
+        "dep_delay_min": [i % 40 for i in range(n)],
+    }
+    summary = {"group": ["all"], "key": [None], "flights": [n]}
+    results = iter([summary, detail])
+    monkeypatch.setattr(ai_context, "fetch_columns", lambda *a, **kw: next(results))
+    monkeypatch.setattr(ai_context, "_vocabulary", lambda: VOCABULARY)
+    monkeypatch.setattr(ai_context.get_settings(), "ai_context_max_tokens", 1000)
+
+    context = ai_context.build_context("How late were ORD departures?", today=TODAY)
+
+    assert context["tokens"] <= 1000
+    assert "dep_gate" not in context["text"]
+    assert "500 matching" in context["text"] and "more rows not shown" in context["text"]
+    shown = context["rows"] - 1
+    rows = [dict(zip(detail, values)) for values in zip(*detail.values())][:shown]
+    assert len(context["text"]) * 3 < len(json.dumps(rows, default=str))
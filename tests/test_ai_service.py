@@ -0,0 +1,99 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import data_version
+from app.services import ai_service
+
+
+def _answer(text):
+    return 200, {}, {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+@pytest.fixture
+def gemini(monkeypatch, fake_upstream):
+    settings = ai_service.get_settings()
+    monkeypatch.setattr(settings, "gemini_base_url", fake_upstream.url)
+    monkeypatch.setattr(settings, "gemini_api_key", "test-key")
+    monkeypatch.setattr(settings, "gemini_backoff_base_seconds", 0)
+    monkeypatch.setattr(
+        ai_service,
+        "build_context",
+        lambda question, today: {"text": "flight_iata\nAA1", "filters": {}, "rows": 1, "tokens": 4},
+    )
+    ai_service._answers.clear()
+    yield fake_upstream
+    ai_service._answers.clear()
+
+
+def test_retries_rate_limit_then_serves_repeats_from_cache(gemini):
+    gemini.responses = [(429, {"Retry-After": "0"}, {}), (503, {}, {}), _answer("Two delays.")]
+
+    assert ai_service.ask_ai("How many delays at ORD?") == (
+        "Two delays.",
+        "gemini-1.5-flash",
+        False,
+    )
+    assert ai_service.ask_ai("  how many delays at ORD ") == (
+        "Two delays.",
+        "gemini-1.5-flash",
+        True,
+    )
+
+    assert len(gemini.requests) == 3
+    first = gemini.requests[0]
+    assert first["path"] == "/v1beta/models/gemini-1.5-flash:generateContent"
+    assert first["query"] == {"key": "test-key"}
+    assert "How many delays at ORD?" in json.loads(first["body"])["contents"][0]["parts"][0]["text"]
+    # Every attempt went over the same kept-alive connection
+    assert len(gemini.ports()) == 1
+
+
+def test_new_data_invalidates_cached_answers(gemini):
+    gemini.responses = [_answer("Old."), _answer("New.")]
+    assert ai_service.ask_ai("Status of AA100?")[0] == "Old."
+    data_version.bump("flights")
+    assert ai_service.ask_ai("Status of AA100?") == ("New.", "gemini-1.5-flash", False)
+
+
+def test_gives_up_when_quota_resets_too_late(gemini):
+    gemini.responses = [(429, {"Retry-After": "3600"}, {})]
+    with pytest.raises(RuntimeError):
+        ai_service.ask_ai("Any cancellations?")
+    assert len(gemini.requests) == 1
+
+
+def test_identical_concurrent_questions_share_one_call(gemini, monkeypatch):
+    gemini.responses = [_answer("Once.")]
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_context(question, today):
+        entered.set()
+        release.wait(5)
+        return {"text": "", "filters": {}, "rows": 0, "tokens": 0}
+
+    monkeypatch.setattr(ai_service, "build_context", slow_context)
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(ai_service.ask_ai, "Any delays?")
+        assert entered.wait(5)
+        followers = [pool.submit(ai_service.ask_ai, "any delays") for _ in range(3)]
+        release.set()
+        assert leader.result() == ("Once.", "gemini-1.5-flash", False)
+        assert [f.result()[:2] for f in followers] == [("Once.", "gemini-1.5-flash")] * 3
+    assert len(gemini.requests) == 1
+
+
+def test_unparseable_answer_is_not_cached(gemini):
+    gemini.responses = [(200, {}, {"candidates": []}), _answer("Fine.")]
+    answer, _, cached = ai_service.ask_ai("Any diversions?")
+    assert answer.startswith("Sorry") and not cached
+    assert ai_service.ask_ai("Any diversions?") == ("Fine.", "gemini-1.5-flash", False)
+
+
+def test_touch_only_ingest_keeps_cached_answers(gemini):
+    gemini.responses = [_answer("Same.")]
+    ai_service.ask_ai("Delays today?")
+    data_version.bump("flights_seen")
+    assert ai_service.ask_ai("Delays today?") == ("Same.", "gemini-1.5-flash", True)
@@ -0,0 +1,22 @@
+from app.auth import jwt as jwt_module
+from app.auth.jwt import create_access_token, get_subject_from_token
+
+
+def test_verified_tokens_are_cached(monkeypatch):
+    token = create_access_token("cached@example.com")
+    calls = []
+    original = jwt_module.decode_token
+
+    def counting_decode(value):
+        calls.append(value)
+        return original(value)
+
+    monkeypatch.setattr(jwt_module, "decode_token", counting_decode)
+    assert get_subject_from_token(token) == "cached@example.com"
+    assert get_subject_from_token(token) == "cached@example.com"
+    assert len(calls) == 1
+
+
+def test_invalid_tokens_are_not_cached():
+    assert get_subject_from_token("not-a-jwt") is None
+    assert get_subject_from_token("not-a-jwt") is None
@@ -0,0 +1,12 @@
+import json
+
+from benchmarks import suite
+from benchmarks.fakes import aviationstack_payload
+
+
+def test_statement_counts_stay_within_thresholds():
+    metrics = suite.bench_ingest(aviationstack_payload(500), repeat=1)
+    metrics.update(suite.bench_bulk(500, repeat=1))
+    thresholds = json.loads(suite.THRESHOLDS_PATH.read_text())
+    statement_limits = {name: v for name, v in thresholds.items() if "statements" in name}
+    assert suite.check(metrics, statement_limits) == []
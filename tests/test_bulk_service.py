@@ -0,0 +1,136 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app import data_version
+from app.api.routers import airports
+from app.auth.deps import get_current_user
+from app.main import app
+from app.models.bulk import MAX_OPERATIONS, AirportBulkRequest, FlightBulkOp
+from app.services import bulk_service
+
+
+@pytest.fixture
+def cursor(fake_db):
+    fake_db.cur.rows = [("AA1:2024-05-01",), ("AA2:2024-05-01",), ("AA3:2024-05-01",)]
+    return fake_db.cur
+
+
+def flight_ops(raw):
+    return TypeAdapter(list[FlightBulkOp]).validate_python(raw)
+
+
+def test_mixed_batch_runs_one_statement_per_kind(cursor):
+    new = {
+        "flight_nk": "AA9:2024-05-01",
+        "flight_date": "2024-05-01",
+        "dep_iata": "ORD",
+        "arr_iata": "JFK",
+    }
+    operations = flight_ops(
+        [
+            {"op": "create", "data": new},
+            {"op": "create", "data": {**new, "flight_nk": "AA1:2024-05-01"}},
+            {"op": "update", "key": "AA1:2024-05-01", "data": {"dep_gate": "K1"}},
+            {"op": "update", "key": "AA2:2024-05-01", "data": {"dep_gate": "K2"}},
+            {"op": "update", "key": "AA2:2024-05-01", "data": {"dep_gate": "K3"}},
+            {"op": "update", "key": "AA8:2024-05-01", "data": {"dep_gate": "K4"}},
+            {"op": "delete", "key": "AA3:2024-05-01"},
+        ]
+    )
+    before = data_version.current("flights")
+
+    result = bulk_service.bulk_flights(operations)
+
+    assert [item["status"] for item in result["items"]] == [
+        "created",
+        "conflict",
+        "updated",
+        "updated",
+        "duplicate",
+        "not_found",
+        "deleted",
+    ]
+    counts = {name: result[name] for name in ("created", "updated", "deleted", "failed")}
+    assert counts == {"created": 1, "updated": 2, "deleted": 1, "failed": 3}
+    assert cursor.verbs() == [
+        "BEGIN",
+        "SELECT",
+        "MERGE",
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+        "MERGE",
+        "COMMIT",
+    ]
+    # Only the create and delete can move airline summary counts, the gate edits can't
+    moved = ["AA9:2024-05-01", "AA3:2024-05-01"]
+    assert cursor.calls[2].params == [*moved, -1]
+    assert cursor.calls[6].params == [*moved, 1]
+    update = cursor.calls[4]
+    assert "DEP_GATE = s.DEP_GATE" in update.sql and "ROW_FINGERPRINT = NULL" in update.sql
+    assert update.params == ["AA1:2024-05-01", "K1", "AA2:2024-05-01", "K2"]
+    assert data_version.current("flights") != before
+
+
+def test_airline_change_moves_summary_counts(cursor):
+    operations = flight_ops(
+        [
+            {"op": "update", "key": "AA1:2024-05-01", "data": {"airline_iata": "UA"}},
+            {"op": "update", "key": "AA2:2024-05-01", "data": {"dep_gate": "K2"}},
+        ]
+    )
+
+    bulk_service.bulk_flights(operations)
+
+    merges = [c.params for c in cursor.calls if c.verb == "MERGE"]
+    assert merges == [
+        ["AA1:2024-05-01", -1],
+        ["AA1:2024-05-01", 1],
+    ]
+
+
+def test_batch_size_is_bounded(cursor, monkeypatch):
+    monkeypatch.setattr(bulk_service.get_settings(), "bulk_max_operations", 2)
+    payload = AirportBulkRequest(
+        operations=[{"op": "delete", "key": iata} for iata in ("ORD", "JFK", "LAX")]
+    )
+    with pytest.raises(bulk_service.BulkLimitError):
+        bulk_service.bulk_airports(payload.operations)
+    assert cursor.calls == []
+
+
+def test_router_rejects_oversized_batches_and_keeps_other_errors(monkeypatch):
+    calls = []
+
+    def fake_bulk(operations):
+        calls.append(operations)
+        raise ValueError("bad row")
+
+    monkeypatch.setattr(airports, "bulk_airports", fake_bulk)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "ops@example.com"}
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        too_many = [{"op": "delete", "key": "ORD"}] * (MAX_OPERATIONS + 1)
+        oversized = client.post("/airports/bulk", json={"operations": too_many})
+        failed = client.post("/airports/bulk", json={"operations": too_many[:1]})
+    finally:
+        app.dependency_overrides.clear()
+    assert oversized.status_code == 422
+    assert len(calls) == 1
+    # Only the operation cap maps to 413; other service errors are not disguised as it
+    assert failed.status_code == 500
+
+
+def test_failed_statement_rolls_back(cursor, monkeypatch):
+    record = cursor.execute
+
+    def failing_execute(sql, params=None):
+        record(sql, params)
+        if sql.startswith("DELETE"):
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(cursor, "execute", failing_execute)
+    with pytest.raises(RuntimeError):
+        bulk_service.bulk_flights(flight_ops([{"op": "delete", "key": "AA1:2024-05-01"}]))
+    assert cursor.verbs()[-1] == "ROLLBACK"
@@ -0,0 +1,44 @@
+import time
+
+from app.cache import TTLCache
+
+
+def test_lru_eviction_and_counters():
+    cache = TTLCache("test_lru", max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+
+
+def test_entries_expire():
+    cache = TTLCache("test_ttl", max_entries=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a", "gone") == "gone"
+
+
+def test_get_or_load_caches_none_and_honours_invalidation():
+    cache = TTLCache("test_load", max_entries=10, ttl_seconds=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_load("missing", loader) is None
+    assert cache.get_or_load("missing", loader) is None
+    assert len(calls) == 1
+
+    def racing_loader():
+        cache.clear()
+        return "stale"
+
+    assert cache.get_or_load("key", racing_loader) == "stale"
+    assert cache.get("key") is None
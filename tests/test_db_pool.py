@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from app.db.snowflake import ConnectionPool, PoolTimeoutError
+from benchmarks.fakes import FakeConnection
+
+
+def make_pool(**overrides):
+    opened = []
+
+    def connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    options = dict(
+        max_size=2,
+        timeout=0.2,
+        max_idle_seconds=60,
+        max_lifetime_seconds=60,
+        health_check_seconds=60,
+    )
+    options.update(overrides)
+    return ConnectionPool(connect, **options), opened
+
+
+def test_connections_are_reused():
+    pool, opened = make_pool()
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    pool.release(second)
+    assert first is second
+    assert len(opened) == 1
+    assert pool.stats()["created"] == 1
+
+
+def test_acquire_times_out_when_exhausted():
+    pool, _ = make_pool(max_size=1)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    pool.release(held)
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiter_gets_released_connection():
+    pool, opened = make_pool(max_size=1, timeout=2)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    while pool.stats()["waiting"] == 0:
+        time.sleep(0.01)
+    pool.release(held)
+    waiter.join()
+    assert got == [held]
+    assert len(opened) == 1
+
+
+def test_expired_and_broken_connections_are_replaced():
+    pool, opened = make_pool(max_lifetime_seconds=0)
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    assert second is not first
+    assert opened[0].closed
+
+    pool, opened = make_pool(health_check_seconds=0)
+    first = pool.acquire()
+    pool.release(first)
+    opened[0].broken = True
+    second = pool.acquire()
+    assert second is not first
+    assert pool.stats()["closed"] == 1
+
+
+def test_warm_opens_idle_connections():
+    pool, opened = make_pool(max_size=3)
+    assert pool.warm(5) == 3
+    stats = pool.stats()
+    assert stats["idle"] == 3
+    assert stats["in_use"] == 0
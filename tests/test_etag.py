@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app import data_version
+from app.api.routers import airports
+from app.auth.deps import get_current_user
+from app.main import app
+
+
+def test_unchanged_airport_list_returns_304_without_querying(monkeypatch):
+    calls = []
+
+    def fake_list(limit, offset, cursor, include_total):
+        calls.append(limit)
+        return {"airport_iata": ["ORD"], "airport_name": ["O'Hare"]}, 1, None
+
+    monkeypatch.setattr(airports, "list_airports", fake_list)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "ops@example.com"}
+    try:
+        client = TestClient(app)
+        first = client.get("/airports?limit=10")
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+
+        again = client.get("/airports?limit=10", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+        assert len(calls) == 1
+
+        other_page = client.get("/airports?limit=20", headers={"If-None-Match": etag})
+        assert other_page.status_code == 200
+
+        data_version.bump("airports")
+        changed = client.get("/airports?limit=10", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+    finally:
+        app.dependency_overrides.clear()
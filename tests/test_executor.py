@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routers import ai, ingest
+from app.auth.deps import get_current_user
+from app.db.executor import BoundedExecutor, ExecutorSaturatedError
+from app.main import app
+
+
+def test_blocking_calls_run_concurrently_off_the_loop():
+    executor = BoundedExecutor(max_workers=2, max_queue=10)
+    barrier = threading.Barrier(2, timeout=2)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        results = await asyncio.gather(
+            executor.run(lambda: (barrier.wait(), threading.get_ident())[1]),
+            executor.run(lambda: (barrier.wait(), threading.get_ident())[1]),
+        )
+        assert loop_thread not in results
+
+    asyncio.run(main())
+    stats = executor.stats()
+    assert stats["completed"] == 2
+    assert stats["queued"] == 0
+    executor.shutdown()
+
+
+def test_queue_is_bounded():
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(lambda: None))
+        await asyncio.sleep(0)
+        assert executor.stats()["queued"] == 1
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: None)
+        release.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(main())
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.parametrize(
+    "path, router", [("/ai/ask", ai), ("/ingest/flights?dep_iata=ORD", ingest)]
+)
+def test_routes_report_saturation_as_503(monkeypatch, path, router):
+    async def saturated(*args, **kwargs):
+        raise ExecutorSaturatedError("Database executor queue is full")
+
+    monkeypatch.setattr(router, "run_blocking", saturated)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "ops@example.com"}
+    try:
+        resp = TestClient(app).post(path, json={"question": "Any delays?"})
+    finally:
+        app.dependency_overrides.clear()
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
@@ -0,0 +1,55 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.deps import get_current_user
+from app.main import app
+from app.services import export_service
+
+COLUMNS = [name.lower() for name, _ in export_service.EXPORT_COLUMNS]
+
+
+def fake_batches(sql, params, batch_size):
+    row = ["AA100:2024-05-01", date(2024, 5, 1)] + [None] * (len(COLUMNS) - 2)
+    yield COLUMNS, [tuple(row)]
+    yield COLUMNS, [tuple(row)]
+
+
+def test_ndjson_export_is_gzipped_per_line(monkeypatch):
+    monkeypatch.setattr(export_service, "stream_batches", fake_batches)
+    body = b"".join(export_service.export_flights("ndjson", dep_iata="ORD", gzip=True))
+    lines = gzip.decompress(body).decode().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["flight_date"] == "2024-05-01"
+
+
+def test_csv_export_has_single_header(monkeypatch):
+    monkeypatch.setattr(export_service, "stream_batches", fake_batches)
+    body = b"".join(export_service.export_flights("csv")).decode()
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0] == COLUMNS
+    assert len(rows) == 3
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, gzipped",
+    [("gzip", True), ("deflate, GZIP;q=0.5", True), ("gzip;q=0", False), ("x-gzip", False)],
+)
+def test_export_honours_accept_encoding_q_values(monkeypatch, accept_encoding, gzipped):
+    monkeypatch.setattr(export_service, "stream_batches", fake_batches)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "ops@example.com"}
+    try:
+        resp = TestClient(app).get(
+            "/flights/export",
+            headers={"Accept": "application/x-ndjson", "Accept-Encoding": accept_encoding},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert resp.status_code == 200
+    assert (resp.headers.get("content-encoding") == "gzip") is gzipped
+    assert len(resp.text.splitlines()) == 2
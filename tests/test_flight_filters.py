@@ -0,0 +1,23 @@
+from app.services.flight_service import flight_filters
+
+
+def test_single_values_use_equality_and_lists_use_in():
+    conditions, params = flight_filters(
+        dep_iata=["ORD"],
+        arr_iata="JFK,LGA, JFK",
+        status=["landed", "cancelled"],
+        date_from="2024-05-01",
+        date_to="2024-05-07",
+    )
+    assert conditions == [
+        "DEP_IATA = %s",
+        "ARR_IATA IN (%s, %s)",
+        "FLIGHT_DATE >= %s",
+        "FLIGHT_DATE <= %s",
+        "FLIGHT_STATUS IN (%s, %s)",
+    ]
+    assert params == ["ORD", "JFK", "LGA", "2024-05-01", "2024-05-07", "landed", "cancelled"]
+
+
+def test_empty_filters_add_nothing():
+    assert flight_filters(dep_iata=[], arr_iata=" , ", status=None) == ([], [])
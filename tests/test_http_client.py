@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import http_client
+from app.api.routers import ingest
+from app.auth.deps import get_current_user
+from app.main import app
+from app.services import ingest_service
+
+
+def test_token_bucket_allows_burst_then_paces_callers():
+    bucket = http_client.TokenBucket(rate=50, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    started = time.monotonic()
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: bucket.acquire(), range(4)))
+    # Four more calls at 50/s queue for about 80ms instead of failing
+    assert 0.06 <= time.monotonic() - started < 0.5
+    with pytest.raises(http_client.RateLimitTimeout):
+        bucket.acquire(max_wait=0.01)
+
+
+def test_aviationstack_calls_share_a_connection_and_respect_the_limit(monkeypatch, fake_upstream):
+    settings = ingest_service.get_settings()
+    monkeypatch.setattr(settings, "aviationstack_base_url", fake_upstream.url)
+    monkeypatch.setattr(settings, "aviationstack_access_key", "key")
+    monkeypatch.setattr(settings, "aviationstack_rate_per_second", 20)
+    monkeypatch.setattr(settings, "aviationstack_burst", 1)
+    fake_upstream.responses = [(200, {}, {"data": [{"flight_date": "2024-05-01"}]})] * 3
+
+    started = time.monotonic()
+    for _ in range(3):
+        assert ingest_service.fetch_aviationstack_flights("ORD", None, 10) == [
+            {"flight_date": "2024-05-01"}
+        ]
+
+    assert time.monotonic() - started >= 0.09
+    assert fake_upstream.requests[0]["path"] == "/v1/flights"
+    assert fake_upstream.requests[0]["query"] == {
+        "access_key": "key",
+        "limit": "10",
+        "dep_iata": "ORD",
+    }
+    assert len(fake_upstream.ports()) == 1
+
+
+def test_request_path_calls_fail_fast_when_the_limit_is_exhausted(monkeypatch, fake_upstream):
+    settings = ingest_service.get_settings()
+    monkeypatch.setattr(settings, "aviationstack_base_url", fake_upstream.url)
+    monkeypatch.setattr(settings, "aviationstack_access_key", "key")
+    monkeypatch.setattr(settings, "aviationstack_rate_per_second", 0.5)
+    monkeypatch.setattr(settings, "aviationstack_burst", 1)
+    monkeypatch.setattr(settings, "http_rate_limit_request_wait_seconds", 0.05)
+    fake_upstream.responses = [(200, {}, {"data": []})] * 2
+
+    ingest_service.fetch_aviationstack_flights("ORD", None, 10)
+    started = time.monotonic()
+    with pytest.raises(http_client.RateLimitTimeout) as exc_info:
+        ingest_service.fetch_aviationstack_flights("ORD", None, 10)
+
+    assert time.monotonic() - started < 0.05
+    assert exc_info.value.wait > 1
+    assert len(fake_upstream.requests) == 1
+
+
+def test_rate_limited_ingest_returns_429_with_retry_after(monkeypatch):
+    def limited(*args, **kwargs):
+        raise http_client.RateLimitTimeout(3.2, 2)
+
+    monkeypatch.setattr(ingest, "ingest_flights", limited)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "ops@example.com"}
+    try:
+        resp = TestClient(app).post("/ingest/flights?dep_iata=ORD")
+    finally:
+        app.dependency_overrides.clear()
+    assert resp.status_code == 429
+    assert resp.headers["retry-after"] == "4"
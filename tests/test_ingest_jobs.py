@@ -0,0 +1,100 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api.routers import ingest
+from app.auth.deps import get_current_user
+from app.main import app
+from app.services import ingest_jobs
+from app.services.ingest_jobs import IngestJobQueue
+
+
+def wait_for(queue, job_id, state, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["state"] == state:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} never reached {state}: {job}")
+
+
+def fake_run(kind, params, progress):
+    progress("writing", 0.5)
+    return {
+        "ingest_id": "x",
+        "raw_inserted": 1,
+        "airports_upserted": 0,
+        "airlines_upserted": 0,
+        "flights_updated": 1,
+    }
+
+
+def test_pending_jobs_are_deduplicated_and_survive_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_jobs, "_run_job", fake_run)
+    db_path = str(tmp_path / "jobs.sqlite3")
+    params = {"limit": 10, "mode": None, "dep_iata": "ORD", "arr_iata": None}
+
+    first = IngestJobQueue(db_path, workers=1)
+    job, deduped = first.submit("flights", params)
+    again, deduped_again = first.submit("flights", params, priority=5)
+    assert not deduped and deduped_again
+    assert again["id"] == job["id"]
+    # The more urgent resubmit promotes the queued job; a lower one leaves it alone
+    assert again["priority"] == 5
+    assert first.submit("flights", params, priority=1)[0]["priority"] == 5
+    assert first.get(job["id"])["priority"] == 5
+
+    # A fresh queue on the same store picks the job up as if after a restart
+    restarted = IngestJobQueue(db_path, workers=1)
+    assert restarted.start() == 1
+    done = wait_for(restarted, job["id"], "succeeded")
+    restarted.stop()
+    assert done["progress"] == 1.0
+    assert done["result"]["flights_updated"] == 1
+    assert done["duration_seconds"] is not None
+
+
+def test_only_stale_running_jobs_are_requeued(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_jobs, "_run_job", fake_run)
+    db_path = str(tmp_path / "jobs.sqlite3")
+    other = IngestJobQueue(db_path, workers=1, stale_seconds=60)
+    live, _ = other.submit("flights", {"limit": 10, "dep_iata": "ORD"})
+    dead, _ = other.submit("flights", {"limit": 10, "dep_iata": "ATL"})
+    assert other._claim(live["id"]) and other._claim(dead["id"])
+    # The ATL job's process died long ago; the ORD job's owner is still heartbeating
+    other._update(dead["id"], heartbeat_at=ingest_jobs._now(-3600))
+
+    restarted = IngestJobQueue(db_path, workers=1, stale_seconds=60)
+    assert restarted.start() == 1
+    wait_for(restarted, dead["id"], "succeeded")
+    restarted.stop()
+    assert restarted.get(live["id"])["state"] == "running"
+
+
+def test_failed_jobs_record_error(tmp_path, monkeypatch):
+    def boom(kind, params, progress):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(ingest_jobs, "_run_job", boom)
+    queue = IngestJobQueue(str(tmp_path / "jobs.sqlite3"), workers=1)
+    queue.start()
+    job, _ = queue.submit("flights", {"limit": 10, "dep_iata": "ORD"})
+    failed = wait_for(queue, job["id"], "failed")
+    queue.stop()
+    assert failed["error"] == "upstream down"
+
+
+def test_submit_normalizes_codes_and_default_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_jobs, "_run_job", fake_run)
+    queue = IngestJobQueue(str(tmp_path / "jobs.sqlite3"), workers=1)
+    monkeypatch.setattr(ingest, "get_job_queue", lambda: queue)
+    monkeypatch.setattr(ingest.get_settings(), "ingest_mode", "bulk")
+    app.dependency_overrides[get_current_user] = lambda: {"email": "ops@example.com"}
+    try:
+        client = TestClient(app)
+        first = client.post("/ingest/jobs", json={"dep_iata": "ord"}).json()
+        again = client.post("/ingest/jobs", json={"dep_iata": "ORD", "mode": "bulk"}).json()
+    finally:
+        app.dependency_overrides.clear()
+    assert again["deduplicated"] and again["id"] == first["id"]
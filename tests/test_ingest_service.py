@@ -0,0 +1,160 @@
+from datetime import date
+
+import pytest
+
+from app.services import ingest_service
+
+
+def make_record(flight_iata, dep="ORD", arr="JFK", airline="AA", flight_date="2024-05-01"):
+    return {
+        "flight_date": flight_date,
+        "flight_status": "scheduled",
+        "departure": {"iata": dep, "airport": "Origin", "scheduled": "2024-05-01T10:00:00+00:00"},
+        "arrival": {"iata": arr, "airport": "Destination", "delay": 5},
+        "airline": {"iata": airline, "name": "Airline"},
+        "flight": {"iata": flight_iata, "number": flight_iata[2:]},
+    }
+
+
+@pytest.fixture
+def ingest(monkeypatch, fake_db):
+    data = [make_record("AA100"), make_record("AA101", dep="LAX"), make_record("AA100")]
+    data.append({"flight": {}, "departure": {}, "arrival": {}, "airline": {}})
+    monkeypatch.setattr(ingest_service, "fetch_aviationstack_flights", lambda *a: data)
+    ingest_service.forget_flight_fingerprint()
+    ingest_service.forget_dimension_rows()
+    yield fake_db
+    ingest_service.forget_flight_fingerprint()
+    ingest_service.forget_dimension_rows()
+
+
+def test_bulk_and_per_record_report_same_counts(ingest):
+    bulk = ingest_service.ingest_flights("ORD", None, 50, mode="bulk")
+    bulk_calls = list(ingest.cur.calls)
+    ingest.cur.calls.clear()
+    ingest_service.forget_flight_fingerprint()
+    ingest_service.forget_dimension_rows()
+    per_record = ingest_service.ingest_flights("ORD", None, 50, mode="per_record")
+
+    for key in ("raw_inserted", "airports_upserted", "airlines_upserted", "flights_updated"):
+        assert bulk[key] == per_record[key]
+    assert bulk["raw_inserted"] == 4
+    assert bulk["flights_updated"] == 3
+    assert bulk["airports_upserted"] == 3
+
+    staged_flights = [c.params for c in bulk_calls if c.many][1]
+    assert [row[0] for row in staged_flights] == ["AA100:2024-05-01", "AA101:2024-05-01"]
+    # Summary counted out, flights, airports and airlines, summary counted back in
+    merges = [c.params for c in bulk_calls if c.verb == "MERGE"]
+    assert len(merges) == 1 + 3 + 1
+    assert ingest.cur.verbs().count("MERGE") == 1 + 3 + 3 + 1 + 1
+    keys = ["AA100:2024-05-01", "AA101:2024-05-01"]
+    assert merges[0] == [*keys, -1]
+    assert merges[-1] == [*keys, 1]
+
+
+def test_unknown_mode_is_rejected(ingest):
+    with pytest.raises(ValueError):
+        ingest_service.ingest_flights("ORD", None, 50, mode="fast")
+
+
+def test_batch_ingest_dedupes_overlapping_airports(ingest, monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "aviationstack_access_key", "test-key")
+    pages = {
+        ("ORD", None): [make_record("AA100"), make_record("AA101")],
+        (None, "JFK"): [make_record("AA100"), make_record("AA200", dep="BOS")],
+        (None, "ORD"): [],
+    }
+    monkeypatch.setattr(
+        ingest_service,
+        "fetch_aviationstack_flights",
+        lambda dep, arr, limit, max_wait: pages[(dep, arr)],
+    )
+
+    result = ingest_service.ingest_airports([("ORD", "both"), ("JFK", "arr")], 50, 4)
+
+    assert [(t["iata"], t["direction"], t["fetched"]) for t in result["targets"]] == [
+        ("ORD", "dep", 2),
+        ("ORD", "arr", 0),
+        ("JFK", "arr", 2),
+    ]
+    assert result["duplicates_skipped"] == 1
+    assert result["flights_updated"] == 3
+    assert ingest.cur.verbs().count("BEGIN") == 1
+
+
+def test_unchanged_flights_are_only_touched(ingest, monkeypatch):
+    first = ingest_service.flatten_records([make_record("AA100"), make_record("AA101")])
+    stored = {row[0]: row[-1] for row in first["flight_rows"]}
+    # AA100 is already in the warehouse with the same content; AA101 is new
+    ingest.cur.rows = [
+        ("AA100:2024-05-01", stored["AA100:2024-05-01"], "2024-05-01", "AA", "ORD", "JFK")
+    ]
+
+    result = ingest_service.ingest_flights("ORD", None, 50, mode="bulk")
+
+    assert result["flights_changed"] == 1
+    assert result["flights_unchanged"] == 1
+    touch = next(c for c in ingest.cur.calls if c.verb == "UPDATE")
+    assert touch.params == ["AA100:2024-05-01"]
+    staged_flights = [c.params for c in ingest.cur.calls if c.many][1]
+    assert [row[0] for row in staged_flights] == ["AA101:2024-05-01"]
+    # Raw JSON for the unchanged flight is not re-inserted; the keyless record still is
+    assert result["raw_inserted"] == 2
+
+    # The next poll answers from the local cache without querying the warehouse
+    ingest.cur.calls.clear()
+    again = ingest_service.ingest_flights("ORD", None, 50, mode="bulk")
+    assert again["flights_changed"] == 0
+    assert "SELECT" not in ingest.cur.verbs()
+    assert not any(c.verb == "MERGE" and "FACT_FLIGHT" in c.sql for c in ingest.cur.calls)
+
+
+def test_summary_only_moves_flights_whose_airline_or_airports_changed(ingest):
+    ingest.cur.rows = [
+        # AA100 changed status only; AA101 used to depart from ORD
+        ("AA100:2024-05-01", "old", date(2024, 5, 1), "AA", "ORD", "JFK"),
+        ("AA101:2024-05-01", "old", date(2024, 5, 1), "AA", "ORD", "JFK"),
+    ]
+
+    result = ingest_service.ingest_flights("ORD", None, 50, mode="bulk")
+
+    assert result["flights_changed"] == 2
+    merges = [c.params for c in ingest.cur.calls if c.verb == "MERGE"]
+    assert merges[0] == ["AA101:2024-05-01", -1]
+    assert merges[-1] == ["AA101:2024-05-01", 1]
+
+
+def test_unchanged_dimensions_keep_caches(ingest, monkeypatch):
+    from app import data_version
+
+    first = ingest_service.flatten_records([make_record("AA100"), make_record("AA101", dep="LAX")])
+    # ORD is stored exactly as Aviationstack reports it; JFK has a new name, LAX is unknown
+    stored = {
+        "DIM_AIRPORT": [first["airports"]["ORD"], ("JFK", "Old name", None, None)],
+        "DIM_AIRLINE": list(first["airlines"].values()),
+    }
+    monkeypatch.setattr(
+        ingest.cur,
+        "fetchall",
+        lambda: next(
+            (rows for t, rows in stored.items() if f"FROM {t} " in ingest.cur.calls[-1].sql), []
+        ),
+    )
+
+    result = ingest_service.ingest_flights("ORD", None, 50, mode="bulk")
+
+    assert result["airports_upserted"] == 2
+    assert result["airlines_upserted"] == 0
+    staged_airports = [c.params for c in ingest.cur.calls if c.many][2]
+    assert sorted(row[0] for row in staged_airports) == ["JFK", "LAX"]
+
+    # A repeat poll changes nothing, so neither dimension version moves
+    ingest.cur.calls.clear()
+    before = data_version.current("airports", "airlines")
+    again = ingest_service.ingest_flights("ORD", None, 50, mode="bulk")
+    assert (again["airports_upserted"], again["airlines_upserted"]) == (0, 0)
+    assert data_version.current("airports", "airlines") == before
+    assert "SELECT" not in ingest.cur.verbs()
@@ -0,0 +1,81 @@
+import sqlite3
+
+from app import data_version
+from app.services import kpi_service
+
+
+def kpi_record(key, is_total, flights, on_time, operated):
+    record = {
+        "k0": key,
+        "is_total": is_total,
+        "flights": flights,
+        "avg_dep_delay_min": 12.3456,
+        "avg_arr_delay_min": None,
+        "p50_dep_delay_min": 5,
+        "p90_dep_delay_min": 40,
+        "p50_arr_delay_min": None,
+        "p90_arr_delay_min": None,
+        "operated": operated,
+        "on_time": on_time,
+    }
+    record.update({f"status_{s}": 0 for s in kpi_service.STATUSES})
+    return record
+
+
+def test_kpis_are_cached_until_flight_data_changes(monkeypatch):
+    calls = []
+
+    def fake_fetch(sql, params, name=None):
+        calls.append((sql, params, name))
+        return [kpi_record(None, 1, 10, 6, 8), kpi_record("ORD", 0, 10, 6, 8)]
+
+    monkeypatch.setattr(kpi_service, "fetch_records", fake_fetch)
+    kpi_service._cache.clear()
+
+    result = kpi_service.delay_kpis("airport", "2024-05-01", "2024-05-31", limit=5)
+    kpi_service.delay_kpis("airport", "2024-05-01", "2024-05-31", limit=5)
+    assert len(calls) == 1
+    sql, params, name = calls[0]
+    assert "GROUPING SETS ((DEP_IATA), ())" in sql
+    assert params == (15, "2024-05-01", "2024-05-31", 6)
+    assert name == "kpi_airport"
+
+    assert result["totals"]["key"] is None
+    assert result["totals"]["on_time_pct"] == 75.0
+    assert [row["key"] for row in result["items"]] == ["ORD"]
+    assert result["items"][0]["avg_dep_delay_min"] == 12.35
+
+    data_version.bump("airports")
+    kpi_service.delay_kpis("airport", "2024-05-01", "2024-05-31", limit=5)
+    assert len(calls) == 1
+    data_version.bump("flights")
+    kpi_service.delay_kpis("airport", "2024-05-01", "2024-05-31", limit=5)
+    assert len(calls) == 2
+
+
+def test_on_time_counts_only_flown_flights_with_known_delays():
+    rows = [
+        # status, arrived, arr delay, dep delay
+        ("scheduled", None, None, None),
+        ("scheduled", None, None, 0),
+        ("active", None, None, 3),
+        ("cancelled", None, None, None),
+        ("landed", "2024-05-01T12:00:00", 5, 2),
+        ("landed", "2024-05-01T12:00:00", 40, 30),
+        ("landed", None, None, None),
+        ("diverted", "2024-05-01T13:00:00", None, 10),
+    ]
+    db = sqlite3.connect(":memory:")
+    db.execute(
+        "CREATE TABLE FACT_FLIGHT (FLIGHT_STATUS, ARR_ACTUAL_UTC, ARR_DELAY_MIN, DEP_DELAY_MIN)"
+    )
+    db.executemany("INSERT INTO FACT_FLIGHT VALUES (?, ?, ?, ?)", rows)
+
+    sql = (
+        f"SELECT SUM(CASE WHEN {kpi_service.FLOWN} THEN 1 ELSE 0 END), "
+        f"SUM(CASE WHEN {kpi_service.ON_TIME} THEN 1 ELSE 0 END) FROM FACT_FLIGHT"
+    )
+    operated, on_time = db.execute(sql.replace("%s", "?"), (15,)).fetchone()
+
+    assert operated == 4
+    assert on_time == 2
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app.db import snowflake
+from app.main import app
+from app.metrics import Histogram, render
+from benchmarks.fakes import FakeCursor
+
+
+def test_statement_names_and_histogram_output():
+    assert (
+        snowflake.statement_name("SELECT * FROM FACT_FLIGHT WHERE x = %s") == "select:fact_flight"
+    )
+    assert snowflake.statement_name("  update DIM_AIRPORT set a = 1") == "update:dim_airport"
+    assert snowflake.statement_name("SELECT 1") == "select"
+
+    cur = FakeCursor()
+    cur.rowcount = 3
+    before = snowflake.QUERY_SECONDS.count("merge_fact_flight")
+    snowflake.run_statement(cur, "MERGE INTO FACT_FLIGHT ...", name="merge_fact_flight")
+    assert snowflake.QUERY_SECONDS.count("merge_fact_flight") == before + 1
+    assert snowflake.QUERY_ROWS.value("merge_fact_flight") >= 3
+
+    hist = Histogram("test_latency_seconds", "Test", ("route",), buckets=(0.1, 1.0))
+    hist.observe(0.05, 'a"b')
+    hist.observe(5, 'a"b')
+    text = render()
+    assert 'test_latency_seconds_bucket{route="a\\"b",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="a\\"b",le="+Inf"} 2' in text
+    assert 'test_latency_seconds_count{route="a\\"b"} 2' in text
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    client = TestClient(app)
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE db_query_duration_seconds histogram" in resp.text
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import middleware
+from app.db.executor import run_blocking
+from app.profiling import SamplingProfiler
+
+
+def slow_lookup():
+    time.sleep(0.05)
+    return {"ok": True}
+
+
+def build_app():
+    app = FastAPI()
+    app.add_middleware(middleware.RequestMetricsMiddleware)
+
+    @app.get("/things/{thing_id}")
+    async def get_thing(thing_id: str):
+        return await run_blocking(slow_lookup)
+
+    return app
+
+
+def test_routes_are_labelled_by_template(monkeypatch):
+    monkeypatch.setattr(middleware, "get_profiler", lambda: None)
+    client = TestClient(build_app())
+    before = middleware.REQUEST_SECONDS.count("GET", "/things/{thing_id}", "200")
+    client.get("/things/a")
+    client.get("/things/b")
+    client.get("/nope")
+    assert middleware.REQUEST_SECONDS.count("GET", "/things/{thing_id}", "200") == before + 2
+    assert middleware.REQUEST_SECONDS.count("GET", "unmatched", "404") >= 1
+    assert middleware.RESPONSE_BYTES.count("/things/{thing_id}") >= 2
+
+
+def test_slow_requests_are_profiled_across_executor_threads(tmp_path, monkeypatch):
+    profiler = SamplingProfiler(0.002, 0.01, 1.0, str(tmp_path), keep=5)
+    monkeypatch.setattr(middleware, "get_profiler", lambda: profiler)
+    client = TestClient(build_app())
+    client.get("/things/a")
+
+    (summary,) = profiler.recent()
+    assert summary["route"] == "/things/{thing_id}"
+    assert summary["samples"] > 0
+    assert "test_middleware.py:slow_lookup" in profiler.get(summary["id"]).folded()
+    assert len(list(tmp_path.glob("*.folded"))) == 1
+
+
+def busy_handler(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_loop_samples_only_go_to_the_running_request():
+    profiler = SamplingProfiler(0.001, 0.0, 1.0, "", keep=5)
+
+    async def request(name, work):
+        profile = profiler.begin("GET", name)
+        await work()
+        profiler.end(profile, 1.0)
+        return profile
+
+    async def idle():
+        await asyncio.sleep(0.15)
+
+    async def busy():
+        await asyncio.sleep(0.01)
+        busy_handler(0.1)
+
+    async def main():
+        return await asyncio.gather(request("/idle", idle), request("/busy", busy))
+
+    idle_profile, busy_profile = asyncio.run(main())
+    assert "busy_handler" in busy_profile.folded()
+    assert "busy_handler" not in idle_profile.folded()
@@ -0,0 +1,26 @@
+import datetime
+
+import pytest
+
+from app.services.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor([datetime.date(2024, 5, 1), "AA100:2024-05-01"])
+    assert decode_cursor(cursor, 2) == ["2024-05-01", "AA100:2024-05-01"]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", encode_cursor(["only-one"]), "e30"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+def test_next_cursor_only_when_more_rows():
+    columns = {"iata": ["AAA", "BBB", "CCC"], "name": ["a", "b", "c"]}
+    page, cursor = next_cursor(columns, 3, "iata")
+    assert page == columns and cursor is None
+
+    page, cursor = next_cursor(columns, 2, "iata")
+    assert page == {"iata": ["AAA", "BBB"], "name": ["a", "b"]}
+    assert decode_cursor(cursor, 1) == ["BBB"]
@@ -0,0 +1,77 @@
+import gzip
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.responses import model_response, page_response
+from app.api.routers import flights
+from app.auth.deps import get_current_user
+from app.db.results import columns_from_cursor, pa
+from app.main import app
+from app.models.flight import FlightList, FlightOut
+from benchmarks.bench_results import COLUMNS
+from benchmarks.fakes import FakeCursor, fact_rows
+
+needs_arrow = pytest.mark.skipif(pa is None, reason="pyarrow is not installed")
+
+
+def _flight(i: int) -> dict:
+    return {
+        "flight_nk": f"AA{i}:2024-05-01",
+        "flight_date": date(2024, 5, 1),
+        "dep_iata": "ORD",
+        "arr_iata": "JFK",
+        "dep_scheduled_utc": datetime(2024, 5, 1, 6, i % 60),
+        "row_fingerprint": "f" * 40,
+    }
+
+
+def test_model_response_matches_validated_output():
+    page = {"items": [_flight(1)], "total": None, "limit": 1, "offset": 0, "next_cursor": None}
+    fast = model_response(FlightList, page).body
+    assert b"row_fingerprint" not in fast
+    assert fast.replace(b" ", b"") == FlightList.model_validate(page).model_dump_json().encode()
+
+
+def test_flight_list_is_compressed_and_keeps_etag(monkeypatch):
+    def fake_list(*args, **kwargs):
+        rows = [_flight(i) for i in range(200)]
+        return {name: [row[name] for row in rows] for name in rows[0]}, None, None
+
+    monkeypatch.setattr(flights, "list_flights", fake_list)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "ops@example.com"}
+    try:
+        client = TestClient(app)
+        resp = client.get("/flights?limit=200", headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.headers["etag"]
+        assert len(resp.json()["items"]) == 200
+
+        plain = client.get("/flights?limit=200", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert int(plain.headers["content-length"]) > len(gzip.compress(plain.content)) * 5
+
+        small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_detail_projection_drops_unknown_columns():
+    body = model_response(FlightOut, _flight(3)).body
+    assert b"row_fingerprint" not in body
+    assert b'"flight_date":"2024-05-01"' in body
+
+
+@pytest.mark.parametrize("arrow", [False, pytest.param(True, marks=needs_arrow)])
+def test_page_from_columns_matches_validated_rows(arrow):
+    rows = fact_rows(30, COLUMNS)
+    columns = columns_from_cursor(FakeCursor(rows, COLUMNS, arrow=arrow))
+    body = page_response(FlightList, columns, total=30, limit=30, offset=0).body
+
+    records = [dict(zip([c.lower() for c in COLUMNS], row)) for row in rows]
+    page = {"items": records, "total": 30, "limit": 30, "offset": 0}
+    assert body == FlightList.model_validate(page).model_dump_json().encode()
@@ -0,0 +1,61 @@
+import time
+from datetime import datetime, timezone
+
+from app.services import scheduler
+from app.services.scheduler import IngestScheduler, parse_schedule
+
+
+def test_peak_hours_use_tighter_interval():
+    (hub,) = parse_schedule(
+        '[{"iata":"ord","interval_seconds":900,"peak_interval_seconds":120,'
+        '"peak_hours":[[22,2]],"timezone":"UTC"}]'
+    )
+    assert hub.iata == "ORD"
+    assert hub.interval(datetime(2024, 5, 1, 23, tzinfo=timezone.utc)) == 120
+    assert hub.interval(datetime(2024, 5, 1, 1, tzinfo=timezone.utc)) == 120
+    assert hub.interval(datetime(2024, 5, 1, 12, tzinfo=timezone.utc)) == 900
+
+
+def test_failures_back_off_and_success_records_rows(monkeypatch):
+    calls = {"n": 0}
+
+    def fake_ingest(targets, limit, max_concurrency, max_wait):
+        # Scheduled runs may queue for the upstream rate limit
+        assert max_wait == scheduler.get_settings().http_rate_limit_max_wait_seconds
+        assert max_concurrency == 3
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("upstream down")
+        if calls["n"] == 2:
+            targets = [{"error": None}, {"error": "arrivals timed out"}]
+            return {"flights_updated": 4, "flights_changed": 2, "targets": targets}
+        return {"flights_updated": 9, "flights_changed": 7, "targets": [{"error": None}]}
+
+    monkeypatch.setattr(scheduler, "ingest_airports", fake_ingest)
+    airports = parse_schedule('[{"iata":"ATL","interval_seconds":100}]')
+    sched = IngestScheduler(
+        airports, 10, 1, jitter_ratio=0, max_backoff_seconds=150, fetch_concurrency=3
+    )
+    (atl,) = airports
+
+    atl.running, sched._active = True, 1
+    sched._run(atl)
+    assert atl.consecutive_failures == 1
+    assert atl.last_error == "upstream down"
+    assert atl.next_run - time.monotonic() > 140  # min(100 * 2, 150)
+
+    # A failed direction keeps backing off even though the other one landed rows
+    atl.running, sched._active = True, 1
+    sched._run(atl)
+    assert atl.consecutive_failures == 2
+    assert atl.last_error == "arrivals timed out"
+    assert atl.last_rows_changed == 2
+    assert atl.next_run - time.monotonic() > 140
+
+    atl.running, sched._active = True, 1
+    sched._run(atl)
+    status = sched.status()[0]
+    assert status["consecutive_failures"] == 0
+    assert status["last_rows_changed"] == 7
+    assert status["last_error"] is None
+    assert status["runs"] == 3
@@ -0,0 +1,80 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import data_version
+from app.cache import TTLCache
+from app.services import flight_service
+from app.singleflight import SingleFlight
+
+
+def _slow(calls, value="result", error=None):
+    def fn():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        if error:
+            raise error
+        return value
+
+    return fn
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test_share")
+    calls = []
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: flight.do("k", _slow(calls)), range(8)))
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+    # Nothing is reused once the call has finished
+    assert flight.do("k", _slow(calls, "again")) == "again"
+
+
+def test_followers_see_the_leaders_error_but_it_is_not_reused():
+    flight = SingleFlight("test_error", reuse_seconds=60)
+    calls = []
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, "k", _slow(calls, error=KeyError("x"))) for _ in range(4)]
+    for future in futures:
+        with pytest.raises(KeyError):
+            future.result()
+    assert len(calls) == 1
+    assert flight.do("k", lambda: "ok") == "ok"
+
+
+def test_reuse_window_and_forget():
+    flight = SingleFlight("test_reuse", reuse_seconds=60)
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 1
+    flight.forget("k")
+    assert flight.do("k", lambda: 3) == 3
+
+
+def test_cache_misses_for_the_same_key_load_once():
+    cache = TTLCache("test_coalesce", max_entries=10, ttl_seconds=60)
+    calls = []
+    with ThreadPoolExecutor(6) as pool:
+        results = list(pool.map(lambda _: cache.get_or_load("k", _slow(calls)), range(6)))
+    assert results == ["result"] * 6
+    assert len(calls) == 1
+
+
+def test_list_flights_coalesces_equivalent_filters(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        flight_service, "_load_flights", lambda *args: _slow(calls, ([], 0, None))()
+    )
+    variants = [["ORD", "MDW"], "MDW,ORD", ["MDW", "ORD", "ORD"]]
+    with ThreadPoolExecutor(3) as pool:
+        list(pool.map(lambda dep: flight_service.list_flights(50, 0, dep_iata=dep), variants))
+    assert len(calls) == 1
+
+    monkeypatch.setattr(flight_service._lists, "reuse_seconds", 60)
+    flight_service.list_flights(50, 0, dep_iata="ORD,MDW")
+    flight_service.list_flights(50, 0, dep_iata="ORD,MDW")
+    assert len(calls) == 2
+    data_version.bump("flights")
+    flight_service.list_flights(50, 0, dep_iata="ORD,MDW")
+    assert len(calls) == 3
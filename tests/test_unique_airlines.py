@@ -0,0 +1,68 @@
+from app import data_version
+from app.services import airline_service, flight_service, uniqueservice
+from benchmarks.fakes import FakeCursor
+
+
+def test_summary_is_counted_out_before_the_write_and_back_in_after():
+    cur = FakeCursor()
+    keys = ["AA1:2024-05-01", "AA2:2024-05-01", "AA1:2024-05-01"]
+
+    with uniqueservice.airline_summary_delta(cur, keys):
+        cur.execute("UPDATE FACT_FLIGHT SET AIRLINE_IATA = 'UA'")
+
+    unique = ["AA1:2024-05-01", "AA2:2024-05-01"]
+    assert [(c.verb, c.params) for c in cur.calls] == [
+        ("MERGE", [*unique, -1]),
+        ("UPDATE", None),
+        ("MERGE", [*unique, 1]),
+    ]
+
+
+def test_summary_delta_is_chunked(monkeypatch):
+    monkeypatch.setattr(uniqueservice, "SUMMARY_CHUNK", 2)
+    cur = FakeCursor()
+
+    with uniqueservice.airline_summary_delta(cur, ["A", "B", "C"]):
+        pass
+
+    assert [c.params[-1] for c in cur.calls] == [-1, -1, 1, 1]
+    assert cur.calls[1].params == ["C", -1]
+
+
+def test_summary_delta_runs_nothing_without_flights():
+    cur = FakeCursor()
+
+    with uniqueservice.airline_summary_delta(cur, []):
+        pass
+
+    assert cur.calls == []
+
+
+def test_flight_delete_adjusts_summary_in_its_transaction(fake_db):
+    flight_service.delete_flight("AA1:2024-05-01")
+
+    assert fake_db.cur.verbs() == ["BEGIN", "MERGE", "DELETE", "MERGE", "COMMIT"]
+    assert fake_db.cur.calls[1].params[-1] == -1 and fake_db.cur.calls[3].params[-1] == 1
+
+
+def test_unique_airlines_cached_until_flights_or_airlines_change(monkeypatch):
+    calls = []
+
+    def fake_fetch(sql, params, name=None):
+        calls.append(params)
+        return [{"airline_iata": "AA", "airline_name": f"American {len(calls)}"}]
+
+    monkeypatch.setattr(uniqueservice, "fetch_records", fake_fetch)
+    monkeypatch.setattr(airline_service, "execute", lambda *a, **kw: None)
+    uniqueservice.invalidate_unique_airlines()
+
+    first = uniqueservice.get_unique_airlines("ORD")
+    assert uniqueservice.get_unique_airlines("ORD") == first
+    assert calls == [("ORD",)]
+
+    data_version.bump("flights")
+    uniqueservice.get_unique_airlines("ORD")
+    assert len(calls) == 2
+
+    airline_service.delete_airline("AA")
+    assert uniqueservice.get_unique_airlines("ORD")[0]["airline_name"] == "American 3"